@@ -0,0 +1,96 @@
+import os
+from bisect import bisect_right
+
+from search_index import matcher
+from snapshot import EXTENSION, SnapshotFile, write_snapshot
+from task_store import Task, TaskStore
+
+
+class ArchiveRows:
+    """The archived tasks of every segment as one read-only sequence, oldest first."""
+
+    def __init__(self, sections):
+        self.sections = sections
+        self.starts = [0]
+        for rows in sections:
+            self.starts.append(self.starts[-1] + len(rows))
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        number = bisect_right(self.starts, index) - 1
+        task = self.sections[number][index - self.starts[number]]
+        # Ids within a segment restart at 1; archived rows get negative ids
+        # so they never name a task of the working list.
+        return Task(-1 - index, task.text, True)
+
+    def __iter__(self):
+        index = -1
+        for rows in self.sections:
+            for task in rows:
+                yield Task(index, task.text, True)
+                index -= 1
+
+
+class Archive:
+    """Resolved tasks moved out of the working list, kept as read-only .tsnap
+    segments in `<tasks file>.archive/`, one per archiving run.
+
+    Segments are memory-mapped and their rows decoded only when read, so an
+    archive of any size costs little until it is shown or searched.
+    """
+
+    def __init__(self, file_name):
+        self.directory = file_name + ".archive"
+        self.segments = {}
+        self.rows = ArchiveRows([])
+        self.refresh()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def names(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(EXTENSION))
+
+    def refresh(self):
+        # Picks up segments written since, by this process or another one.
+        names = self.names()
+        if len(names) != len(self.segments):
+            for name in names:
+                if name not in self.segments:
+                    self.segments[name] = SnapshotFile(os.path.join(self.directory, name))
+            self.rows = ArchiveRows([self.segments[name].completed for name in names])
+        return self.rows
+
+    def add(self, tasks):
+        self.write_segment(task.text for task in tasks)
+        return self.refresh()
+
+    def write_segment(self, texts):
+        # Called with the tasks file locked, so two processes do not pick
+        # the same segment name. Touches only the directory, so it can run
+        # on the storage writer thread; `refresh` then picks the segment up.
+        os.makedirs(self.directory, exist_ok=True)
+        names = self.names()
+        number = int(names[-1].split(".")[0]) + 1 if names else 1
+        store = TaskStore()
+        store.extend((text, True) for text in texts)
+        write_snapshot(os.path.join(self.directory, f"{number:06d}{EXTENSION}"), store)
+
+    def search(self, query):
+        # A scan of every archived text: run when asked, not on each keystroke.
+        matches = matcher(query)
+        return [task for task in self.refresh() if matches(task.text)]
+
+    def close(self):
+        for segment in self.segments.values():
+            segment.close()
+        self.segments = {}
+        self.rows = ArchiveRows([])
@@ -0,0 +1,66 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("tkinter", "xmlrunner", "xml.etree", "unittest")
+
+
+def import_profile(module):
+    # `python -X importtime` prints one line per module to stderr:
+    # "import time: self [us] | cumulative | name"; top-level imports are
+    # the ones whose name is not indented.
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append(name.strip())
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def cold_start_ms(args, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT, "todo.py")] + args, check=True, capture_output=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the CLI versus the GUI module, and CLI cold start.")
+    parser.add_argument("--count", type=int, default=1000, help="tasks in the list used for `todo list`")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':>8} {'import ms':>10} {'modules':>8}  heavy imports")
+    for module in ("todo", "main"):
+        try:
+            total, modules = import_profile(module)
+        except subprocess.CalledProcessError as error:
+            print(f"{module:>8} failed: {error.stderr.strip().splitlines()[-1]}")
+            continue
+        heavy = sorted({prefix for prefix in HEAVY for name in modules if name == prefix or name.startswith(prefix + ".")})
+        print(f"{module:>8} {total:>10.1f} {len(modules):>8}  {', '.join(heavy) or '-'}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = os.path.join(directory, "tasks.txt")
+        with open(tasks, "w", encoding="utf-8") as file:
+            file.writelines(f"Task number {i},pending\n" for i in range(args.count))
+        interpreter = cold_start_ms(["--help"], args.repeat)
+        listing = cold_start_ms(["--tasks", tasks, "list"], args.repeat)
+    print(f"todo --help {interpreter:.1f} ms, todo list ({args.count} tasks) {listing:.1f} ms, best of {args.repeat}")
+
+
+if __name__ == "__main__":
+    main()
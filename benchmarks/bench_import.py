@@ -0,0 +1,49 @@
+import argparse
+import os
+import tempfile
+import time
+
+import bulk
+from storage import open_storage
+
+
+def write_source(path, count):
+    bulk.write_records(path, ({"text": f"Imported task, number {i}", "status": "completed" if i % 4 == 0 else "pending"}
+                              for i in range(count)))
+
+
+def one_by_one(source, tasks_file):
+    # What importing through add_task amounts to: one change set per task.
+    storage = open_storage(tasks_file)
+    storage.initialize()
+    store = storage.load()
+    for change_set in bulk.insert_batches(store, bulk.validate(bulk.read_records(source), []), batch_size=1):
+        storage.append([change._replace(task_id=store.apply(change).id) for change in change_set])
+    storage.close()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import time, batched versus one change set per task.")
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--storage", default="tasks.txt", help="tasks.txt or tasks.db")
+    args = parser.parse_args()
+
+    print(f"{'format':>8} {'batched ms':>12} {'per task ms':>12} {'export ms':>10}")
+    for extension in (".csv", ".json", ".ndjson"):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source" + extension)
+            write_source(source, args.count)
+            batched = timed(bulk.import_file, source, os.path.join(directory, "a-" + args.storage))
+            single = timed(one_by_one, source, os.path.join(directory, "b-" + args.storage))
+            export = timed(bulk.export_file, os.path.join(directory, "out" + extension), os.path.join(directory, "a-" + args.storage))
+        print(f"{extension[1:]:>8} {batched:>12.0f} {single:>12.0f} {export:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
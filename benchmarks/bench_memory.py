@@ -0,0 +1,59 @@
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from storage import read_snapshot
+
+
+def write_tasks(path, count):
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(count):
+            status = "completed" if i % 4 == 0 else "pending"
+            file.write(f"Imported task number {i},{status}\n")
+
+
+def load_lists(path):
+    # The original representation: two lists of str.
+    task_list, completed_tasks = [], []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.strip().rsplit(',', 1)
+            if len(parts) == 2:
+                task, status = parts
+                if status == 'completed':
+                    completed_tasks.append(task)
+                else:
+                    task_list.append(task)
+    return task_list, completed_tasks
+
+
+def load_store(path):
+    return read_snapshot(path)[0]
+
+
+def measure(loader, path):
+    tracemalloc.start()
+    result = loader(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per task held in memory after loading tasks.txt.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.txt")
+        write_tasks(path, args.count)
+        print(f"{args.count} tasks")
+        for name, loader in (("list[str]", load_lists), ("TaskStore", load_store)):
+            current, peak = measure(loader, path)
+            print(f"  {name:<10} {current / args.count:8.1f} bytes/task  (peak {peak / args.count:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import time
+import tkinter as tk
+
+from main import TodoApp
+
+
+def write_tasks(path, count):
+    with open(path, "w") as file:
+        for i in range(count):
+            status = "completed" if i % 4 == 0 else "pending"
+            file.write(f"Task number {i},{status}\n")
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(count, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.txt")
+        write_tasks(path, count)
+
+        root = tk.Tk()
+        try:
+            app = TodoApp(root, file_name=path)
+            root.update()
+
+            def add():
+                app.task_entry.insert(0, "Benchmark task")
+                app.add_task()
+                root.update()
+
+            def toggle():
+                app.toggle_task_completion(app.task_list[0].id)
+                root.update()
+
+            def render():
+                app.load_tasks_in_frame()
+                root.update()
+
+            languages = iter(["fr", "en"] * repeat)
+
+            def language():
+                app.set_language(next(languages))
+                root.update()
+
+            results = {"add": timed(add, repeat)}
+            resolved = len(app.completed_tasks)
+            results["toggle"] = timed(toggle, repeat)
+            # A toggle given something other than an id does nothing, and
+            # would be timed as if it worked.
+            if len(app.completed_tasks) != resolved + repeat:
+                raise SystemExit("bench_render: toggle did not resolve the tasks it was given")
+            results["render"] = timed(render, repeat)
+            results["language"] = timed(language, repeat)
+            app.close()
+        finally:
+            root.destroy()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time add/toggle/render/language switch against large task lists.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'add ms':>10} {'toggle ms':>10} {'render ms':>10} {'lang ms':>10}")
+    for count in args.sizes:
+        results = run(count, args.repeat)
+        print(f"{count:>8} {results['add']:>10.2f} {results['toggle']:>10.2f} {results['render']:>10.2f} {results['language']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
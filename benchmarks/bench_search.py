@@ -0,0 +1,59 @@
+import argparse
+import random
+import time
+
+from search_index import SearchIndex
+from task_store import TaskStore
+
+WORDS = ["buy", "milk", "call", "mom", "write", "report", "fix", "bike", "book", "flight", "pay", "rent",
+         "clean", "kitchen", "email", "boss", "plan", "trip", "water", "plants", "read", "paper", "review", "code"]
+
+
+def build_store(count, seed=1):
+    rng = random.Random(seed)
+    store = TaskStore()
+    store.extend((f"{' '.join(rng.sample(WORDS, 3))} {i}", i % 4 == 0) for i in range(count))
+    return store
+
+
+def filter_ms(store, index, query, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        matches = store.select(index.search(query))
+    return (time.perf_counter() - start) / repeat * 1000, len(matches[0]) + len(matches[1])
+
+
+def scan_ms(store, query, repeat):
+    # What finding a task cost before: look at every task's text.
+    query = query.casefold()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        matches = [task for task in store.pending if query in task.text.casefold()]
+        matches += [task for task in store.completed if query in task.text.casefold()]
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search filter latency with the inverted index versus a linear scan.")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    store = build_store(args.count)
+    start = time.perf_counter()
+    index = SearchIndex(store.tasks.values())
+    print(f"{args.count} tasks, index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    task = store.pending[0]
+    index.update(task.id, "review flight plan")
+    print(f"incremental update {(time.perf_counter() - start) * 1e6:.1f} us")
+
+    print(f"{'query':>16} {'matches':>8} {'index ms':>10} {'scan ms':>10}")
+    for query in ["b", "bo", "book", "book fl", "call mom 42", "99999"]:
+        elapsed, found = filter_ms(store, index, query, args.repeat)
+        print(f"{query:>16} {found:>8} {elapsed:>10.2f} {scan_ms(store, query, args.repeat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.generate import write_tasks
+from migrate import migrate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each loader runs in a fresh interpreter, so the resident memory it adds
+# is its own (Linux only: read from /proc).
+LOADER = """
+import os, sys, time
+from snapshot import SnapshotFile, read_store
+from storage import read_snapshot
+def resident():
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+kind, path = sys.argv[1:]
+before = resident()
+start = time.perf_counter()
+if kind == "text":
+    store = read_snapshot(path)[0]
+    shown = [store.completed[i].text for i in range(8)]
+elif kind == "store":
+    store = read_store(path)
+    shown = [store.completed[i].text for i in range(8)]
+else:
+    snapshot = SnapshotFile(path)
+    shown = [task.text for task in snapshot.completed[:8]]
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, resident() - before)
+"""
+
+
+def run(kind, path):
+    output = subprocess.run([sys.executable, "-c", LOADER, kind, path], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.split()
+    return float(output[0]), int(output[1]) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open a large archive from tasks.txt and from a binary snapshot.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--completed", type=float, default=0.9, help="share of completed tasks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "tasks.txt")
+        snapshot_path = os.path.join(directory, "tasks.tsnap")
+        write_tasks(text_path, args.count, completed_ratio=args.completed)
+        migrate(text_path, snapshot_path)
+        print(f"{args.count} tasks: tasks.txt {os.path.getsize(text_path) / 2**20:.1f} MiB, "
+              f"tasks.tsnap {os.path.getsize(snapshot_path) / 2**20:.1f} MiB")
+        print(f"{'':<36}{'ms':>10}{'RSS MiB':>10}")
+        for label, kind, path in (("parse tasks.txt into a TaskStore", "text", text_path),
+                                  ("read tasks.tsnap into a TaskStore", "store", snapshot_path),
+                                  ("mmap tasks.tsnap, decode 8 rows", "mmap", snapshot_path)):
+            elapsed, rss = run(kind, path)
+            print(f"{label:<36}{elapsed:>10.1f}{rss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import tempfile
+import time
+import tkinter as tk
+
+from main import TodoApp
+
+
+def write_tasks(path, count):
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(count):
+            status = "completed" if i % 4 == 0 else "pending"
+            file.write(f"Task number {i},{status}\n")
+
+
+def run(path, lazy):
+    start = time.perf_counter()
+    root = tk.Tk()
+    try:
+        app = TodoApp(root, file_name=path, lazy=lazy)
+        # Widgets are drawn by idle callbacks; timers (the lazy batches) are not run here.
+        root.update_idletasks()
+        first_paint = time.perf_counter() - start
+        while app.loading is not None:
+            root.update()
+        loaded = time.perf_counter() - start
+        app.close()
+    finally:
+        root.destroy()
+    return first_paint * 1000, loaded * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first paint and to fully loaded, eager versus lazy startup.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'mode':>6} {'first paint ms':>15} {'loaded ms':>10}")
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.txt")
+            write_tasks(path, count)
+            for lazy in (False, True):
+                first_paint, loaded = run(path, lazy)
+                print(f"{count:>8} {'lazy' if lazy else 'eager':>6} {first_paint:>15.1f} {loaded:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
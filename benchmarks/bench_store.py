@@ -0,0 +1,57 @@
+import argparse
+import time
+
+from changes import COMPLETED, PENDING
+from task_store import TaskStore
+
+
+def per_op_us(func, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_list(count, repeat):
+    tasks = [f"Task {i}" for i in range(count)]
+    middle = count // 2
+    return {
+        "head insert": per_op_us(lambda i: tasks.insert(0, "New task"), repeat),
+        "lookup": per_op_us(lambda i: f"Task {middle + i}" in tasks, repeat),
+        "index": per_op_us(lambda i: tasks.index(f"Task {middle + i}"), repeat),
+        "remove": per_op_us(lambda i: tasks.remove(f"Task {middle + i}"), repeat),
+    }
+
+
+def bench_store(count, repeat):
+    store = TaskStore()
+    for i in range(count):
+        store.append(f"Task {i}")
+    middle = count // 2 + 1
+    pending = store.section(PENDING)
+    return {
+        "head insert": per_op_us(lambda i: pending.insert(0, store.create("New task")), repeat),
+        "lookup": per_op_us(lambda i: store.get(middle + i), repeat),
+        "index": per_op_us(lambda i: store.position(store.get(middle + i)), repeat),
+        "remove": per_op_us(lambda i: pending.remove(store.get(middle + i)), repeat),
+        "move": per_op_us(lambda i: store.section(COMPLETED).append(pending.pop(i)), repeat),
+        "row access": per_op_us(lambda i: pending[i * 7 % len(pending)], repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-operation cost of the task store versus plain lists.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    for name, bench in (("list[str]", bench_list), ("TaskStore", bench_store)):
+        print(name)
+        for count in args.sizes:
+            results = bench(count, min(args.repeat, count // 4))
+            cells = "  ".join(f"{op} {us:8.2f}us" for op, us in results.items())
+            print(f"  {count:>8}  {cells}")
+
+
+if __name__ == "__main__":
+    main()
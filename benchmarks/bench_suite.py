@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from benchmarks.generate import write_tasks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("load", "render", "add", "toggle", "edit", "delete", "language", "save")
+STUB_TK = os.path.join(ROOT, "benchmarks", "stub_tk")
+
+tk = None
+TodoApp = None
+
+
+def import_app(stub_tk):
+    # Imported late so --stub-tk can put the stub ahead of the real tkinter.
+    global tk, TodoApp
+    if stub_tk:
+        sys.path.insert(0, STUB_TK)
+    import tkinter
+    from main import TodoApp as app_class
+    tk, TodoApp = tkinter, app_class
+
+
+def open_display(use_xvfb):
+    # Returns the Xvfb process started for the run, if one was needed.
+    if os.environ.get("DISPLAY") or not use_xvfb or shutil.which("Xvfb") is None:
+        return None
+    display = f":{os.getpid() % 1000 + 100}"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    return process
+
+
+def measure(action, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(runs), "min_ms": min(runs), "max_ms": max(runs), "runs": repeat}
+
+
+def run_size(count, repeat, seed, completed_ratio):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.txt")
+        write_tasks(path, count, seed, completed_ratio)
+        try:
+            root = tk.Tk()
+        except tk.TclError as error:
+            raise SystemExit(f"bench_suite: cannot open a Tk window ({error}).\n"
+                             "Run it with a display, install Xvfb, or pass --stub-tk.")
+        try:
+            app = TodoApp(root, file_name=path)
+            root.update()
+
+            def pick():
+                rows = app.task_list if app.task_list else app.completed_tasks
+                return rows[rng.randrange(len(rows))].id
+
+            def load():
+                app.load_tasks()
+                app.load_tasks_in_frame()
+                root.update()
+
+            def render():
+                app.load_tasks_in_frame()
+                root.update()
+
+            def add():
+                app.task_entry.insert(0, "Benchmark task ✓")
+                app.add_task()
+                root.update()
+
+            def toggle():
+                app.toggle_task_completion(pick())
+                root.update()
+
+            def edit():
+                app.edit_task(pick())
+                root.update()
+
+            def delete():
+                app.delete_task(pick())
+                root.update()
+
+            languages = iter(["fr", "en"] * repeat)
+
+            def language():
+                app.set_language(next(languages))
+                root.update()
+
+            def save():
+                app.save_tasks()
+                app.core.flush()
+
+            actions = {"load": load, "render": render, "add": add, "toggle": toggle, "edit": edit,
+                       "delete": delete, "language": language, "save": save}
+            results = {}
+            with patch("main.simpledialog.askstring", return_value="Edited in the benchmark"):
+                for name in SCENARIOS:
+                    results[name] = measure(actions[name], repeat)
+                    # Journal writes and search index slices of one scenario
+                    # are not timed in the next.
+                    app.core.flush()
+                    while app.core.index_step():
+                        pass
+            app.close()
+        finally:
+            root.destroy()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    # Scenarios whose median is over `tolerance` times the baseline's.
+    regressions = []
+    for size, scenarios in results["sizes"].items():
+        for name, result in scenarios.items():
+            old = baseline.get("sizes", {}).get(size, {}).get(name)
+            if old is None:
+                continue
+            ratio = result["median_ms"] / max(old["median_ms"], 1e-3)
+            print(f"{size:>8} {name:<10} {old['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms  x{ratio:.2f}")
+            if ratio > tolerance:
+                regressions.append(f"{name} at {size} tasks is x{ratio:.2f} slower")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time TodoApp scenarios on synthetic lists and write the results as JSON.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--completed", type=float, default=0.25, help="share of completed tasks")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor with --compare")
+    parser.add_argument("--no-xvfb", dest="xvfb", action="store_false", help="do not start Xvfb when there is no display")
+    parser.add_argument("--stub-tk", action="store_true",
+                        help="time the app against benchmarks/stub_tk, a tkinter that draws nothing")
+    args = parser.parse_args()
+    import_app(args.stub_tk)
+
+    xvfb = None if args.stub_tk else open_display(args.xvfb)
+    try:
+        results = {"commit": git_commit(), "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                   "python": platform.python_version(), "platform": platform.platform(), "tk": tk.TkVersion,
+                   "repeat": args.repeat, "seed": args.seed, "completed_ratio": args.completed, "sizes": {}}
+        print(f"{'tasks':>8} " + " ".join(f"{name:>9}" for name in SCENARIOS) + "   (median ms)")
+        for count in args.sizes:
+            scenarios = run_size(count, args.repeat, args.seed, args.completed)
+            results["sizes"][str(count)] = scenarios
+            print(f"{count:>8} " + " ".join(f"{scenarios[name]['median_ms']:>9.2f}" for name in SCENARIOS))
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"FAIL: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
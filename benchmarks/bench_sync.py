@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from changes import INSERT
+from storage import open_storage
+from sync_client import SyncConnection
+from task_store import TaskStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SimulatedClient:
+    """One user: a few batches of edits, paced like clicks, over one connection.
+
+    Only observers keep the whole list up to date (to check that everyone
+    converged); the rest track task ids, so the harness itself stays cheap
+    enough to simulate hundreds of clients.
+    """
+
+    def __init__(self, number, port, rng, observer):
+        self.number = number
+        self.rng = rng
+        self.observer = observer
+        self.store = TaskStore()
+        self.ids = []
+        self.sent = {}
+        self.latencies = []
+        self.deltas = 0
+        self.connection = SyncConnection("127.0.0.1", port, self.snapshot, self.delta, retry=0.05)
+
+    def snapshot(self, store, seq):
+        self.store = store
+        self.ids = list(store.tasks)
+
+    def delta(self, change_set, seq, n):
+        self.deltas += 1
+        for change in change_set:
+            if self.observer:
+                self.store.apply(change)
+            if change.kind == INSERT:
+                self.ids.append(change.task_id)
+        if n in self.sent:
+            self.latencies.append(time.perf_counter() - self.sent.pop(n))
+
+    def ops(self, count):
+        ops = []
+        for i in range(count):
+            choice = self.rng.random()
+            if choice < 0.5:
+                ops.append(["add", f"Client {self.number} task {i} ✓"])
+                continue
+            # Ids of removed tasks are fine: the server skips those ops.
+            task_id = self.ids[self.rng.randrange(len(self.ids))]
+            if choice < 0.8:
+                ops.append(["toggle", task_id, None])
+            elif choice < 0.95:
+                ops.append(["relabel", task_id, f"Edited by {self.number}"])
+            else:
+                ops.append(["remove", task_id])
+        return ops
+
+    async def work(self, batches, batch_size, pause, drop_after):
+        while self.connection.epoch is None:
+            await asyncio.sleep(0.01)
+        for batch in range(batches):
+            if batch == drop_after:
+                self.connection.drop()
+            self.sent[self.connection.next_batch] = time.perf_counter()
+            for op in self.ops(batch_size):
+                self.connection.send(op)
+            # Let the sender put this batch on the wire before the next one.
+            await asyncio.sleep(self.rng.uniform(0, pause))
+
+    def lists(self):
+        return [task.text for task in self.store.pending], [task.text for task in self.store.completed]
+
+
+def start_server(tasks_file):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "sync_server.py"), "--tasks", tasks_file, "--port", "0"],
+                               cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    return process, int(line.rsplit(":", 1)[1])
+
+
+async def run(port, args):
+    rng = random.Random(args.seed)
+    dropped = set(rng.sample(range(args.clients), int(args.clients * args.drop)))
+    # Half the observers are clients that drop, to check what they replay.
+    kept = [number for number in range(args.clients) if number not in dropped]
+    observers = set(sorted(dropped)[:args.observers // 2]) | set(kept[:args.observers - args.observers // 2])
+    clients = [SimulatedClient(number, port, random.Random(rng.random()), number in observers)
+               for number in range(args.clients)]
+    runners = [asyncio.create_task(client.connection.run()) for client in clients]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.work(args.batches, args.batch_size, args.pause,
+                                       args.batches // 2 if client.number in dropped else None)
+                           for client in clients))
+    # Done once every batch is acked and every client holds every delta.
+    while True:
+        seqs = {client.connection.seq for client in clients}
+        if len(seqs) == 1 and not any(client.connection.pending() for client in clients):
+            break
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        client.connection.close()
+    await asyncio.gather(*runners)
+    return clients, elapsed, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test sync_server.py with many concurrent simulated clients.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--batches", type=int, default=6, help="batches of ops per client")
+    parser.add_argument("--batch-size", type=int, default=5, help="ops per batch")
+    parser.add_argument("--pause", type=float, default=0.02, help="longest pause between a client's batches, in seconds")
+    parser.add_argument("--drop", type=float, default=0.1, help="share of clients whose connection drops halfway")
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks in the list before the clients connect")
+    parser.add_argument("--observers", type=int, default=8, help="clients that keep the full list to check convergence")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        tasks_file = os.path.join(directory, "tasks.txt")
+        store = TaskStore()
+        for i in range(args.tasks):
+            store.append(f"Existing task {i}", completed=i % 3 == 0)
+        storage = open_storage(tasks_file)
+        storage.save(store)
+        storage.close()
+
+        server, port = start_server(tasks_file)
+        try:
+            clients, elapsed, dropped = asyncio.run(run(port, args))
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+        saved = open_storage(tasks_file).load()
+
+    observers = [client for client in clients if client.observer]
+    reference = observers[0].lists()
+    converged = all(client.lists() == reference for client in observers)
+    persisted = reference == ([task.text for task in saved.pending], [task.text for task in saved.completed])
+    latencies = sorted(latency * 1000 for client in clients for latency in client.latencies)
+    ops = args.clients * args.batches * args.batch_size
+    percentile = lambda share: latencies[min(len(latencies) - 1, int(len(latencies) * share))]
+
+    print(f"clients            {args.clients} ({len(dropped)} dropped and reconnected, "
+          f"{sum(client.number in dropped for client in observers)} of {len(observers)} observers among them)")
+    print(f"ops                {ops} in {args.clients * args.batches} batches")
+    print(f"elapsed            {elapsed:.2f} s ({ops / elapsed:,.0f} ops/s)")
+    print(f"deltas delivered   {sum(client.deltas for client in clients):,}")
+    print(f"ack latency ms     p50 {statistics.median(latencies):.1f}  p95 {percentile(0.95):.1f}  p99 {percentile(0.99):.1f}")
+    print(f"reconnects         {sum(client.connection.connects - 1 for client in clients)}, "
+          f"extra snapshots {sum(client.connection.snapshots - 1 for client in clients)}")
+    print(f"converged          {'yes' if converged else 'NO'}, saved list matches: {'yes' if persisted else 'NO'}")
+    return 0 if converged and persisted else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
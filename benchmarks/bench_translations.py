@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import translations
+
+
+def legacy_get_translation(language, text):
+    # get_translation as it used to be: the whole catalog is rebuilt per call.
+    catalog = {
+        "en": {"Add Task": "Add Task", "Edit": "Edit", "Delete": "Delete", "Pending Tasks": "Pending Tasks",
+               "Resolved Tasks": "Resolved Tasks", "Edit Task": "Edit Task", "Edit the task:": "Edit the task:",
+               "You must enter a task.": "You must enter a task."},
+        "fr": {"Add Task": "Ajouter Tâche", "Edit": "Modifier", "Delete": "Supprimer",
+               "Pending Tasks": "Tâches en attente", "Resolved Tasks": "Tâches résolues",
+               "Edit Task": "Modifier la tâche", "Edit the task:": "Modifiez la tâche:",
+               "You must enter a task.": "Vous devez entrer une tâche."},
+        "es": {"Add Task": "Añadir tarea", "Edit": "Editar", "Delete": "Eliminar",
+               "Pending Tasks": "Tareas pendientes", "Resolved Tasks": "Tareas resueltas",
+               "Edit Task": "Editar tarea", "Edit the task:": "Edita la tarea:",
+               "You must enter a task.": "Debes ingresar una tarea."},
+        "it": {"Add Task": "Aggiungi compito", "Edit": "Modifica", "Delete": "Elimina",
+               "Pending Tasks": "Compiti in sospeso", "Resolved Tasks": "Compiti risolti",
+               "Edit Task": "Modifica compito", "Edit the task:": "Modifica il compito:",
+               "You must enter a task.": "Devi inserire un compito."},
+        "de": {"Add Task": "Aufgabe hinzufügen", "Edit": "Bearbeiten", "Delete": "Löschen",
+               "Pending Tasks": "Ausstehende Aufgaben", "Resolved Tasks": "Erledigte Aufgaben",
+               "Edit Task": "Aufgabe bearbeiten", "Edit the task:": "Bearbeiten Sie die Aufgabe:",
+               "You must enter a task.": "Sie müssen eine Aufgabe eingeben."},
+    }
+    return catalog[language].get(text, text)
+
+
+def render_lookups(get, count):
+    # A full render asked for "Edit" and "Delete" once per row.
+    start = time.perf_counter()
+    for _ in range(count):
+        get("Edit")
+        get("Delete")
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation cost of rendering every row, old catalog versus compiled.")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--language", default="fr")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    translate = translations.translator(args.language)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    before = render_lookups(lambda text: legacy_get_translation(args.language, text), args.count)
+    after = render_lookups(translate, args.count)
+    print(f"{args.count} rows, language {args.language}")
+    print(f"  rebuilt dict per call  {before:8.2f} ms")
+    print(f"  compiled catalog       {after:8.2f} ms  (one-off load {compile_ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
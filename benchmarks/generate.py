@@ -0,0 +1,45 @@
+import argparse
+import random
+
+from storage import format_line, format_marker
+
+WORDS = ("buy", "milk", "call", "mom", "fix", "bike", "book", "flights", "review", "pull", "request", "pay",
+         "rent", "water", "plants", "write", "report", "clean", "garage", "renew", "passport", "plan", "party")
+# Mixed into some tasks: accents, CJK, emoji, and the characters the
+# tasks.txt line format has to handle.
+EXTRAS = ("café", "naïve", "Größe", "señor", "東京", "données", "😀", "✓", "a,b", '"quoted"', "back\\slash", "two\nlines")
+
+
+def generate_tasks(count, seed=0, completed_ratio=0.25, max_words=24):
+    """Yields `count` (text, completed) rows, the same ones for the same arguments.
+
+    Most tasks are a few words long, with a long tail up to `max_words`.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        length = min(max_words, 1 + int(rng.expovariate(1 / 5)))
+        words = [rng.choice(WORDS) for _ in range(length)]
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(EXTRAS))
+        yield f"{' '.join(words).capitalize()} #{i}", rng.random() < completed_ratio
+
+
+def write_tasks(path, count, seed=0, completed_ratio=0.25):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(format_marker(count + 1))
+        for task_id, (text, completed) in enumerate(generate_tasks(count, seed, completed_ratio), 1):
+            file.write(format_line(text, completed, task_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic tasks.txt.")
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--completed", type=float, default=0.25, help="share of completed tasks")
+    args = parser.parse_args()
+    write_tasks(args.path, args.count, args.seed, args.completed)
+
+
+if __name__ == "__main__":
+    main()
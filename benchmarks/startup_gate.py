@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_cli import HEAVY, ROOT, import_profile
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+# Run in a fresh interpreter: open a window, with the app on an empty list
+# or bare as the reference, and wait until it is drawn.
+WINDOW_SCRIPT = """
+import sys, tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    sys.exit(3)
+if sys.argv[1] == "app":
+    from main import TodoApp
+    app = TodoApp(root, file_name=sys.argv[2], lazy=True)
+    root.update_idletasks()
+    app.close()
+else:
+    root.update_idletasks()
+root.destroy()
+"""
+
+
+def best_import_ms(repeat):
+    # Best times and the modules loaded for `import main` and for plain
+    # `import tkinter`, taken in turns so both see the same machine load.
+    best, modules = {}, {}
+    for _ in range(repeat):
+        for name in ("main", "tkinter"):
+            total, imported = import_profile(name)
+            best[name] = min(best.get(name, total), total)
+            modules[name] = set(imported)
+    return best, modules
+
+
+def best_window_ms(kind, repeat):
+    # None when there is no display to open a window on.
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = os.path.join(directory, "tasks.txt")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-c", WINDOW_SCRIPT, kind, tasks], cwd=ROOT, capture_output=True)
+            elapsed = (time.perf_counter() - start) * 1000
+            if result.returncode == 3:
+                return None
+            result.check_returncode()
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure GUI startup and fail if it regressed against the recorded baseline.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=1.3, help="allowed growth of the time ratios over the baseline")
+    parser.add_argument("--update", action="store_true", help="record the current numbers as the new baseline")
+    args = parser.parse_args()
+
+    # Times are gated as ratios to plain tkinter measured in the same run,
+    # and imports by the modules `main` loads on top of tkinter, so the
+    # baseline holds on any machine.
+    best, imported = best_import_ms(args.repeat)
+    import_ms, tkinter_ms = best["main"], best["tkinter"]
+    modules = imported["main"]
+    window_ms = best_window_ms("app", args.repeat)
+    bare_window_ms = best_window_ms("bare", args.repeat) if window_ms is not None else None
+    added = sorted(modules - imported["tkinter"])
+    ratios = {"import_ratio": import_ms / tkinter_ms}
+    print(f"import main      {import_ms:8.1f} ms  {len(modules)} modules, {len(added)} more than tkinter")
+    print(f"import tkinter   {tkinter_ms:8.1f} ms  x{ratios['import_ratio']:.2f}")
+    if window_ms is not None:
+        ratios["window_ratio"] = window_ms / bare_window_ms
+        print(f"time to window   {window_ms:8.1f} ms")
+        print(f"bare Tk window   {bare_window_ms:8.1f} ms  x{ratios['window_ratio']:.2f}")
+    else:
+        print("time to window   skipped (no display)")
+
+    failures = []
+    heavy = sorted({prefix for prefix in HEAVY if prefix != "tkinter"
+                    for name in modules if name == prefix or name.startswith(prefix + ".")})
+    if heavy:
+        failures.append(f"main imports {', '.join(heavy)} at startup")
+
+    if args.update:
+        baseline = {"python": platform.python_version(), **{name: round(value, 2) for name, value in ratios.items()},
+                    "modules": added}
+        with open(BASELINE, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=4)
+            file.write("\n")
+        print(f"Baseline written to {BASELINE}")
+    elif os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as file:
+            baseline = json.load(file)
+        new = sorted(set(added) - set(baseline["modules"]))
+        if new:
+            failures.append(f"main imports modules the baseline does not list: {', '.join(new)}")
+        for name, value in ratios.items():
+            if name in baseline and value > baseline[name] * args.tolerance:
+                failures.append(f"{name} {value:.2f} is over {args.tolerance}x the baseline {baseline[name]}")
+        if new and baseline.get("python") != platform.python_version():
+            print(f"note: the baseline was recorded with Python {baseline.get('python')}, whose standard library "
+                  "may import other modules", file=sys.stderr)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""A stand-in for tkinter that draws nothing, for benchmarks on machines
+without a display or Xvfb (`bench_suite.py --stub-tk`).
+
+Widgets keep their options and children in dicts, so the app's own work
+(storage, change sets, row recycling, captions) is what gets timed, not
+Tk's. `update` runs the timers due within a millisecond, which is what
+the app's batched loading uses; longer polling timers never fire.
+"""
+import itertools
+
+END = "end"
+DISABLED = "disabled"
+NORMAL = "normal"
+BOTH = "both"
+X = "x"
+Y = "y"
+LEFT = "left"
+RIGHT = "right"
+TOP = "top"
+BOTTOM = "bottom"
+VERTICAL = "vertical"
+HORIZONTAL = "horizontal"
+W = "w"
+E = "e"
+N = "n"
+S = "s"
+NS = "ns"
+EW = "ew"
+NSEW = "nsew"
+WORD = "word"
+INSERT = "insert"
+TkVersion = 8.6
+
+_root = None
+_names = itertools.count()
+
+
+class TclError(Exception):
+    pass
+
+
+class Variable:
+    default = ""
+
+    def __init__(self, master=None, value=None, name=None):
+        self.value = self.default if value is None else value
+        self.traces = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in list(self.traces):
+            callback("", "", "write")
+
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+        return str(len(self.traces))
+
+    def trace_remove(self, mode, name):
+        pass
+
+
+class StringVar(Variable):
+    default = ""
+
+
+class IntVar(Variable):
+    default = 0
+
+
+class BooleanVar(Variable):
+    default = False
+
+
+class DoubleVar(Variable):
+    default = 0.0
+
+
+class Misc:
+    def __init__(self, master=None, cnf=None, **options):
+        self.master = master if master is not None else _root
+        self.children = {}
+        self.name = f"w{next(_names)}"
+        self.options = dict(cnf or {}, **options)
+        self.destroyed = False
+        self.manager = None
+        self.bindings = {}
+        if self.master is not None:
+            self.master.children[self.name] = self
+
+    def __str__(self):
+        return "." + self.name
+
+    def __getitem__(self, key):
+        return self.cget(key)
+
+    def __setitem__(self, key, value):
+        self.configure(**{key: value})
+
+    def winfo_children(self):
+        return list(self.children.values())
+
+    def winfo_exists(self):
+        return not self.destroyed
+
+    def winfo_height(self):
+        return 20
+
+    def winfo_width(self):
+        return 200
+
+    def winfo_ismapped(self):
+        return self.manager is not None
+
+    def winfo_toplevel(self):
+        widget = self
+        while widget.master is not None:
+            widget = widget.master
+        return widget
+
+    def destroy(self):
+        for child in list(self.children.values()):
+            child.destroy()
+        if self.master is not None:
+            self.master.children.pop(self.name, None)
+        self.destroyed = True
+
+    def cget(self, key):
+        if key == "text" and self.options.get("textvariable") is not None:
+            return self.options["textvariable"].get()
+        return self.options.get(key, "")
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def pack(self, **options):
+        self.manager = ("pack", options)
+
+    def grid(self, **options):
+        self.manager = ("grid", options)
+
+    def place(self, **options):
+        self.manager = ("place", options)
+
+    def pack_forget(self):
+        self.manager = None
+
+    def grid_remove(self):
+        self.manager = None
+
+    grid_forget = grid_remove
+    place_forget = pack_forget
+
+    def grid_columnconfigure(self, *args, **options):
+        pass
+
+    def grid_rowconfigure(self, *args, **options):
+        pass
+
+    columnconfigure = grid_columnconfigure
+    rowconfigure = grid_rowconfigure
+
+    def bind(self, sequence, func=None, add=None):
+        self.bindings[sequence] = func
+
+    def bind_all(self, sequence, func=None, add=None):
+        self.winfo_toplevel().bindings[sequence] = func
+
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+
+    def event_generate(self, sequence, **options):
+        func = self.bindings.get(sequence)
+        if func is not None:
+            func(None)
+
+    def focus_set(self):
+        pass
+
+    def after(self, ms, func=None, *args):
+        return self.winfo_toplevel().schedule(ms, func, args)
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, ident):
+        self.winfo_toplevel().timers.pop(ident, None)
+
+    def update(self):
+        self.winfo_toplevel().run_due()
+
+    def update_idletasks(self):
+        pass
+
+
+class Tk(Misc):
+    def __init__(self, *args, **options):
+        global _root
+        super().__init__(None)
+        self.master = None
+        self.timers = {}
+        self.timer_ids = itertools.count()
+        self.window_title = ""
+        _root = self
+
+    def title(self, text=None):
+        if text is None:
+            return self.window_title
+        self.window_title = text
+
+    def schedule(self, ms, func, args):
+        ident = f"after#{next(self.timer_ids)}"
+        self.timers[ident] = (func, args, ms)
+        return ident
+
+    def run_due(self, within_ms=1):
+        # Timers scheduled by these callbacks wait for the next update.
+        for ident in list(self.timers):
+            timer = self.timers.get(ident)
+            if timer is None or timer[2] > within_ms:
+                continue
+            del self.timers[ident]
+            func, args, _ = timer
+            if func is not None:
+                func(*args)
+
+    def mainloop(self, n=0):
+        self.run_due()
+
+    def quit(self):
+        pass
+
+    def protocol(self, name, func=None):
+        self.options["protocol:" + name] = func
+
+    def geometry(self, geometry=None):
+        pass
+
+    def destroy(self):
+        global _root
+        super().destroy()
+        if _root is self:
+            _root = None
+
+
+class Toplevel(Misc):
+    def title(self, text=None):
+        self.options["title"] = text
+
+    def protocol(self, name, func=None):
+        self.options["protocol:" + name] = func
+
+    def transient(self, master=None):
+        pass
+
+    def geometry(self, geometry=None):
+        pass
+
+
+class Frame(Misc):
+    pass
+
+
+class LabelFrame(Misc):
+    pass
+
+
+class Label(Misc):
+    pass
+
+
+class Canvas(Misc):
+    pass
+
+
+class Button(Misc):
+    def invoke(self):
+        command = self.options.get("command")
+        return command() if command else None
+
+
+class Checkbutton(Button):
+    def select(self):
+        variable = self.options.get("variable")
+        if variable is not None:
+            variable.set(self.options.get("onvalue", 1))
+
+    def deselect(self):
+        variable = self.options.get("variable")
+        if variable is not None:
+            variable.set(self.options.get("offvalue", 0))
+
+
+class Radiobutton(Button):
+    pass
+
+
+class Scrollbar(Misc):
+    def set(self, first, last):
+        self.options["position"] = (first, last)
+
+    def get(self):
+        return self.options.get("position", (0.0, 1.0))
+
+
+class Entry(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        variable = self.options.get("textvariable")
+        self.text = variable.get() if variable is not None else ""
+
+    def get(self):
+        variable = self.options.get("textvariable")
+        return variable.get() if variable is not None else self.text
+
+    def set_text(self, text):
+        self.text = text
+        variable = self.options.get("textvariable")
+        if variable is not None:
+            variable.set(text)
+
+    def insert(self, index, text):
+        current = self.get()
+        at = len(current) if index == END else int(index)
+        self.set_text(current[:at] + text + current[at:])
+
+    def delete(self, first, last=None):
+        current = self.get()
+        end = len(current) if last in (END, None) else int(last)
+        self.set_text(current[:int(first)] + current[end:])
+
+
+class Text(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.text = ""
+
+    def insert(self, index, text, *tags):
+        if self.options.get("state") != DISABLED:
+            self.text += text
+
+    def delete(self, first, last=None):
+        if self.options.get("state") != DISABLED:
+            self.text = ""
+
+    def get(self, first="1.0", last=END):
+        return self.text
+
+    def see(self, index):
+        pass
+
+    def tag_configure(self, *args, **options):
+        pass
+
+    tag_config = tag_configure
+
+    def yview(self, *args):
+        pass
+
+
+class Menu(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.entries = []
+
+    def add_command(self, **options):
+        self.entries.append(("command", options))
+
+    def add_cascade(self, **options):
+        self.entries.append(("cascade", options))
+
+    def add_separator(self, **options):
+        self.entries.append(("separator", options))
+
+    def add_checkbutton(self, **options):
+        self.entries.append(("checkbutton", options))
+
+    def add_radiobutton(self, **options):
+        self.entries.append(("radiobutton", options))
+
+    def entryconfigure(self, index, **options):
+        self.entries[index][1].update(options)
+
+    entryconfig = entryconfigure
+
+    def index(self, index):
+        return len(self.entries) - 1
+
+
+from . import filedialog, messagebox, simpledialog, ttk  # noqa: E402
@@ -0,0 +1,6 @@
+def askopenfilename(**options):
+    return ""
+
+
+def asksaveasfilename(**options):
+    return ""
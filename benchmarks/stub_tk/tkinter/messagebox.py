@@ -0,0 +1,18 @@
+# Dialogs are recorded instead of shown.
+calls = []
+
+
+def showwarning(title=None, message=None, **options):
+    calls.append(("warning", title, message))
+
+
+def showerror(title=None, message=None, **options):
+    calls.append(("error", title, message))
+
+
+def showinfo(title=None, message=None, **options):
+    calls.append(("info", title, message))
+
+
+def askyesno(title=None, message=None, **options):
+    return True
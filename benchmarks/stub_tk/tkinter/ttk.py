@@ -0,0 +1,20 @@
+from . import Misc
+
+
+class Separator(Misc):
+    pass
+
+
+class Progressbar(Misc):
+    def step(self, amount=1):
+        pass
+
+    def start(self, *args):
+        pass
+
+    def stop(self):
+        pass
+
+
+class Treeview(Misc):
+    pass
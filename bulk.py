@@ -0,0 +1,224 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+import changes
+from changes import COMPLETED, PENDING
+from storage import batched, open_storage
+
+FORMATS = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+FILE_TYPES = [("Task files", "*.csv *.json *.ndjson *.jsonl"), ("All files", "*.*")]
+STATUSES = {PENDING: False, COMPLETED: True}
+
+
+class RecordError(ValueError):
+    pass
+
+
+def format_for(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type {extension or path!r}, expected one of {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+
+def read_records(path):
+    # Streams the file one record at a time; nothing is held beyond the
+    # current read buffer.
+    reader = {"csv": csv_records, "json": json_array_records, "ndjson": ndjson_records}[format_for(path)]
+    with open(path, encoding="utf-8", newline="" if reader is csv_records else None) as file:
+        yield from reader(file)
+
+
+def csv_records(file):
+    reader = csv.DictReader(file)
+    if reader.fieldnames is None or "text" not in reader.fieldnames:
+        raise RecordError("CSV files need a header row with a 'text' column")
+    yield from reader
+
+
+def ndjson_records(file):
+    for number, line in enumerate(file, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise RecordError(f"line {number}: {error}") from None
+
+
+def json_array_records(file, chunk_size=1 << 16):
+    # json.load would read the whole array into memory first; this decodes
+    # one element at a time from a sliding buffer instead.
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r"\s*")
+    buffer = ""
+    position = 0
+    eof = False
+    expect = "["
+    while True:
+        position = whitespace.match(buffer, position).end()
+        if not eof and len(buffer) - position < chunk_size:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if position == len(buffer):
+            raise RecordError("unexpected end of JSON array")
+        char = buffer[position]
+        if expect == "[":
+            if char != "[":
+                raise RecordError("JSON files must hold an array of task objects")
+            position += 1
+            expect = "first"
+        elif char == "]" and expect != "value":
+            return
+        elif expect == ",":
+            if char != ",":
+                raise RecordError(f"expected ',' or ']' in JSON array, found {char!r}")
+            position += 1
+            expect = "value"
+        else:
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except ValueError as error:
+                if eof:
+                    raise RecordError(f"invalid JSON: {error}") from None
+                # The element runs past the buffer: read more and retry.
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            expect = ","
+            yield record
+
+
+def task_row(record):
+    if not isinstance(record, dict):
+        raise RecordError("expected an object with a 'text' field")
+    text = record.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise RecordError("'text' must be a non-empty string")
+    completed = record.get("completed")
+    if completed is None:
+        status = record.get("status") or PENDING
+        if not isinstance(status, str) or status.strip().lower() not in STATUSES:
+            raise RecordError(f"unknown status {record.get('status')!r}")
+        completed = STATUSES[status.strip().lower()]
+    elif not isinstance(completed, bool):
+        raise RecordError("'completed' must be true or false")
+    return text, completed
+
+
+def validate(records, errors):
+    # Yields (text, completed) rows; invalid records are skipped and noted
+    # in `errors` so one bad line does not abort a large import.
+    for number, record in enumerate(records, 1):
+        try:
+            yield task_row(record)
+        except RecordError as error:
+            errors.append(f"record {number}: {error}")
+
+
+def insert_batches(store, rows, batch_size=5000):
+    # One change set per batch, appending rows to the end of their list.
+    # Indices are taken when each batch is requested, so edits made between
+    # batches are accounted for.
+    for batch in batched(rows, batch_size):
+        ends = {PENDING: len(store.pending), COMPLETED: len(store.completed)}
+        change_set = []
+        for text, completed in batch:
+            section = COMPLETED if completed else PENDING
+            change_set.append(changes.insert(section, ends[section], text))
+            ends[section] += 1
+        yield change_set
+
+
+def task_records(store):
+    for rows in (store.pending, store.completed):
+        for task in rows:
+            yield {"text": task.text, "status": COMPLETED if task.completed else PENDING}
+
+
+def write_records(path, records):
+    file_format = format_for(path)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="" if file_format == "csv" else None) as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=["text", "status"])
+            writer.writeheader()
+            for count, record in enumerate(records, 1):
+                writer.writerow(record)
+        elif file_format == "ndjson":
+            for count, record in enumerate(records, 1):
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            file.write("[")
+            for count, record in enumerate(records, 1):
+                file.write(("\n" if count == 1 else ",\n") + json.dumps(record, ensure_ascii=False))
+            file.write("\n]\n")
+    return count
+
+
+def import_file(path, tasks_file, batch_size=5000):
+    errors = []
+    storage = open_storage(tasks_file)
+    try:
+        storage.initialize()
+        store = storage.load()
+        count = 0
+        for change_set in insert_batches(store, validate(read_records(path), errors), batch_size):
+            storage.append([change._replace(task_id=store.apply(change).id) for change in change_set])
+            count += len(change_set)
+    finally:
+        storage.close()
+    return count, errors
+
+
+def export_file(path, tasks_file):
+    storage = open_storage(tasks_file)
+    try:
+        store = storage.load()
+    finally:
+        storage.close()
+    return write_records(path, task_records(store))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export tasks as CSV, JSON or NDJSON.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="the .csv, .json, .ndjson or .jsonl file to read or write")
+    parser.add_argument("--tasks", default="tasks.txt", help="task storage to use (default: tasks.txt)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    try:
+        format_for(args.path)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.command == "import":
+        if not os.path.exists(args.path):
+            parser.error(f"{args.path} does not exist")
+        try:
+            count, errors = import_file(args.path, args.tasks, args.batch_size)
+        except RecordError as error:
+            print(f"{args.path}: {error}", file=sys.stderr)
+            return 1
+        for error in errors:
+            print(f"{args.path}: skipped {error}", file=sys.stderr)
+        print(f"Imported {count} tasks from {args.path} into {args.tasks}")
+    else:
+        if not os.path.exists(args.tasks):
+            parser.error(f"{args.tasks} does not exist")
+        count = export_file(args.path, args.tasks)
+        print(f"Exported {count} tasks from {args.tasks} to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+from collections import namedtuple
+
+PENDING = "pending"
+COMPLETED = "completed"
+
+INSERT = "insert"
+REMOVE = "remove"
+MOVE = "move"
+RELABEL = "relabel"
+
+# A single edit to one of the two task lists. `index` is the row position in
+# `section` before the change; MOVE also carries where the row lands.
+# `task_id` is filled in once the change has been applied to the store.
+Change = namedtuple("Change", "kind section index text target target_index task_id", defaults=(None, None, None, None))
+
+
+def insert(section, index, text):
+    return Change(INSERT, section, index, text)
+
+
+def remove(section, index):
+    return Change(REMOVE, section, index)
+
+
+def move(section, index, target, target_index):
+    return Change(MOVE, section, index, target=target, target_index=target_index)
+
+
+def relabel(section, index, text):
+    return Change(RELABEL, section, index, text)
@@ -0,0 +1,126 @@
+import queue
+import threading
+import time
+
+
+class Job:
+    """A function handed to `StorageWriter.call`, and its outcome once run."""
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.value = None
+        self.error = None
+        self.finished = threading.Event()
+
+    def run(self):
+        try:
+            self.value = self.func(*self.args)
+        except Exception as error:
+            self.error = error
+        self.finished.set()
+
+    def done(self):
+        return self.finished.is_set()
+
+    def exception(self, timeout=None):
+        if not self.finished.wait(timeout):
+            raise TimeoutError("job still running")
+        return self.error
+
+    def result(self, timeout=None):
+        if self.exception(timeout) is not None:
+            raise self.error
+        return self.value
+
+
+class StorageWriter:
+    """Runs storage writes on one background thread.
+
+    Change sets that arrive within `delay` seconds of each other are written
+    with a single `storage.append` call. Failures are queued on `errors` for
+    the UI thread to pick up; this thread never touches Tk. Other slow file
+    work can be handed to it with `call`.
+    """
+
+    def __init__(self, storage, delay=0.05):
+        self.storage = storage
+        self.delay = delay
+        self.queue = queue.Queue()
+        self.errors = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="storage-writer", daemon=True)
+        self.thread.start()
+
+    def append(self, change_set):
+        self.queue.put(change_set)
+
+    def call(self, func, *args):
+        # Runs `func` here once everything queued before it is written. The
+        # returned Job is polled by the caller; failures are also queued on
+        # `errors`.
+        job = Job(func, args)
+        self.queue.put(job)
+        return job
+
+    def flush(self):
+        if not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def save(self, store):
+        # A full rewrite reads the live store, so it runs on the caller's
+        # thread once everything queued before it is on disk.
+        self.flush()
+        self.storage.save(store)
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.storage.close()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            pending = []
+            waiters = []
+            jobs = []
+            stop = False
+            deadline = time.monotonic() + self.delay
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                if isinstance(item, Job):
+                    jobs.append(item)
+                    break
+                pending.extend(item)
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if pending:
+                self.write(pending)
+            for job in jobs:
+                job.run()
+                if job.error is not None:
+                    self.errors.put(job.error)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def write(self, change_set):
+        try:
+            self.storage.append(change_set)
+        except Exception as error:
+            self.errors.put(error)
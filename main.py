@@ -1,26 +1,45 @@
-import tkinter as tk
-from tkinter import messagebox, simpledialog, ttk, Menu
+import argparse
 import os
-import unittest
-from io import BytesIO
-from unittest.mock import patch, mock_open
-from xmlrunner import XMLTestRunner
-import xml.etree.ElementTree as ET
+import tkinter as tk
+from tkinter import filedialog, messagebox, simpledialog, Menu
+from changes import COMPLETED, PENDING
+import perf
+import translations
+from task_view import VirtualTaskList
+from storage import FileInUseError
+from todo_core import TodoService
 
 
 class TodoApp:
-    def __init__(self, root):
+    def __init__(self, root, file_name="tasks.txt", lazy=False, shared=False, server=None, watch_interval=500, history=100,
+                 archive_keep=None):
         self.root = root
         self.root.title("Todo App")
-        self.task_list = []
-        self.completed_tasks = []
-        self.file_name = "tasks.txt"
-        self.current_language = "en"
-
-        self.initialize_file()
-        self.load_tasks()
+        self.file_name = file_name
+        if server is not None:
+            from sync_client import RemoteTodoService
+            self.core = RemoteTodoService(server)
+        else:
+            self.core = TodoService(file_name, background=True, shared=shared, history=history, archive_keep=archive_keep)
+        self.watch_interval = watch_interval
+        self.storage = self.core.storage
+        self.writer = self.core.writer
+        self.current_language = translations.DEFAULT_LANGUAGE
+        self.translate = translations.translator(self.current_language)
+        self.captions = {}
+        self.loading = None
+        self.indexing = False
+        self.importing = None
+        self.matches = None
+        self.archive_matches = None
+        self.shown_store = None
+
+        if not lazy:
+            self.load_tasks()
 
         self.create_menu()
+        self.root.bind("<Control-z>", lambda event: self.undo())
+        self.root.bind("<Control-y>", lambda event: self.redo())
 
         self.frame = tk.Frame(root)
         self.frame.pack(pady=10)
@@ -28,283 +47,408 @@ class TodoApp:
         self.task_entry = tk.Entry(self.frame, width=30)
         self.task_entry.grid(row=0, column=0)
 
-        self.add_task_button = tk.Button(self.frame, text="Add Task", command=self.add_task, bg="green", fg="white")
+        self.add_task_button = tk.Button(self.frame, textvariable=self.caption("Add Task"), command=self.add_task, bg="green", fg="white")
         self.add_task_button.grid(row=0, column=1)
 
+        self.search_label = tk.Label(self.frame, textvariable=self.caption("Search"))
+        self.search_label.grid(row=1, column=0, sticky='w')
+
+        self.search_var = tk.StringVar(self.root)
+        self.search_entry = tk.Entry(self.frame, width=30, textvariable=self.search_var)
+        self.search_entry.grid(row=1, column=0, columnspan=2, sticky='e')
+        self.search_var.trace_add("write", lambda *args: self.filter_tasks())
+
         self.pending_title = tk.Label(self.frame, text="Pending Tasks", fg="blue")
-        self.pending_title.grid(row=1, column=0, columnspan=2)
+        self.pending_title.grid(row=2, column=0, columnspan=2)
 
-        self.tasks_frame = tk.Frame(self.frame)
-        self.tasks_frame.grid(row=2, column=0, columnspan=2, pady=10)
+        self.tasks_frame = VirtualTaskList(self.frame, lambda: self.task_list, PENDING, caption=self.caption,
+                                           on_toggle=self.toggle_task_completion, on_edit=self.edit_task,
+                                           on_delete=self.delete_task)
+        self.tasks_frame.grid(row=3, column=0, columnspan=2, pady=10)
 
         self.completed_title = tk.Label(self.frame, text="Resolved Tasks", fg="green")
-        self.completed_title.grid(row=3, column=0, columnspan=2)
+        self.completed_title.grid(row=4, column=0, columnspan=2)
+
+        self.completed_frame = VirtualTaskList(self.frame, lambda: self.completed_tasks, COMPLETED, caption=self.caption,
+                                               on_toggle=self.toggle_task_completion, on_edit=self.edit_task,
+                                               on_delete=self.delete_task)
+        self.completed_frame.grid(row=5, column=0, columnspan=2, pady=10)
 
-        self.completed_frame = tk.Frame(self.frame)
-        self.completed_frame.grid(row=4, column=0, columnspan=2, pady=10)
+        if self.core.archive is not None:
+            self.create_archive_view()
 
         self.update_task_counter()
 
         self.load_tasks_in_frame()
 
+        if lazy:
+            self.start_loading()
+        else:
+            self.archive_resolved()
+        self.root.after(200, self.check_storage_errors)
+        if shared or server is not None:
+            self.root.after(self.watch_interval, self.watch_file)
+
+    @property
+    def store(self):
+        return self.core.store
+
+    @property
+    def task_list(self):
+        return self.store.pending
+
+    @property
+    def completed_tasks(self):
+        return self.store.completed
+
     def create_menu(self):
         menu = Menu(self.root)
         self.root.config(menu=menu)
 
         file_menu = Menu(menu, tearoff=0)
         menu.add_cascade(label="Options", menu=file_menu)
+        file_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        file_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+        file_menu.add_separator()
+        file_menu.add_command(label="Import Tasks...", command=self.import_tasks)
+        file_menu.add_command(label="Export Tasks...", command=self.export_tasks)
+        file_menu.add_separator()
         file_menu.add_command(label="Run Tests", command=self.run_tests)
+        file_menu.add_command(label="Run Tests in Parallel", command=lambda: self.run_tests(workers=min(4, os.cpu_count() or 1)))
+        file_menu.add_command(label="Performance", command=self.show_performance)
         file_menu.add_separator()
         language_menu = Menu(file_menu, tearoff=0)
         file_menu.add_cascade(label="Language", menu=language_menu)
-        language_menu.add_command(label="English", command=lambda: self.set_language("en"))
-        language_menu.add_command(label="French", command=lambda: self.set_language("fr"))
-        language_menu.add_command(label="Spanish", command=lambda: self.set_language("es"))
-        language_menu.add_command(label="Italian", command=lambda: self.set_language("it"))
-        language_menu.add_command(label="German", command=lambda: self.set_language("de"))
+        for code, name in translations.languages():
+            language_menu.add_command(label=name, command=lambda code=code: self.set_language(code))
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.exit_app)
+
+    def create_archive_view(self):
+        # Read-only and windowed like the other lists: only the rows on the
+        # page in view are read from the archive segments.
+        bar = tk.Frame(self.frame)
+        bar.grid(row=6, column=0, columnspan=2)
+        self.archive_title = tk.Label(bar, text="Archived Tasks", fg="gray")
+        self.archive_title.pack(side='left')
+        tk.Button(bar, text="◀", command=lambda: self.turn_archive_page(-1)).pack(side='left', padx=2)
+        self.archive_page = tk.Label(bar, text="")
+        self.archive_page.pack(side='left')
+        tk.Button(bar, text="▶", command=lambda: self.turn_archive_page(1)).pack(side='left', padx=2)
+        tk.Button(bar, textvariable=self.caption("Search Archive"), command=self.search_archive).pack(side='left', padx=5)
+
+        self.archive_frame = VirtualTaskList(self.frame, lambda: self.archive_rows, COMPLETED, caption=self.caption,
+                                             on_view_change=self.update_archive_page)
+        self.archive_frame.set_enabled(False)
+        self.archive_frame.grid(row=7, column=0, columnspan=2, pady=10)
+        self.archive_frame.refresh()
+
+    @property
+    def archive_rows(self):
+        return self.archive_matches if self.archive_matches is not None else self.core.archive.rows
+
+    def turn_archive_page(self, direction):
+        self.archive_frame.scroll(direction * self.archive_frame.visible_rows)
+
+    def update_archive_page(self):
+        total = len(self.archive_rows)
+        first = self.archive_frame.offset
+        self.archive_page.config(text=f"{first + 1}-{min(first + self.archive_frame.visible_rows, total)} / {total}" if total else "0 / 0")
+        if self.archive_matches is not None:
+            total = f"{total}/{len(self.core.archive)}"
+        self.archive_title.config(text=self.get_translation("Archived Tasks") + f" ({total})")
+
+    def search_archive(self):
+        query = self.search_var.get()
+        self.archive_matches = self.core.archive.search(query) if query.strip() else None
+        self.archive_frame.set_source(lambda: self.archive_rows)
+
+    def archive_resolved(self):
+        if self.core.archive is None or self.loading is not None:
+            return
+        change_set = self.core.archive_resolved()
+        if change_set:
+            self.apply_changes(change_set)
+            self.archive_frame.refresh()
 
     def initialize_file(self):
-        if not os.path.exists(self.file_name):
-            with open(self.file_name, 'w') as file:
-                pass
+        self.storage.initialize()
 
+    @perf.timed("load_tasks")
     def load_tasks(self):
-        with open(self.file_name, "r") as file:
-            for line in file:
-                parts = line.strip().rsplit(',', 1)
-                if len(parts) == 2:
-                    task, status = parts
-                    if status == 'completed':
-                        self.completed_tasks.append(task)
-                    else:
-                        self.task_list.append(task)
-
+        self.core.load()
+
+    def start_loading(self):
+        # Parse the file a batch at a time between Tk events so the window
+        # is usable while a large list streams in.
+        self.loading = self.core.load_iter()
+        self.set_editable(False)
+        self.root.after(1, self.load_next_batch)
+
+    @perf.timed("load_next_batch")
+    def load_next_batch(self):
+        error = None
+        try:
+            next(self.loading)
+        except StopIteration:
+            self.loading = None
+            self.set_editable(True)
+        except (ConnectionError, OSError) as exc:
+            # With --server the list arrives when the server answers; the
+            # client keeps reconnecting and the watcher shows it then.
+            self.loading = None
+            self.set_editable(True)
+            error = exc
+        else:
+            self.root.after(1, self.load_next_batch)
+        self.load_tasks_in_frame()
+        self.archive_resolved()
+        if error is not None:
+            messagebox.showerror(self.get_translation("Error"), self.get_translation("Could not load tasks:") + f" {error}")
+
+    def set_editable(self, editable):
+        state = tk.NORMAL if editable else tk.DISABLED
+        self.task_entry.config(state=state)
+        self.add_task_button.config(state=state)
+        self.search_entry.config(state=state)
+        self.tasks_frame.set_enabled(editable)
+        self.completed_frame.set_enabled(editable)
+
+    def import_tasks(self, path=None):
+        import bulk
+
+        if self.loading is not None or self.importing is not None:
+            return
+        path = path or filedialog.askopenfilename(filetypes=bulk.FILE_TYPES)
+        if not path:
+            return
+        # Records are read, validated and committed one batch per Tk event:
+        # each batch is one journal write and one refresh of the views.
+        self.import_errors = []
+        rows = bulk.validate(bulk.read_records(path), self.import_errors)
+        self.importing = bulk.insert_batches(self.store, rows)
+        self.root.after(1, self.import_next_batch)
+
+    def import_next_batch(self):
+        # The batch's end-of-list indices are taken under the lock, after
+        # edits from other processes are in.
+        error = None
+        with self.core.synced() as incoming:
+            self.apply_changes(incoming)
+            try:
+                self.commit(next(self.importing))
+            except StopIteration:
+                self.importing = None
+            except (OSError, ValueError) as exc:
+                self.importing = None
+                error = exc
+        if error is not None:
+            messagebox.showerror(self.get_translation("Error"), self.get_translation("Could not import tasks:") + f" {error}")
+        elif self.importing is None:
+            if self.import_errors:
+                self.show_import_errors(self.import_errors)
+        else:
+            self.root.after(1, self.import_next_batch)
+
+    def show_import_errors(self, errors):
+        shown = "\n".join(errors[:10])
+        if len(errors) > 10:
+            shown += f"\n... (+{len(errors) - 10})"
+        messagebox.showwarning(self.get_translation("Warning"), self.get_translation("Skipped invalid records:") + f"\n{shown}")
+
+    def export_tasks(self, path=None):
+        import bulk
+
+        path = path or filedialog.asksaveasfilename(filetypes=bulk.FILE_TYPES, defaultextension=".csv")
+        if not path:
+            return
+        try:
+            bulk.write_records(path, bulk.task_records(self.store))
+        except (OSError, ValueError) as error:
+            messagebox.showerror(self.get_translation("Error"), self.get_translation("Could not export tasks:") + f" {error}")
+
+    @perf.timed("save_tasks")
     def save_tasks(self):
-        with open(self.file_name, "w") as file:
-            for task in self.task_list:
-                file.write(f"{task},pending\n")
-            for task in self.completed_tasks:
-                file.write(f"{task},completed\n")
+        self.apply_changes(self.core.save())
+
+    def check_storage_errors(self):
+        while self.writer is not None and not self.writer.errors.empty():
+            error = self.writer.errors.get()
+            messagebox.showerror(self.get_translation("Error"), self.get_translation("Could not save tasks:") + f" {error}")
+        if self.core.archiving is not None:
+            self.archive_resolved()
+        self.root.after(200, self.check_storage_errors)
+
+    def watch_file(self):
+        # Polled: a stat of the journal (or a look at the sync client's
+        # queue) per tick; only what other processes changed is applied.
+        if self.loading is None and self.core.has_updates():
+            self.apply_changes(self.core.sync())
+            if self.core.archive is not None:
+                # Another process may have archived tasks.
+                rows = self.core.archive.rows
+                if self.core.archive.refresh() is not rows:
+                    self.archive_frame.refresh()
+        self.root.after(self.watch_interval, self.watch_file)
+
+    def close(self):
+        self.core.close()
+
+    def exit_app(self):
+        self.close()
+        self.root.quit()
 
     def add_task(self):
         task = self.task_entry.get()
         if task:
-            self.task_list.insert(0, task)
-            self.save_tasks()
-            self.load_tasks_in_frame()
-            self.update_task_counter()
+            self.apply_changes(self.core.add(task))
             self.task_entry.delete(0, tk.END)
+            self.tasks_frame.see(0)
         else:
             self.show_warning("You must enter a task.")
 
-    def load_tasks_in_frame(self):
-        for widget in self.tasks_frame.winfo_children():
-            widget.destroy()
-        for widget in self.completed_frame.winfo_children():
-            widget.destroy()
-
-        for task in self.task_list:
-            self.create_task_frame(self.tasks_frame, task, completed=False)
-
-        for task in self.completed_tasks:
-            self.create_task_frame(self.completed_frame, task, completed=True)
+    def commit(self, change_set):
+        self.apply_changes(self.core.commit(change_set))
 
+    @perf.timed("apply_changes")
+    def apply_changes(self, change_set):
+        if self.store is not self.shown_store:
+            # Another process replaced the file and it was loaded again.
+            self.load_tasks_in_frame()
+            return
+        if self.matches is not None:
+            # Change indices refer to the full lists, not the filtered view.
+            self.filter_tasks()
+            return
+        self.tasks_frame.apply_changes(change_set)
+        self.completed_frame.apply_changes(change_set)
         self.update_task_counter()
 
-    def create_task_frame(self, parent_frame, task, completed=False):
-        task_frame = tk.Frame(parent_frame, pady=2)
-        task_frame.pack(fill='x', padx=5, pady=2)
-
-        task_var = tk.StringVar(value=task)
-
-        task_check = tk.Checkbutton(task_frame, variable=task_var, onvalue=task, offvalue="",
-                                    command=lambda t=task: self.toggle_task_completion(t))
-        task_check.pack(side='left')
+    def filter_tasks(self):
+        matches = self.core.search(self.search_var.get())
+        if matches is not None:
+            self.matches = matches
+            self.tasks_frame.set_source(lambda: self.matches[0])
+            self.completed_frame.set_source(lambda: self.matches[1])
+        elif self.matches is not None:
+            self.matches = None
+            self.tasks_frame.set_source(lambda: self.task_list)
+            self.completed_frame.set_source(lambda: self.completed_tasks)
+        self.update_task_counter()
 
-        task_label = tk.Label(task_frame, text=task)
-        if completed:
-            task_label.config(fg="gray", font=("Helvetica", 10, "italic"))
-            task_check.select()
-        task_label.pack(side='left', padx=5)
+    @perf.timed("load_tasks_in_frame")
+    def load_tasks_in_frame(self):
+        self.shown_store = self.store
+        if self.loading is None:
+            self.start_indexing()
+        if self.matches is not None:
+            self.filter_tasks()
+            return
+        self.tasks_frame.refresh()
+        self.completed_frame.refresh()
+        self.update_task_counter()
 
-        button_frame = tk.Frame(task_frame)
-        button_frame.pack(side='right')
+    def start_indexing(self):
+        # The search index of a newly loaded list is built a slice per Tk
+        # event, so the first keystroke in the search box does not build it.
+        if not self.indexing and self.core.search_index is None:
+            self.indexing = True
+            self.root.after(1, self.index_next_batch)
+
+    @perf.timed("index_next_batch")
+    def index_next_batch(self):
+        if self.loading is None and self.core.index_step():
+            self.root.after(1, self.index_next_batch)
+        else:
+            self.indexing = False
 
-        task_edit_button = tk.Button(button_frame, text=self.get_translation("Edit"), command=lambda t=task: self.edit_task(t), bg="green", fg="white")
-        task_edit_button.pack(side='right', padx=5)
+    def toggle_task_completion(self, task_id):
+        self.apply_changes(self.core.toggle(task_id))
+        self.archive_resolved()
 
-        task_delete_button = tk.Button(button_frame, text=self.get_translation("Delete"), command=lambda t=task: self.delete_task(t), bg="red", fg="white")
-        task_delete_button.pack(side='right', padx=5)
+    def delete_task(self, task_id):
+        self.apply_changes(self.core.remove(task_id))
 
-        separator = ttk.Separator(parent_frame, orient='horizontal')
-        separator.pack(fill='x', padx=5, pady=2)
+    def undo(self):
+        if self.loading is None and self.importing is None:
+            self.apply_changes(self.core.undo())
 
-    def toggle_task_completion(self, task):
-        if task in self.task_list:
-            self.task_list.remove(task)
-            self.completed_tasks.append(task)
-        elif task in self.completed_tasks:
-            self.completed_tasks.remove(task)
-            self.task_list.insert(0, task)
-        self.save_tasks()
-        self.load_tasks_in_frame()
-        self.update_task_counter()
+    def redo(self):
+        if self.loading is None and self.importing is None:
+            self.apply_changes(self.core.redo())
 
-    def delete_task(self, task):
-        if task in self.task_list:
-            self.task_list.remove(task)
-        elif task in self.completed_tasks:
-            self.completed_tasks.remove(task)
-        self.save_tasks()
-        self.load_tasks_in_frame()
-        self.update_task_counter()
+    def edit_task(self, task_id):
+        task = self.store.get(task_id)
+        if task is None:
+            return
+        new_task = simpledialog.askstring(self.get_translation("Edit Task"), self.get_translation("Edit the task:"), initialvalue=task.text)
 
-    def edit_task(self, task):
-        new_task = simpledialog.askstring(self.get_translation("Edit Task"), self.get_translation("Edit the task:"), initialvalue=task)
-
-        if new_task:
-            if task in self.task_list:
-                index = self.task_list.index(task)
-                self.task_list[index] = new_task
-            elif task in self.completed_tasks:
-                index = self.completed_tasks.index(task)
-                self.completed_tasks[index] = new_task
-            self.save_tasks()
-            self.load_tasks_in_frame()
+        if new_task and self.store.get(task_id) is task:
+            self.apply_changes(self.core.relabel(task_id, new_task))
 
     def update_task_counter(self):
         pending_count = len(self.task_list)
         resolved_count = len(self.completed_tasks)
+        if self.matches is not None:
+            pending_count = f"{len(self.matches[0])}/{pending_count}"
+            resolved_count = f"{len(self.matches[1])}/{resolved_count}"
         self.pending_title.config(text=self.get_translation("Pending Tasks") + f" ({pending_count})")
         self.completed_title.config(text=self.get_translation("Resolved Tasks") + f" ({resolved_count})")
 
-    def run_tests(self):
-        test_output = BytesIO()
-        runner = XMLTestRunner(output=test_output)
-
-        suite = unittest.TestLoader().loadTestsFromModule(__import__('test_main'))
-
-        runner.run(suite)
-
-        test_output.seek(0)
-        test_results = test_output.read().decode('utf-8')
+    def run_tests(self, module="test_main", workers=1):
+        # The runner and its window are only imported when the menu item is
+        # used, so test tooling costs nothing at startup.
+        from results_view import TestResultsWindow
+        from suite_runner import SuiteRun
 
-        self.display_test_results(test_results)
+        return TestResultsWindow(self.root, SuiteRun(module, workers).start())
 
-    def display_test_results(self, test_results):
-        root = ET.fromstring(test_results)
+    def show_performance(self):
+        from perf_view import PerformanceWindow
 
-        results_window = tk.Toplevel(self.root)
-        results_window.title("Test Results")
-
-        results_text = tk.Text(results_window, wrap='word')
-
-        for testsuite in root.findall('testsuite'):
-            suite_name = testsuite.get('name')
-            total_tests = testsuite.get('tests')
-            failures = testsuite.get('failures')
-            errors = testsuite.get('errors')
-            skipped = testsuite.get('skipped')
-            time = testsuite.get('time')
-
-            results_text.insert(tk.END, f"Test Suite: {suite_name}\n")
-            results_text.insert(tk.END,
-                                f"Total Tests: {total_tests}, Failures: {failures}, Errors: {errors}, Skipped: {skipped}, Time: {time}s\n\n")
-
-            for testcase in testsuite.findall('testcase'):
-                classname = testcase.get('classname')
-                name = testcase.get('name')
-                time = testcase.get('time')
-
-                results_text.insert(tk.END, f"Test Case: {name} ({classname}) - Time: {time}s\n")
-
-                failure = testcase.find('failure')
-                if failure is not None:
-                    message = failure.get('message')
-                    results_text.insert(tk.END, f"  FAILURE: {message}\n")
-
-                error = testcase.find('error')
-                if error is not None:
-                    message = error.get('message')
-                    results_text.insert(tk.END, f"  ERROR: {message}\n")
-
-                results_text.insert(tk.END, "\n")
-
-        results_text.config(state=tk.DISABLED)
-        results_text.pack(expand=True, fill='both')
+        return PerformanceWindow(self.root)
 
     def set_language(self, language):
         self.current_language = language
+        self.translate = translations.translator(language)
         self.update_language()
 
     def update_language(self):
-        self.add_task_button.config(text=self.get_translation("Add Task"))
-        self.pending_title.config(text=self.get_translation("Pending Tasks") + f" ({len(self.task_list)})")
-        self.completed_title.config(text=self.get_translation("Resolved Tasks") + f" ({len(self.completed_tasks)})")
-        self.load_tasks_in_frame()
+        # Every button caption is bound to one StringVar per message, so this
+        # updates all rows at once without touching the row widgets.
+        for text, var in self.captions.items():
+            var.set(self.get_translation(text))
+        self.update_task_counter()
+        if self.core.archive is not None:
+            self.update_archive_page()
+
+    def caption(self, text):
+        var = self.captions.get(text)
+        if var is None:
+            var = self.captions[text] = tk.StringVar(self.root, value=self.get_translation(text))
+        return var
 
+    @perf.timed("get_translation")
     def get_translation(self, text):
-        translations = {
-            "en": {
-                "Add Task": "Add Task",
-                "Edit": "Edit",
-                "Delete": "Delete",
-                "Pending Tasks": "Pending Tasks",
-                "Resolved Tasks": "Resolved Tasks",
-                "Edit Task": "Edit Task",
-                "Edit the task:": "Edit the task:",
-                "You must enter a task.": "You must enter a task."
-            },
-            "fr": {
-                "Add Task": "Ajouter Tâche",
-                "Edit": "Modifier",
-                "Delete": "Supprimer",
-                "Pending Tasks": "Tâches en attente",
-                "Resolved Tasks": "Tâches résolues",
-                "Edit Task": "Modifier la tâche",
-                "Edit the task:": "Modifiez la tâche:",
-                "You must enter a task.": "Vous devez entrer une tâche."
-            },
-            "es": {
-                "Add Task": "Añadir tarea",
-                "Edit": "Editar",
-                "Delete": "Eliminar",
-                "Pending Tasks": "Tareas pendientes",
-                "Resolved Tasks": "Tareas resueltas",
-                "Edit Task": "Editar tarea",
-                "Edit the task:": "Edita la tarea:",
-                "You must enter a task.": "Debes ingresar una tarea."
-            },
-            "it": {
-                "Add Task": "Aggiungi compito",
-                "Edit": "Modifica",
-                "Delete": "Elimina",
-                "Pending Tasks": "Compiti in sospeso",
-                "Resolved Tasks": "Compiti risolti",
-                "Edit Task": "Modifica compito",
-                "Edit the task:": "Modifica il compito:",
-                "You must enter a task.": "Devi inserire un compito."
-            },
-            "de": {
-                "Add Task": "Aufgabe hinzufügen",
-                "Edit": "Bearbeiten",
-                "Delete": "Löschen",
-                "Pending Tasks": "Ausstehende Aufgaben",
-                "Resolved Tasks": "Erledigte Aufgaben",
-                "Edit Task": "Aufgabe bearbeiten",
-                "Edit the task:": "Bearbeiten Sie die Aufgabe:",
-                "You must enter a task.": "Sie müssen eine Aufgabe eingeben."
-            }
-        }
-        return translations[self.current_language].get(text, text)
+        return self.translate(text)
 
     def show_warning(self, message):
         messagebox.showwarning(self.get_translation("Warning"), self.get_translation(message))
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Todo App")
+    parser.add_argument("--tasks", default="tasks.txt", help="task storage to use (default: tasks.txt)")
+    parser.add_argument("--shared", action="store_true", help="let other windows and todo.py edit the same tasks.txt")
+    parser.add_argument("--server", metavar="HOST:PORT", help="work on the list served by sync_server.py")
+    args = parser.parse_args()
     root = tk.Tk()
-    app = TodoApp(root)
+    try:
+        app = TodoApp(root, file_name=args.tasks, lazy=True, shared=args.shared, server=args.server,
+                      watch_interval=50 if args.server else 500, archive_keep=1000)
+    except FileInUseError as error:
+        translate = translations.translator(translations.DEFAULT_LANGUAGE)
+        messagebox.showerror(translate("Error"), translate("Could not load tasks:") + f" {error}")
+        raise SystemExit(1)
     root.mainloop()
+    app.close()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+
+from snapshot import is_snapshot, read_store, write_snapshot
+from storage import open_storage
+
+
+def migrate(source, destination):
+    # A .tsnap binary snapshot is read or written whole; it is not a
+    # storage the app writes to.
+    if is_snapshot(source):
+        store = read_store(source)
+    else:
+        source_storage = open_storage(source)
+        try:
+            store = source_storage.load()
+        finally:
+            source_storage.close()
+
+    if is_snapshot(destination):
+        write_snapshot(destination, store)
+        return len(store)
+    destination_storage = open_storage(destination)
+    try:
+        destination_storage.initialize()
+        destination_storage.save(store)
+    finally:
+        destination_storage.close()
+    return len(store)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy every task from one storage backend to another, e.g. tasks.txt to tasks.db or tasks.tsnap.")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    parser.add_argument("--force", action="store_true", help="overwrite a destination that already exists")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} does not exist")
+    if os.path.exists(args.destination) and not args.force:
+        parser.error(f"{args.destination} already exists, use --force to overwrite it")
+
+    count = migrate(args.source, args.destination)
+    print(f"Migrated {count} tasks from {args.source} to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import io
+import json
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import wraps
+
+# Upper bounds of the histogram buckets, in seconds; the last bucket is
+# everything slower.
+BUCKETS = (1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.3, 1.0, 3.0)
+
+
+def bucket_label(index):
+    if index == len(BUCKETS):
+        return f">{format_seconds(BUCKETS[-1])}"
+    return f"<={format_seconds(BUCKETS[index])}"
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.0f}ms"
+    return f"{seconds:.0f}s"
+
+
+class Timer:
+    __slots__ = ("calls", "total", "worst", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def percentile(self, share):
+        # The upper bound of the bucket the percentile falls in.
+        wanted = share * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= wanted:
+                return BUCKETS[index] if index < len(BUCKETS) else self.worst
+        return 0.0
+
+    def summary(self):
+        return {"calls": self.calls, "total": self.total, "max": self.worst,
+                "p50": self.percentile(0.5), "p95": self.percentile(0.95),
+                "histogram": {bucket_label(index): count for index, count in enumerate(self.buckets) if count}}
+
+
+class Recorder:
+    """Timings and counters for the app's hot paths.
+
+    Timing a call costs two perf_counter reads and a bisect, so it is
+    always on. The cProfile/tracemalloc capture is not, and is only
+    imported when started.
+    """
+
+    def __init__(self):
+        self.timers = defaultdict(Timer)
+        self.counters = defaultdict(int)
+        self.profiler = None
+
+    def timed(self, name):
+        def decorate(function):
+            timer = self.timers[name]
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    timer.add(time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def reset(self):
+        for timer in self.timers.values():
+            timer.__init__()
+        self.counters.clear()
+
+    def snapshot(self, **extra):
+        return {"timers": {name: timer.summary() for name, timer in self.timers.items()},
+                "counters": dict(self.counters), **extra}
+
+    def export(self, path, **extra):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(**extra), file, indent=2)
+
+    @property
+    def capturing(self):
+        return self.profiler is not None
+
+    def start_capture(self):
+        import cProfile
+        import tracemalloc
+
+        tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_capture(self, limit=20):
+        # Returns the report: the slowest functions by cumulative time on
+        # the capturing thread, then the lines that allocated the most.
+        import tracemalloc
+
+        # Both stop before anything else runs, so the report's own work is
+        # not in it.
+        self.profiler.disable()
+        allocations = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+        tracemalloc.stop()
+        import pstats
+
+        report = io.StringIO()
+        pstats.Stats(self.profiler, stream=report).sort_stats("cumulative").print_stats(limit)
+        self.profiler = None
+        report.write("Allocations still held, by line:\n")
+        for statistic in allocations:
+            report.write(f"  {statistic}\n")
+        return report.getvalue()
+
+
+recorder = Recorder()
+timed = recorder.timed
+count = recorder.count
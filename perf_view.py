@@ -0,0 +1,90 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+from perf import BUCKETS, bucket_label, format_seconds, recorder
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class PerformanceWindow(tk.Toplevel):
+    """Shows perf.recorder's timings and counters, refreshed every `interval` ms.
+
+    The profile capture button starts cProfile and tracemalloc; pressing it
+    again stops them and shows what they found below the table.
+    """
+
+    def __init__(self, master, interval=1000):
+        super().__init__(master)
+        self.interval = interval
+        self.title("Performance")
+
+        bar = tk.Frame(self)
+        bar.pack(fill='x')
+        tk.Button(bar, text="Export JSON...", command=self.export).pack(side='left', padx=5)
+        tk.Button(bar, text="Reset", command=self.reset).pack(side='left', padx=5)
+        self.capture_button = tk.Button(bar, command=self.toggle_capture)
+        self.capture_button.pack(side='right', padx=5)
+        self.update_capture_button()
+
+        self.stats_text = tk.Text(self, wrap='none', height=20, width=100)
+        self.stats_text.pack(expand=True, fill='both')
+        self.report_text = tk.Text(self, wrap='none', height=15, width=100)
+        self.refresh()
+
+    def snapshot(self):
+        return recorder.snapshot(widgets=count_widgets(self.master.winfo_toplevel()))
+
+    def format(self, snapshot):
+        lines = [f"{'':<22}{'calls':>8}{'total ms':>11}{'mean ms':>10}{'p50':>8}{'p95':>8}{'max ms':>10}  histogram"]
+        for name, timer in sorted(snapshot["timers"].items()):
+            calls = timer["calls"]
+            mean = timer["total"] / calls * 1000 if calls else 0
+            histogram = " ".join(f"{label}:{count}" for label, count in timer["histogram"].items())
+            lines.append(f"{name:<22}{calls:>8}{timer['total'] * 1000:>11.1f}{mean:>10.3f}"
+                         f"{format_seconds(timer['p50']):>8}{format_seconds(timer['p95']):>8}"
+                         f"{timer['max'] * 1000:>10.1f}  {histogram}")
+        lines.append("")
+        lines.append(f"{'widgets':<22}{snapshot['widgets']:>8}")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<22}{value:>8}")
+        lines.append("")
+        lines.append("Buckets: " + " ".join(bucket_label(index) for index in range(len(BUCKETS) + 1)))
+        return "\n".join(lines) + "\n"
+
+    def show(self, text_widget, text):
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert(tk.END, text)
+        text_widget.config(state=tk.DISABLED)
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        self.show(self.stats_text, self.format(self.snapshot()))
+        self.after(self.interval, self.refresh)
+
+    def reset(self):
+        recorder.reset()
+        self.show(self.stats_text, self.format(self.snapshot()))
+
+    def export(self, path=None):
+        path = path or filedialog.asksaveasfilename(filetypes=[("JSON", "*.json")], defaultextension=".json")
+        if not path:
+            return
+        try:
+            recorder.export(path, widgets=count_widgets(self.master.winfo_toplevel()))
+        except OSError as error:
+            messagebox.showerror("Error", f"Could not export: {error}")
+
+    def toggle_capture(self):
+        if recorder.capturing:
+            self.report_text.pack(expand=True, fill='both')
+            self.show(self.report_text, recorder.stop_capture())
+        else:
+            recorder.start_capture()
+        self.update_capture_button()
+
+    def update_capture_button(self):
+        self.capture_button.config(text="Stop Profile Capture" if recorder.capturing else "Start Profile Capture")
@@ -0,0 +1,84 @@
+import queue
+import tkinter as tk
+
+from suite_runner import ERROR, FAILURE, PASSED, SKIPPED
+
+
+class TestResultsWindow(tk.Toplevel):
+    """Shows a suite_runner.SuiteRun as its results come in.
+
+    The run's queue is polled from Tk every `interval` ms, so the app stays
+    responsive while the tests run in their own processes.
+    """
+
+    def __init__(self, master, run, interval=50):
+        super().__init__(master)
+        self.run = run
+        self.interval = interval
+        self.running = run.workers
+        self.counts = dict.fromkeys((PASSED, FAILURE, ERROR, SKIPPED), 0)
+        self.title("Test Results")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        bar = tk.Frame(self)
+        bar.pack(fill='x')
+        self.status = tk.Label(bar, text=f"Running {run.module} in {run.workers} process(es)...")
+        self.status.pack(side='left', padx=5)
+        self.cancel_button = tk.Button(bar, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(side='right', padx=5)
+
+        self.results_text = tk.Text(self, wrap='word')
+        self.results_text.pack(expand=True, fill='both')
+        self.write(f"Test Suite: {run.module}\n\n")
+        self.after(self.interval, self.poll)
+
+    def write(self, text):
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.insert(tk.END, text)
+        self.results_text.config(state=tk.DISABLED)
+        self.results_text.see(tk.END)
+
+    def poll(self):
+        if not self.winfo_exists():
+            return
+        lines = []
+        while True:
+            try:
+                result = self.run.results.get_nowait()
+            except queue.Empty:
+                break
+            if result is None:
+                self.running -= 1
+            else:
+                self.counts[result["outcome"]] += 1
+                lines.append(self.format(result))
+        if lines:
+            self.write("".join(lines))
+        if self.running:
+            self.status.config(text=f"Ran {sum(self.counts.values())} tests...")
+            self.after(self.interval, self.poll)
+        else:
+            self.finish()
+
+    def format(self, result):
+        text = f"Test Case: {result['name']} ({result['classname']}) - Time: {result['time']}s\n"
+        if result["outcome"] != PASSED:
+            text += f"  {result['outcome'].upper()}: {result['message']}\n"
+        return text + "\n"
+
+    def finish(self):
+        counts = self.counts
+        summary = (f"Total Tests: {sum(counts.values())}, Failures: {counts[FAILURE]}, Errors: {counts[ERROR]}, "
+                   f"Skipped: {counts[SKIPPED]}, Time: {self.run.elapsed():.3f}s")
+        if self.run.cancelled:
+            summary = "Cancelled. " + summary
+        self.write(summary + "\n")
+        self.status.config(text=summary)
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def cancel(self):
+        self.run.cancel()
+
+    def close(self):
+        self.run.cancel()
+        self.destroy()
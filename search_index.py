@@ -0,0 +1,94 @@
+import re
+from bisect import bisect_left, insort
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return set(TOKEN.findall(text.casefold()))
+
+
+def matcher(query):
+    # The same rule as SearchIndex.search, for text that is not indexed:
+    # every word of the query starts some word of the text.
+    words = TOKEN.findall(query.casefold())
+    return lambda text: all(any(token.startswith(word) for token in tokenize(text)) for word in words)
+
+
+class SearchIndex:
+    """Inverted index from lowercased word to task ids.
+
+    The words are also kept sorted so that a prefix maps to one contiguous
+    run of them, which is what type-ahead matching needs.
+    """
+
+    def __init__(self, tasks=()):
+        self.postings = {}
+        self.words = []
+        self.terms = {}
+        for task in tasks:
+            self.postings_for(task.id, task.text)
+        self.words = sorted(self.postings)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def build(self, tasks, batch_size=1000):
+        # Indexes `tasks` a batch at a time, yielding after each, so a UI can
+        # spread the work over its events. The sorted word list is made once
+        # at the end.
+        for start in range(0, len(tasks), batch_size):
+            for task in tasks[start:start + batch_size]:
+                self.postings_for(task.id, task.text)
+            yield
+        self.words = sorted(self.postings)
+
+    def postings_for(self, task_id, text):
+        # Bulk path used while building: the sorted word list is made once
+        # at the end instead of kept in order on every new word.
+        words = tokenize(text)
+        self.terms[task_id] = words
+        for word in words:
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = set()
+            ids.add(task_id)
+        return words
+
+    def add(self, task_id, text):
+        for word in self.postings_for(task_id, text):
+            if len(self.postings[word]) == 1:
+                insort(self.words, word)
+
+    def remove(self, task_id):
+        for word in self.terms.pop(task_id, ()):
+            ids = self.postings[word]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def update(self, task_id, text):
+        self.remove(task_id)
+        self.add(task_id, text)
+
+    def prefix(self, prefix):
+        start = bisect_left(self.words, prefix)
+        end = bisect_left(self.words, prefix + "\U0010ffff", start)
+        if end - start == 1:
+            return self.postings[self.words[start]]
+        return set().union(*(self.postings[word] for word in self.words[start:end]))
+
+    def search(self, query):
+        # Every word of the query must match the start of some word in the
+        # task, so "buy mi" finds "Buy milk" while it is being typed.
+        words = sorted(TOKEN.findall(query.casefold()), key=len, reverse=True)
+        if not words:
+            return None
+        result = None
+        for word in words:
+            ids = self.prefix(word)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
@@ -0,0 +1,155 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from changes import COMPLETED
+from task_store import Task, TaskStore
+
+EXTENSION = ".tsnap"
+MAGIC = b"TODOSNAP"
+VERSION = 1
+# magic, version, task count, pending count, offset table position, status
+# bitmap position. The string heap starts right after the header.
+HEADER = struct.Struct("<8sIQQQQ")
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def write_snapshot(path, store):
+    """Writes `store` as a binary snapshot: header, UTF-8 string heap, offset
+    table and a status bitmap with one bit per task, set when completed.
+
+    Pending tasks come first, as in tasks.txt. Written next to `path` and
+    renamed over it.
+    """
+    temp_name = path + ".tmp"
+    offsets = array("Q", [0])
+    bitmap = bytearray((len(store) + 7) // 8)
+    with open(temp_name, "wb") as file:
+        file.write(bytes(HEADER.size))
+        heap = 0
+        row = 0
+        for rows in (store.pending, store.completed):
+            for task in rows:
+                data = task.text.encode("utf-8")
+                file.write(data)
+                heap += len(data)
+                offsets.append(heap)
+                if task.completed:
+                    bitmap[row >> 3] |= 1 << (row & 7)
+                row += 1
+        # The offset table is 8-byte aligned.
+        file.write(bytes(-(HEADER.size + heap) % 8))
+        table = file.tell()
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        offsets.tofile(file)
+        file.write(bitmap)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, row, len(store.pending), table, table + 8 * len(offsets)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_name, path)
+
+
+class SnapshotRows:
+    """One section of a snapshot as a read-only sequence of Tasks.
+
+    A Task is built, and its text decoded, only when its row is indexed, so
+    a view that shows a screenful touches a screenful of the file.
+    """
+
+    def __init__(self, snapshot, start, stop):
+        self.snapshot = snapshot
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        return self.snapshot.task(self.start + index)
+
+    def __iter__(self):
+        for row in range(self.start, self.stop):
+            yield self.snapshot.task(row)
+
+
+class SnapshotFile:
+    """A snapshot opened with mmap: opening reads the header and nothing else.
+
+    Task ids are row numbers from 1, pending tasks first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotError(f"{path} is not a task snapshot")
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.pending_count, self.table, self.bitmap = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise SnapshotError(f"{path} is not a version {VERSION} task snapshot")
+        if self.pending_count > self.count or self.bitmap + (self.count + 7) // 8 > size \
+                or self.table + 8 * (self.count + 1) != self.bitmap:
+            self.map.close()
+            raise SnapshotError(f"{path} is truncated")
+        self.offsets = memoryview(self.map)[self.table:self.bitmap].cast("Q")
+        if sys.byteorder != "little":
+            self.offsets = array("Q", self.offsets)
+            self.offsets.byteswap()
+        self.pending = SnapshotRows(self, 0, self.pending_count)
+        self.completed = SnapshotRows(self, self.pending_count, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def section(self, name):
+        return self.completed if name == COMPLETED else self.pending
+
+    def text(self, row):
+        start = HEADER.size + self.offsets[row]
+        return self.map[start:HEADER.size + self.offsets[row + 1]].decode("utf-8")
+
+    def is_completed(self, row):
+        return bool(self.map[self.bitmap + (row >> 3)] >> (row & 7) & 1)
+
+    def task(self, row):
+        return Task(row + 1, self.text(row), self.is_completed(row))
+
+    def to_store(self):
+        store = TaskStore()
+        store.extend((self.text(row), self.is_completed(row)) for row in range(self.count))
+        return store
+
+    def close(self):
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.map.close()
+
+
+def read_store(path):
+    with SnapshotFile(path) as snapshot:
+        return snapshot.to_store()
+
+
+def is_snapshot(path):
+    return os.path.splitext(path)[1].lower() == EXTENSION
@@ -0,0 +1,106 @@
+import sqlite3
+
+from changes import COMPLETED, INSERT, MOVE, PENDING, RELABEL, REMOVE
+from storage import Storage
+from task_store import TaskStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('pending', 'completed')),
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_position ON tasks (status, position);
+"""
+
+
+class SqliteStorage(Storage):
+    """Tasks as rows ordered by a per-status position; a change touches one row."""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.connection = None
+        self.counts = {PENDING: 0, COMPLETED: 0}
+
+    def connect(self):
+        if self.connection is None:
+            # Writes move to the storage writer thread after loading.
+            self.connection = sqlite3.connect(self.file_name, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        return self.connection
+
+    def initialize(self):
+        self.connect().executescript(SCHEMA)
+
+    def load_iter(self, batch_size=5000):
+        connection = self.connect()
+        store = TaskStore()
+        for status in (PENDING, COMPLETED):
+            cursor = connection.execute("SELECT id, text FROM tasks WHERE status = ? ORDER BY position", (status,))
+            while rows := cursor.fetchmany(batch_size):
+                store.extend((text, status == COMPLETED, task_id) for task_id, text in rows)
+                yield store
+        self.counts = {PENDING: len(store.pending), COMPLETED: len(store.completed)}
+        yield store
+
+    def append(self, change_set):
+        with self.connection:
+            for change in change_set:
+                self.apply(change)
+
+    def apply(self, change):
+        if change.kind == INSERT:
+            self.connection.execute(
+                "INSERT INTO tasks (id, text, status, position) VALUES (?, ?, ?, ?)",
+                (change.task_id, change.text, change.section, self.position_for(change.section, change.index)))
+            self.counts[change.section] += 1
+        elif change.kind == REMOVE:
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (change.task_id,))
+            self.counts[change.section] -= 1
+        elif change.kind == MOVE:
+            self.counts[change.section] -= 1
+            self.connection.execute(
+                "UPDATE tasks SET status = ?, position = ? WHERE id = ?",
+                (change.target, self.position_for(change.target, change.target_index), change.task_id))
+            self.counts[change.target] += 1
+        elif change.kind == RELABEL:
+            self.connection.execute("UPDATE tasks SET text = ? WHERE id = ?", (change.text, change.task_id))
+
+    def position_for(self, status, index):
+        # Head and tail inserts only read one end of the (status, position)
+        # index; anything in between takes the midpoint of its neighbours.
+        if self.counts[status] == 0:
+            return 0.0
+        if index <= 0:
+            return self.connection.execute("SELECT MIN(position) FROM tasks WHERE status = ?", (status,)).fetchone()[0] - 1
+        if index >= self.counts[status]:
+            return self.connection.execute("SELECT MAX(position) FROM tasks WHERE status = ?", (status,)).fetchone()[0] + 1
+        before, after = [row[0] for row in self.connection.execute(
+            "SELECT position FROM tasks WHERE status = ? ORDER BY position LIMIT 2 OFFSET ?", (status, index - 1))]
+        middle = (before + after) / 2
+        if before < middle < after:
+            return middle
+        self.renumber(status)
+        return index - 0.5
+
+    def renumber(self, status):
+        rows = self.connection.execute("SELECT id FROM tasks WHERE status = ? ORDER BY position", (status,)).fetchall()
+        self.connection.executemany("UPDATE tasks SET position = ? WHERE id = ?",
+                                    ((position, task_id) for position, (task_id,) in enumerate(rows)))
+
+    def save(self, store):
+        connection = self.connect()
+        with connection:
+            connection.execute("DELETE FROM tasks")
+            for status, rows in ((PENDING, store.pending), (COMPLETED, store.completed)):
+                connection.executemany(
+                    "INSERT INTO tasks (id, text, status, position) VALUES (?, ?, ?, ?)",
+                    ((task.id, task.text, status, position) for position, task in enumerate(rows)))
+        self.counts = {PENDING: len(store.pending), COMPLETED: len(store.completed)}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,547 @@
+import json
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager, nullcontext
+from itertools import chain, islice
+
+import perf
+from changes import Change
+from task_store import TaskStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, one process per file
+    fcntl = None
+
+
+# One task per line, so backslashes and line breaks in the text are escaped.
+# Commas need no escaping: the status is always after the last one.
+ESCAPES = {"\\": "\\\\", "\n": "\\n", "\r": "\\r"}
+UNESCAPES = {value: key for key, value in ESCAPES.items()}
+ESCAPED = re.compile(r"[\\\n\r]")
+UNESCAPED = re.compile(r"\\[\\nr]")
+
+# First line of every tasks.txt written with escaped text. It has no comma,
+# so it is not a task to older readers. Format 2 lines are "text,status";
+# format 3 adds the task id in front and the next free id to this line, so
+# ids stay the same across saves and compactions. A file without the line
+# predates escaping: its lines are read the old way, backslashes as they
+# are. Older formats are rewritten as format 3 by the next save or
+# compaction.
+FORMAT = 3
+MARKER = re.compile(r"# tasks\.txt format (\d+)(?: next (\d+))?\n")
+
+
+def format_marker(next_id):
+    return f"# tasks.txt format {FORMAT} next {next_id}\n"
+
+
+def escape(text):
+    return ESCAPED.sub(lambda match: ESCAPES[match.group()], text)
+
+
+def unescape(text):
+    return UNESCAPED.sub(lambda match: UNESCAPES[match.group()], text)
+
+
+def parse_line(line):
+    parts = line.rstrip('\r\n').rsplit(',', 1)
+    if len(parts) == 2:
+        task, status = parts
+        task_id, _, task = task.partition(',')
+        if task_id.isdigit():
+            return unescape(task), status.strip() == 'completed', int(task_id)
+    return None
+
+
+def parse_unnumbered_line(line):
+    # A line of a format 2 tasks.txt.
+    parts = line.rstrip('\r\n').rsplit(',', 1)
+    if len(parts) == 2:
+        task, status = parts
+        return unescape(task), status.strip() == 'completed'
+    return None
+
+
+def parse_unescaped_line(line):
+    # A line of a tasks.txt without a format marker.
+    parts = line.strip().rsplit(',', 1)
+    if len(parts) == 2:
+        task, status = parts
+        return task, status == 'completed'
+    return None
+
+
+PARSERS = {2: parse_unnumbered_line, 3: parse_line}
+
+
+def format_line(task, completed, task_id):
+    return f"{task_id},{escape(task)},{'completed' if completed else 'pending'}\n"
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def drain(generator):
+    while True:
+        try:
+            next(generator)
+        except StopIteration as stop:
+            return stop.value
+
+
+def snapshot_batches(file_name, store, batch_size):
+    # Yields after each batch of lines is parsed into `store`; returns the
+    # crc32 of the whole file.
+    with open(file_name, "rb") as file:
+        first = file.readline()
+        marker = MARKER.fullmatch(first.decode("utf-8", "replace"))
+        if marker is None:
+            parse, raw_lines, digest = parse_unescaped_line, chain([first], file), 0
+        else:
+            parse = PARSERS.get(int(marker[1]))
+            if parse is None:
+                raise ValueError(f"{file_name} is in tasks.txt format {marker[1]}, newer than this version reads")
+            raw_lines, digest = file, zlib.crc32(first)
+            store.next_id = max(store.next_id, int(marker[2] or 1))
+        for lines in batched(raw_lines, batch_size):
+            rows = []
+            for raw in lines:
+                digest = zlib.crc32(raw, digest)
+                row = parse(raw.decode("utf-8"))
+                if row is not None:
+                    rows.append(row)
+            store.extend(rows)
+            yield store
+    return digest
+
+
+def read_snapshot(file_name):
+    store = TaskStore()
+    digest = drain(snapshot_batches(file_name, store, 4096))
+    return store, digest
+
+
+def write_atomic(path, store):
+    # Write next to the target, fsync, then rename over it so a crash leaves
+    # either the old file or the new one, never a truncated mix.
+    temp_name = path + ".tmp"
+    with open(temp_name, "wb") as file:
+        marker = format_marker(store.next_id).encode("utf-8")
+        file.write(marker)
+        digest = zlib.crc32(marker)
+        for rows in (store.pending, store.completed):
+            for task in rows:
+                data = format_line(task.text, task.completed, task.id).encode("utf-8")
+                digest = zlib.crc32(data, digest)
+                file.write(data)
+        file.flush()
+        perf.count("bytes written", file.tell())
+        os.fsync(file.fileno())
+    os.replace(temp_name, path)
+    return digest
+
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+
+def open_storage(file_name):
+    if os.path.splitext(file_name)[1].lower() in SQLITE_EXTENSIONS:
+        from sqlite_storage import SqliteStorage
+        return SqliteStorage(file_name)
+    return JournalStorage(file_name)
+
+
+class Storage:
+    def initialize(self):
+        raise NotImplementedError
+
+    def load(self):
+        store = None
+        for store in self.load_iter():
+            pass
+        return store
+
+    def load_iter(self, batch_size=5000):
+        # Yields the same, progressively filled TaskStore after each batch.
+        raise NotImplementedError
+
+    def append(self, change_set):
+        raise NotImplementedError
+
+    def save(self, store):
+        raise NotImplementedError
+
+    def locked(self):
+        return nullcontext()
+
+    def changed(self):
+        return False
+
+    def read_new(self):
+        return []
+
+    def claim(self, shared):
+        # False if another process uses the file in the other mode.
+        return True
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StaleJournalError(RuntimeError):
+    pass
+
+
+class FileInUseError(RuntimeError):
+    pass
+
+
+class JournalStorage(Storage):
+    """tasks.txt snapshot plus an append-only log of change sets.
+
+    Every journal starts with a header naming the crc32 of the snapshot it
+    applies to and the version (count of all records ever written) of its
+    first record. Writers hold an fcntl lock on tasks.txt.lock, so several
+    processes can share the files: each one remembers the version it has
+    read up to and `read_new` hands it the records the others appended.
+    """
+
+    def __init__(self, file_name, compact_after=1000):
+        self.file_name = file_name
+        self.journal_name = file_name + ".journal"
+        self.lock_name = file_name + ".lock"
+        self.compact_after = compact_after
+        self.journal = None
+        self.digest = 0
+        self.snapshot_rows = 0
+        self.epoch = None
+        self.start = 0
+        self.records = 0
+        self.offset = 0
+        self.stamp = None
+        self.compaction = None
+        self.compacted = None
+        self.mutex = threading.RLock()
+        self.lock_file = None
+        self.lock_depth = 0
+        self.owner_file = None
+
+    @property
+    def version(self):
+        return self.start + self.records
+
+    @contextmanager
+    def locked(self):
+        # Re-entrant within the process (threads are serialized by the
+        # mutex); exclusive between processes through flock.
+        with self.mutex:
+            if self.lock_depth == 0 and fcntl is not None:
+                if self.lock_file is None:
+                    self.lock_file = open(self.lock_name, "a+b")
+                fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+            self.lock_depth += 1
+            try:
+                yield
+            finally:
+                self.lock_depth -= 1
+                if self.lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def claim(self, shared):
+        # An unshared instance never reads what others append, so its
+        # writes would be refused as stale. Each mode holds a shared flock
+        # on its own file while open, tasks.txt.lock.shared or .unshared,
+        # and a claim fails if the other mode's file cannot be locked
+        # exclusively. Instances in the same mode do not exclude each other.
+        if fcntl is None:
+            return True
+        mode, other = ("shared", "unshared") if shared else ("unshared", "shared")
+        self.owner_file = open(f"{self.lock_name}.{mode}", "a+b")
+        fcntl.flock(self.owner_file, fcntl.LOCK_SH)
+        with open(f"{self.lock_name}.{other}", "a+b") as file:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.release()
+                return False
+        return True
+
+    def release(self):
+        if self.owner_file is not None:
+            self.owner_file.close()
+            self.owner_file = None
+
+    def initialize(self):
+        if not os.path.exists(self.file_name):
+            with open(self.file_name, 'w'):
+                pass
+
+    def snapshot_identity(self):
+        info = os.stat(self.file_name)
+        return info.st_ino, info.st_size, info.st_mtime_ns
+
+    def load_iter(self, batch_size=5000):
+        self.close()
+        while True:
+            # The snapshot is read without the lock so a long lazy load does
+            # not block other writers; if it was swapped meanwhile, read again.
+            identity = self.snapshot_identity()
+            store = TaskStore()
+            self.digest = yield from snapshot_batches(self.file_name, store, batch_size)
+            with self.locked():
+                if self.snapshot_identity() != identity:
+                    continue
+                self.snapshot_rows = len(store)
+                self.recover(store)
+                self.journal = open(self.journal_name, "ab")
+            yield store
+            return
+
+    def recover(self, store):
+        pending_swap = self.journal_name + ".new"
+        if os.path.exists(pending_swap):
+            # A compaction was interrupted: its journal is only valid if the
+            # new snapshot made it to disk.
+            if self.read_header(pending_swap) == self.digest:
+                os.replace(pending_swap, self.journal_name)
+            else:
+                os.remove(pending_swap)
+
+        if os.path.exists(self.journal_name) and self.read_header(self.journal_name) != self.digest:
+            # tasks.txt was changed outside the app; it wins over the log.
+            os.replace(self.journal_name, self.journal_name + ".stale")
+
+        if not os.path.exists(self.journal_name):
+            # A new epoch: nobody's records from before can be merged into it.
+            self.epoch = os.urandom(6).hex()
+            self.replace_journal([])
+
+        header = self.read_header_record(self.journal_name) or {}
+        self.epoch = header.get("epoch")
+        self.start = header.get("start", 0)
+        self.records = 0
+        with open(self.journal_name, "rb+") as file:
+            file.readline()
+            good = file.tell()
+            while True:
+                raw = file.readline()
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    store.apply(Change(*json.loads(raw)))
+                except (ValueError, TypeError, IndexError, KeyError):
+                    break
+                self.records += 1
+                good = file.tell()
+            if good < os.fstat(file.fileno()).st_size:
+                # Drop a torn or unreadable tail left by a crash mid-append.
+                file.truncate(good)
+        self.offset = good
+        self.stamp = self.journal_stamp()
+        return self.records
+
+    def read_header(self, path):
+        header = self.read_header_record(path)
+        return header.get("base") if header else None
+
+    def read_header_record(self, path):
+        with open(path, "rb") as file:
+            try:
+                header = json.loads(file.readline())
+            except ValueError:
+                return None
+        return header if isinstance(header, dict) else None
+
+    def write_journal(self, path, digest, lines, start=0, epoch=None):
+        with open(path, "wb") as file:
+            file.write(self.header_line(digest, start, epoch))
+            file.writelines(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def header_line(self, digest, start, epoch):
+        return json.dumps({"base": digest, "start": start, "epoch": epoch}).encode("utf-8") + b"\n"
+
+    def replace_journal(self, lines, start=0):
+        # Written aside and renamed so other processes see a new inode.
+        self.write_journal(self.journal_name + ".new", self.digest, lines, start, self.epoch)
+        os.replace(self.journal_name + ".new", self.journal_name)
+
+    def journal_stamp(self):
+        try:
+            info = os.stat(self.journal_name)
+        except FileNotFoundError:
+            return None
+        return info.st_ino, info.st_size, info.st_mtime_ns
+
+    def changed(self):
+        # Cheap check for the file watcher: has anyone written since we last
+        # read or wrote the journal?
+        return self.journal_stamp() != self.stamp
+
+    def read_new(self):
+        """Records other processes appended since this one last read or wrote.
+
+        Returns None when they cannot be replayed incrementally (tasks.txt
+        was replaced outside the app, or compacted twice since we looked);
+        the caller should load again. Call under `locked`.
+        """
+        header = self.read_header_record(self.journal_name) if os.path.exists(self.journal_name) else None
+        if header is None or header.get("epoch") != self.epoch:
+            return None
+        records = []
+        skip = 0
+        start = header.get("start", 0)
+        if (header.get("base"), start) != (self.digest, self.start):
+            # Someone compacted or saved: their snapshot holds every record
+            # before `start`. Any we had not read yet are in the journal it
+            # replaced.
+            if start > self.version:
+                previous = self.journal_name + ".prev"
+                replaced = self.read_header_record(previous) if os.path.exists(previous) else None
+                if replaced is None or (replaced.get("base"), replaced.get("start", 0)) != (self.digest, self.start):
+                    return None
+                records, _ = self.read_records(previous, self.offset, start - self.version)
+                if len(records) != start - self.version:
+                    return None
+            else:
+                skip = self.version - start
+            self.digest = header["base"]
+            self.start = start
+            self.records = 0
+            self.offset = 0
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = open(self.journal_name, "ab")
+
+        new, self.offset = self.read_records(self.journal_name, self.offset)
+        self.records += len(new)
+        records.extend(new[skip:])
+        self.stamp = self.journal_stamp()
+        return records
+
+    def read_records(self, path, offset=0, limit=None):
+        # Complete records from byte `offset` (0: just after the header).
+        records = []
+        with open(path, "rb") as file:
+            if offset:
+                file.seek(offset)
+            else:
+                file.readline()
+            while limit is None or len(records) < limit:
+                raw = file.readline()
+                if not raw.endswith(b"\n"):
+                    break
+                records.append(Change(*json.loads(raw)))
+                offset = file.tell()
+        return records, offset
+
+    def append(self, change_set):
+        # Records carry task ids, so an insert replays with the id it was
+        # given; journals written before have no ids and replay renumbered.
+        lines = [json.dumps(list(change), ensure_ascii=False).encode("utf-8") + b"\n" for change in change_set]
+        with self.locked():
+            if self.changed():
+                # Our change indices were computed without the other
+                # process's records; writing them would corrupt the list.
+                raise StaleJournalError(f"{self.journal_name} was changed by another process")
+            self.journal.writelines(lines)
+            self.journal.flush()
+            perf.count("bytes written", sum(map(len, lines)))
+            self.records += len(lines)
+            self.offset = os.fstat(self.journal.fileno()).st_size
+            self.stamp = self.journal_stamp()
+            if self.compaction is not None:
+                if not self.compaction.is_alive():
+                    self.finish_compaction()
+            elif self.records > max(self.compact_after, self.snapshot_rows):
+                self.start_compaction()
+
+    def start_compaction(self):
+        self.compacted = None
+        self.compaction = threading.Thread(target=self.compact, args=(self.digest, self.start, self.records), daemon=True)
+        self.compaction.start()
+
+    def compact(self, base, start, record_count):
+        # Only reads, so no lock: the journal handle pins one version of the
+        # log and the snapshot is checked against its header.
+        with open(self.journal_name, "rb") as file:
+            header = json.loads(file.readline())
+            if (header.get("base"), header.get("start", 0)) != (base, start):
+                return
+            store, digest = read_snapshot(self.file_name)
+            if digest != base:
+                return
+            for _ in range(record_count):
+                store.apply(Change(*json.loads(file.readline())))
+        temp_name = f"{self.file_name}.compact.{os.getpid()}"
+        new_digest = write_atomic(temp_name, store)
+        self.compacted = (base, start + record_count, record_count, new_digest, len(store), temp_name)
+
+    def finish_compaction(self):
+        self.compaction.join()
+        self.compaction = None
+        if self.compacted is None:
+            return
+        base, new_start, record_count, digest, rows, temp_name = self.compacted
+        self.compacted = None
+        with self.locked():
+            header = self.read_header_record(self.journal_name) or {}
+            if (header.get("base"), header.get("start", 0)) != (base, new_start - record_count):
+                # Another process compacted or saved first.
+                os.remove(temp_name)
+                return
+            # Records appended, by anyone, after the compacted ones carry over.
+            with open(self.journal_name, "rb") as file:
+                file.readline()
+                for _ in range(record_count):
+                    file.readline()
+                tail = [raw for raw in file if raw.endswith(b"\n")]
+            self.write_journal(self.journal_name + ".new", digest, tail, new_start, self.epoch)
+            self.journal.close()
+            os.replace(temp_name, self.file_name)
+            # Kept for processes that have not read all it held yet.
+            os.replace(self.journal_name, self.journal_name + ".prev")
+            os.replace(self.journal_name + ".new", self.journal_name)
+            self.journal = open(self.journal_name, "ab")
+            seen = self.version - new_start
+            self.digest = digest
+            self.snapshot_rows = rows
+            self.start = new_start
+            self.records = seen
+            self.offset = len(self.header_line(digest, new_start, self.epoch)) + sum(len(raw) for raw in tail[:seen])
+            self.stamp = self.journal_stamp() if seen == len(tail) else None
+
+    def save(self, store):
+        with self.locked():
+            if self.journal is not None and self.changed():
+                raise StaleJournalError(f"{self.journal_name} was changed by another process")
+            self.close()
+            version = self.version
+            self.digest = write_atomic(self.file_name, store)
+            self.snapshot_rows = len(store)
+            self.replace_journal([], version)
+            self.start = version
+            self.records = 0
+            self.journal = open(self.journal_name, "ab")
+            self.offset = os.fstat(self.journal.fileno()).st_size
+            self.stamp = self.journal_stamp()
+
+    def close(self):
+        if self.compaction is not None:
+            self.finish_compaction()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.lock_file is not None and self.lock_depth == 0:
+            self.lock_file.close()
+            self.lock_file = None
@@ -0,0 +1,191 @@
+import argparse
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+PASSED = "passed"
+FAILURE = "failure"
+ERROR = "error"
+SKIPPED = "skipped"
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class StreamingXMLResult(unittest.TestResult):
+    """Writes one <testcase> element per test as soon as it finishes.
+
+    The elements use the same attributes as xmlrunner's reports, inside a
+    single <testsuite> that is closed when the run ends, so a reader can
+    parse them incrementally while the run is still going.
+    """
+
+    def __init__(self, output, suite_name):
+        super().__init__()
+        self.output = output
+        self.started = None
+        self.output.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<testsuite name="{suite_name}">\n'.encode("utf-8"))
+        self.output.flush()
+
+    def startTest(self, test):
+        super().startTest(test)
+        self.started = time.perf_counter()
+
+    def report(self, test, outcome=PASSED, message=None, details=None):
+        case = ET.Element("testcase", classname=f"{type(test).__module__}.{type(test).__qualname__}",
+                          name=test._testMethodName, time=f"{time.perf_counter() - self.started:.3f}")
+        if outcome != PASSED:
+            child = ET.SubElement(case, outcome, message=message or "")
+            child.text = details
+        self.output.write(ET.tostring(case) + b"\n")
+        self.output.flush()
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.report(test)
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.report(test, FAILURE, str(err[1]), self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.report(test, ERROR, str(err[1]), self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.report(test, SKIPPED, reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self.report(test)
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self.report(test, FAILURE, "unexpected success")
+
+    def close(self):
+        self.output.write(b"</testsuite>\n")
+        self.output.flush()
+
+
+def flatten(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from flatten(test)
+        else:
+            yield test
+
+
+def run_shard(module, shard=0, shards=1, output=None):
+    # Runs every `shards`-th test of `module`, starting at `shard`.
+    tests = list(flatten(unittest.defaultTestLoader.loadTestsFromName(module)))[shard::shards]
+    result = StreamingXMLResult(output, module)
+    try:
+        unittest.TestSuite(tests).run(result)
+    finally:
+        result.close()
+    return result
+
+
+class SuiteRun:
+    """A test run in `workers` child processes, read as it happens.
+
+    Each worker runs one shard of `module` and streams <testcase> elements
+    on its stdout. A reader thread per worker feeds them through an
+    XMLPullParser and puts one dict per finished test on `results`; a None
+    marks a worker that has exited. Nothing here touches Tk.
+    """
+
+    def __init__(self, module="test_main", workers=1, cwd=ROOT):
+        self.module = module
+        self.workers = max(1, workers)
+        self.cwd = cwd
+        self.results = queue.Queue()
+        self.processes = []
+        self.threads = []
+        self.cancelled = False
+        self.started = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        for shard in range(self.workers):
+            command = [sys.executable, os.path.join(ROOT, "suite_runner.py"), self.module,
+                       "--shard", str(shard), "--shards", str(self.workers)]
+            process = subprocess.Popen(command, cwd=self.cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self.processes.append(process)
+            thread = threading.Thread(target=self.read, args=(process,), name=f"test-reader-{shard}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def read(self, process):
+        parser = ET.XMLPullParser(events=("end",))
+        # stderr is drained on its own thread so a chatty test cannot fill
+        # the pipe and stall the worker.
+        errors = []
+        drain = threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)
+        drain.start()
+        try:
+            for chunk in iter(lambda: process.stdout.read1(65536), b""):
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if element.tag == "testcase":
+                        self.results.put(self.case_result(element))
+                        element.clear()
+        except ET.ParseError as error:
+            self.results.put({"outcome": ERROR, "name": "<stream>", "classname": self.module, "time": "0",
+                              "message": f"unreadable test output: {error}"})
+        process.wait()
+        drain.join()
+        if process.returncode not in (0, 1) and not self.cancelled:
+            # The worker died before or while running tests (e.g. an import error).
+            message = errors[0].decode("utf-8", "replace").strip().splitlines()[-1:] if errors and errors[0] else []
+            self.results.put({"outcome": ERROR, "name": "<worker>", "classname": self.module, "time": "0",
+                              "message": message[0] if message else f"exit status {process.returncode}"})
+        self.results.put(None)
+
+    def case_result(self, element):
+        result = {"outcome": PASSED, "name": element.get("name"), "classname": element.get("classname"),
+                  "time": element.get("time"), "message": None}
+        for outcome in (FAILURE, ERROR, SKIPPED):
+            child = element.find(outcome)
+            if child is not None:
+                result["outcome"] = outcome
+                result["message"] = child.get("message")
+        return result
+
+    def cancel(self):
+        self.cancelled = True
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a test module, streaming one <testcase> element per finished test.")
+    parser.add_argument("module", nargs="?", default="test_main")
+    parser.add_argument("--shard", type=int, default=0)
+    parser.add_argument("--shards", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    # Results go to the real stdout; anything the tests print goes to stderr
+    # so it cannot corrupt the XML stream.
+    output = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.path.insert(0, os.getcwd())
+    result = run_shard(args.module, args.shard, args.shards, output)
+    output.close()
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
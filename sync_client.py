@@ -0,0 +1,255 @@
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from changes import COMPLETED, INSERT, PENDING, Change
+from sync_server import PORT, encode
+from task_store import TaskStore
+from todo_core import TodoService
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return (host, int(port)) if host else (address, PORT)
+
+
+class SyncConnection:
+    """Client side of the sync_server protocol, on an asyncio loop.
+
+    Ops passed to `send` are queued and go out as one batch whenever the
+    sender gets to run, without waiting for earlier batches to be acked.
+    The one connection is kept open; after it drops it is opened again, the
+    server replays the deltas after `seq` and unacked batches are sent
+    again (the server skips the ones it already applied).
+    `on_snapshot(store, seq)` and `on_delta(change_set, seq, n)` run on the
+    loop; `n` is the batch number when the delta is this client's own.
+    """
+
+    def __init__(self, host, port, on_snapshot, on_delta, client_id=None, retry=0.2):
+        self.host = host
+        self.port = port
+        self.on_snapshot = on_snapshot
+        self.on_delta = on_delta
+        self.client_id = client_id or os.urandom(8).hex()
+        self.retry = retry
+        self.epoch = None
+        self.seq = 0
+        self.next_batch = 1
+        self.ops = []
+        self.unacked = {}
+        self.wake = asyncio.Event()
+        self.writer = None
+        self.closed = False
+        self.connects = 0
+        self.snapshots = 0
+
+    def send(self, op):
+        self.ops.append(op)
+        self.wake.set()
+
+    def pending(self):
+        return len(self.ops) + len(self.unacked)
+
+    def drop(self):
+        # Closes the current connection as if the network had; `run` then
+        # reconnects. Used by tests and the load harness.
+        if self.writer is not None:
+            self.writer.transport.abort()
+
+    def close(self):
+        self.closed = True
+        self.wake.set()
+        self.drop()
+
+    async def run(self):
+        while not self.closed:
+            try:
+                reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                await asyncio.sleep(self.retry)
+                continue
+            self.connects += 1
+            sender = asyncio.create_task(self.send_batches(self.writer))
+            try:
+                await self.receive(reader)
+            except (ConnectionError, ValueError, KeyError):
+                pass
+            finally:
+                sender.cancel()
+                self.writer.close()
+                self.writer = None
+            if not self.closed:
+                await asyncio.sleep(self.retry)
+
+    async def send_batches(self, writer):
+        writer.write(encode({"hello": self.client_id, "epoch": self.epoch, "seq": self.seq}))
+        writer.writelines(encode({"n": n, "ops": ops}) for n, ops in self.unacked.items())
+        self.wake.set()
+        while not self.closed and not writer.is_closing():
+            await self.wake.wait()
+            self.wake.clear()
+            if writer.is_closing():
+                break
+            if self.ops:
+                n = self.next_batch
+                self.next_batch += 1
+                self.unacked[n], self.ops = self.ops, []
+                writer.write(encode({"n": n, "ops": self.unacked[n]}))
+            await writer.drain()
+
+    async def receive(self, reader):
+        while line := await reader.readline():
+            message = json.loads(line)
+            if "seq" in message and "changes" in message:
+                if message["seq"] <= self.seq:
+                    continue
+                self.seq = message["seq"]
+                n = message["n"] if message["origin"] == self.client_id else None
+                self.unacked.pop(n, None)
+                self.on_delta([Change(*change) for change in message["changes"]], self.seq, n)
+                continue
+            for n in [n for n in self.unacked if n <= message["applied"]]:
+                del self.unacked[n]
+            if "snapshot" in message:
+                self.epoch = message["epoch"]
+                self.seq = message["seq"]
+                self.snapshots += 1
+                store = TaskStore()
+                for section in (PENDING, COMPLETED):
+                    for task_id, text in message[section]:
+                        store.append(text, section == COMPLETED, task_id)
+                self.on_snapshot(store, self.seq)
+
+
+class RemoteTodoService(TodoService):
+    """A TodoService whose list lives on a sync_server.
+
+    Mutations are sent to the server and return nothing straight away; the
+    server's deltas are queued by the network thread and applied to `store`
+    when the UI thread calls `sync`, so the store is only touched from there.
+    """
+
+    def __init__(self, address, client_id=None, timeout=10):
+        self.file_name = address
+        self.shared = True
+        self.storage = None
+        self.writer = None
+        self.store = TaskStore()
+        self.reset_index()
+        # No undo: a mutation returns before the server has applied it, so
+        # there is nothing yet to record.
+        self.undo_steps = deque(maxlen=0)
+        self.redo_steps = deque(maxlen=0)
+        self.archive_keep = None
+        self.archive = None
+        self.archiving = None
+        self.timeout = timeout
+        self.updates = queue.Queue()
+        self.ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        host, port = parse_address(address)
+        self.connection = SyncConnection(host, port, self.snapshot_received, self.delta_received, client_id)
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self.connection.run(),),
+                                       name="sync-client", daemon=True)
+        self.thread.start()
+
+    def snapshot_received(self, store, seq):
+        self.updates.put(store)
+        self.ready.set()
+
+    def delta_received(self, change_set, seq, n):
+        self.updates.put(change_set)
+
+    def send(self, op):
+        self.loop.call_soon_threadsafe(self.connection.send, op)
+        return []
+
+    def load(self):
+        if not self.ready.wait(self.timeout):
+            raise ConnectionError(f"no reply from the sync server at {self.file_name}")
+        self.sync()
+        return self.store
+
+    def load_iter(self):
+        # Yields the empty store until the server's snapshot is in, without
+        # blocking, so a window can poll between its events.
+        deadline = time.monotonic() + self.timeout
+        while not self.ready.is_set():
+            if time.monotonic() > deadline:
+                raise ConnectionError(f"no reply from the sync server at {self.file_name}")
+            yield self.store
+        yield self.load()
+
+    def sync(self):
+        change_set = []
+        while True:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                return change_set
+            if isinstance(update, TaskStore):
+                # Callers notice the new store and redraw everything.
+                self.store = update
+                self.reset_index()
+                change_set = []
+            else:
+                for change in update:
+                    self.store.apply(change)
+                self.index_changes(update)
+                change_set.extend(update)
+
+    @contextmanager
+    def synced(self):
+        yield self.sync()
+
+    def has_updates(self):
+        return not self.updates.empty()
+
+    def commit(self, change_set):
+        # Only what an import produces: inserts, which land at the end of
+        # their list on the server.
+        for change in change_set:
+            if change.kind != INSERT:
+                raise ValueError(f"Cannot send a {change.kind} change by position")
+            self.send(["append", change.section, change.text])
+        return []
+
+    def add(self, text):
+        return self.send(["add", text])
+
+    def toggle(self, task_id, completed=None):
+        # Sent as the state wanted, so two clients resolving the same task
+        # do not undo each other.
+        task = self.store.get(task_id)
+        if task is None:
+            return []
+        return self.send(["toggle", task_id, not task.completed if completed is None else completed])
+
+    def remove(self, task_id):
+        return self.send(["remove", task_id])
+
+    def relabel(self, task_id, text):
+        return self.send(["relabel", task_id, text])
+
+    def flush(self, timeout=None):
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while self.connection.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def save(self):
+        return []
+
+    def close(self):
+        # Exit closes the service before mainloop returns and main.py
+        # closes it again after; the second call has nothing to do.
+        if self.loop.is_closed():
+            return
+        self.flush()
+        self.loop.call_soon_threadsafe(self.connection.close)
+        self.thread.join()
+        self.loop.close()
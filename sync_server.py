@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+from itertools import islice
+
+from changes import COMPLETED, PENDING
+from todo_core import TodoService
+
+PORT = 8765
+# A client whose unsent output grows past this is dropped; it reconnects
+# and catches up from the log or a snapshot.
+MAX_BUFFER = 4 << 20
+
+
+def encode(message):
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class SyncServer:
+    """One authoritative task list served to many clients over TCP.
+
+    Messages are JSON lines. A client opens with
+    {"hello": client_id, "epoch": ..., "seq": last_seen} and gets the deltas
+    it missed, or a snapshot if they are no longer in the log (or the server
+    was restarted since). It then sends {"n": batch_number, "ops": [...]}
+    without waiting for replies. Each batch is applied once, in order, and
+    the resulting change set is sent to every client as
+    {"seq", "origin", "n", "changes"}; the sender takes it as its ack.
+    """
+
+    def __init__(self, file_name="tasks.txt", history=10000):
+        self.core = TodoService(file_name, background=True)
+        self.epoch = os.urandom(6).hex()
+        self.seq = 0
+        self.log = deque(maxlen=history)
+        self.applied = {}
+        self.clients = set()
+        self.handlers = {}
+        self.outbox = []
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=PORT):
+        self.core.load()
+        # A burst of clients reconnecting at once overflows the default
+        # backlog of 100, and those connects then stall on SYN retries.
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        for writer in self.handlers.values():
+            writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        self.core.close()
+
+    async def handle(self, reader, writer):
+        self.handlers[asyncio.current_task()] = writer
+        try:
+            hello = json.loads(await reader.readline())
+            client = hello["hello"]
+            self.greet(writer, client, hello.get("epoch"), hello.get("seq", 0))
+            self.clients.add(writer)
+            while line := await reader.readline():
+                batch = json.loads(line)
+                self.apply(client, batch["n"], batch["ops"])
+                await writer.drain()
+        except (ConnectionError, ValueError, KeyError, TypeError, IndexError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            self.handlers.pop(asyncio.current_task())
+            writer.close()
+
+    def greet(self, writer, client, epoch, seen):
+        applied = self.applied.get(client, 0)
+        if epoch == self.epoch and self.seq - len(self.log) <= seen <= self.seq:
+            writer.write(encode({"welcome": client, "epoch": self.epoch, "applied": applied}))
+            writer.writelines(data for _, data in islice(self.log, seen - (self.seq - len(self.log)), None))
+            return
+        store = self.core.store
+        writer.write(encode({"snapshot": client, "epoch": self.epoch, "seq": self.seq, "applied": applied,
+                             PENDING: [[task.id, task.text] for task in store.pending],
+                             COMPLETED: [[task.id, task.text] for task in store.completed]}))
+
+    def apply(self, client, n, ops):
+        if n <= self.applied.get(client, 0):
+            # Sent again after a reconnect, but it got here the first time.
+            return
+        self.applied[client] = n
+        change_set = []
+        try:
+            for op in ops:
+                change_set.extend(self.run(op))
+        finally:
+            # What was applied goes out even if a bad op ends the batch.
+            self.publish(client, n, change_set)
+
+    def run(self, op):
+        # Ops name tasks by the ids in the deltas, which this process keeps
+        # stable until it restarts (and the epoch changes).
+        return self.core.run(op)
+
+    def publish(self, client, n, change_set):
+        self.seq += 1
+        data = encode({"seq": self.seq, "origin": client, "n": n, "changes": [list(change) for change in change_set]})
+        self.log.append((self.seq, data))
+        if not self.outbox:
+            asyncio.get_running_loop().call_soon(self.broadcast)
+        self.outbox.append(data)
+
+    def broadcast(self):
+        # Deltas published in the same loop iteration go to each client in
+        # one write, instead of one send per delta per client.
+        data = b"".join(self.outbox)
+        self.outbox = []
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > MAX_BUFFER:
+                self.clients.discard(writer)
+                writer.close()
+            else:
+                writer.write(data)
+
+
+async def serve(file_name, host, port):
+    server = SyncServer(file_name)
+    port = await server.start(host, port)
+    print(f"Serving {file_name} on {host}:{port}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve one task list to TodoApp clients (python main.py --server HOST:PORT).")
+    parser.add_argument("--tasks", default="tasks.txt", help="task storage to serve (default: tasks.txt)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on; 0.0.0.0 for the LAN")
+    parser.add_argument("--port", type=int, default=PORT, help=f"default: {PORT}; 0 picks a free port")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.tasks, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
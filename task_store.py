@@ -0,0 +1,248 @@
+from changes import COMPLETED, INSERT, MOVE, PENDING, RELABEL, REMOVE
+
+
+class Task:
+    __slots__ = ("id", "text", "completed", "block")
+
+    def __init__(self, task_id, text, completed=False):
+        self.id = task_id
+        self.text = text
+        self.completed = completed
+        self.block = None
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.text!r}, completed={self.completed!r})"
+
+
+class Block:
+    __slots__ = ("items", "number")
+
+    def __init__(self, items, number):
+        self.items = items
+        self.number = number
+
+
+class TaskList:
+    """Ordered tasks stored as short blocks.
+
+    A Fenwick tree over the block sizes maps positions to blocks, so
+    positional access, insertion and removal cost O(log n + block size)
+    instead of shifting the whole list.
+    """
+
+    block_size = 512
+
+    def __init__(self, tasks=()):
+        self.blocks = []
+        self.tree = [0]
+        self.length = 0
+        for task in tasks:
+            self.append(task)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block.items
+
+    def __getitem__(self, index):
+        block, offset = self.locate(index)
+        return block.items[offset]
+
+    def __contains__(self, task):
+        return task.block is not None and task.block.number < len(self.blocks) and self.blocks[task.block.number] is task.block
+
+    def locate(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("task index out of range")
+        position = 0
+        step = 1 << (len(self.blocks).bit_length() - 1)
+        while step:
+            if position + step < len(self.tree) and self.tree[position + step] <= index:
+                position += step
+                index -= self.tree[position]
+            step >>= 1
+        return self.blocks[position], index
+
+    def index(self, task):
+        if task not in self:
+            raise ValueError(f"{task!r} is not in list")
+        return self.prefix(task.block.number) + task.block.items.index(task)
+
+    def prefix(self, number):
+        total = 0
+        while number > 0:
+            total += self.tree[number]
+            number -= number & -number
+        return total
+
+    def add_size(self, number, delta):
+        number += 1
+        while number < len(self.tree):
+            self.tree[number] += delta
+            number += number & -number
+
+    def rebuild(self):
+        self.tree = [0] * (len(self.blocks) + 1)
+        for number, block in enumerate(self.blocks):
+            block.number = number
+            self.tree[number + 1] += len(block.items)
+            parent = (number + 1) + ((number + 1) & -(number + 1))
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[number + 1]
+
+    def insert(self, index, task):
+        if index < 0:
+            index = max(0, index + self.length)
+        if not self.blocks:
+            self.blocks.append(Block([], 0))
+            self.rebuild()
+        if index >= self.length:
+            block, offset = self.blocks[-1], len(self.blocks[-1].items)
+        else:
+            block, offset = self.locate(index)
+        block.items.insert(offset, task)
+        task.block = block
+        self.length += 1
+        if len(block.items) > 2 * self.block_size:
+            self.split(block)
+        else:
+            self.add_size(block.number, 1)
+
+    def append(self, task):
+        self.insert(self.length, task)
+
+    def extend(self, tasks):
+        # Bulk append: fill blocks in place and rebuild the tree once.
+        for task in tasks:
+            if not self.blocks or len(self.blocks[-1].items) >= self.block_size:
+                self.blocks.append(Block([], len(self.blocks)))
+            block = self.blocks[-1]
+            block.items.append(task)
+            task.block = block
+            self.length += 1
+        self.rebuild()
+
+    def split(self, block):
+        tail = Block(block.items[self.block_size:], block.number + 1)
+        del block.items[self.block_size:]
+        for task in tail.items:
+            task.block = tail
+        self.blocks.insert(tail.number, tail)
+        self.rebuild()
+
+    def remove(self, task):
+        if task not in self:
+            raise ValueError(f"{task!r} is not in list")
+        block = task.block
+        block.items.remove(task)
+        task.block = None
+        self.length -= 1
+        if block.items:
+            self.add_size(block.number, -1)
+        else:
+            del self.blocks[block.number]
+            self.rebuild()
+
+    def pop(self, index=-1):
+        task = self[index]
+        self.remove(task)
+        return task
+
+    def clear(self):
+        for task in self:
+            task.block = None
+        self.blocks = []
+        self.tree = [0]
+        self.length = 0
+
+
+class TaskStore:
+    def __init__(self):
+        self.tasks = {}
+        self.pending = TaskList()
+        self.completed = TaskList()
+        self.next_id = 1
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def section(self, name):
+        return self.completed if name == COMPLETED else self.pending
+
+    def position(self, task):
+        name = COMPLETED if task.completed else PENDING
+        return name, self.section(name).index(task)
+
+    def find(self, text):
+        for task in self.pending:
+            if task.text == text:
+                return task
+        for task in self.completed:
+            if task.text == text:
+                return task
+        return None
+
+    def select(self, ids):
+        # The tasks with the given ids as (pending, completed), in list order.
+        # A few matches are sorted by position; many are picked out in one
+        # pass over both lists instead.
+        if len(ids) * 64 < len(self.tasks):
+            tasks = sorted((self.tasks[task_id] for task_id in ids),
+                           key=lambda task: (task.block.number, task.block.items.index(task)))
+            return [task for task in tasks if not task.completed], [task for task in tasks if task.completed]
+        return [task for task in self.pending if task.id in ids], [task for task in self.completed if task.id in ids]
+
+    def create(self, text, completed=False, task_id=None):
+        if task_id is None:
+            task_id = self.next_id
+            self.next_id += 1
+        elif task_id >= self.next_id:
+            self.next_id = task_id + 1
+        task = Task(task_id, text, completed)
+        self.tasks[task.id] = task
+        return task
+
+    def append(self, text, completed=False, task_id=None):
+        task = self.create(text, completed, task_id)
+        self.section(COMPLETED if completed else PENDING).append(task)
+        return task
+
+    def extend(self, rows):
+        # rows are (text, completed) or (text, completed, task_id) tuples.
+        pending, completed = [], []
+        for row in rows:
+            task = self.create(*row)
+            (completed if task.completed else pending).append(task)
+        self.pending.extend(pending)
+        self.completed.extend(completed)
+
+    def apply(self, change):
+        rows = self.section(change.section)
+        if change.kind == INSERT:
+            task = self.create(change.text, change.section == COMPLETED, change.task_id)
+            rows.insert(change.index, task)
+        elif change.kind == REMOVE:
+            task = rows.pop(change.index)
+            del self.tasks[task.id]
+        elif change.kind == MOVE:
+            task = rows.pop(change.index)
+            task.completed = change.target == COMPLETED
+            self.section(change.target).insert(change.target_index, task)
+        elif change.kind == RELABEL:
+            task = rows[change.index]
+            task.text = change.text
+        else:
+            raise ValueError(f"Unknown change kind: {change.kind!r}")
+        return task
+
+    def clear(self):
+        self.tasks.clear()
+        self.pending.clear()
+        self.completed.clear()
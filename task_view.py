@@ -0,0 +1,208 @@
+import tkinter as tk
+from tkinter import ttk
+
+import perf
+from changes import COMPLETED, INSERT, MOVE, RELABEL
+
+
+class TaskRow:
+    def __init__(self, owner, index):
+        self.task = None
+
+        self.frame = tk.Frame(owner, pady=2)
+        self.var = tk.BooleanVar(value=False)
+        self.check = tk.Checkbutton(self.frame, variable=self.var, command=lambda: owner.row_toggled(self))
+        self.check.pack(side='left')
+
+        self.label = tk.Label(self.frame, text="")
+        self.label.pack(side='left', padx=5)
+
+        button_frame = tk.Frame(self.frame)
+        button_frame.pack(side='right')
+
+        self.edit_button = tk.Button(button_frame, textvariable=owner.caption("Edit"), command=lambda: owner.row_edited(self), bg="green", fg="white")
+        self.edit_button.pack(side='right', padx=5)
+
+        self.delete_button = tk.Button(button_frame, textvariable=owner.caption("Delete"), command=lambda: owner.row_deleted(self), bg="red", fg="white")
+        self.delete_button.pack(side='right', padx=5)
+
+        self.separator = ttk.Separator(owner, orient='horizontal')
+
+        self.frame.grid(row=2 * index, column=0, sticky='ew', padx=5, pady=2)
+        self.separator.grid(row=2 * index + 1, column=0, sticky='ew', padx=5, pady=2)
+
+        for widget in (self.frame, self.check, self.label, button_frame, self.edit_button, self.delete_button):
+            owner.bind_scroll(widget)
+        if not owner.enabled:
+            self.set_state(tk.DISABLED)
+        perf.count("task rows built")
+
+    def set_state(self, state):
+        for widget in (self.check, self.edit_button, self.delete_button):
+            widget.config(state=state)
+
+    def show(self, task, completed):
+        if self.task is None:
+            self.frame.grid()
+            self.separator.grid()
+        self.task = task
+        self.label.config(text=task.text)
+        if completed:
+            self.label.config(fg="gray", font=("Helvetica", 10, "italic"))
+        self.var.set(completed)
+
+    def hide(self):
+        if self.task is not None:
+            self.task = None
+            self.label.config(text="")
+            self.frame.grid_remove()
+            self.separator.grid_remove()
+
+
+class VirtualTaskList(tk.Frame):
+    """Windowed list: only `visible_rows` rows exist, they are recycled while scrolling."""
+
+    def __init__(self, parent, source, section, visible_rows=8, caption=None,
+                 on_toggle=None, on_edit=None, on_delete=None, on_view_change=None):
+        super().__init__(parent)
+        self.source = source
+        self.section = section
+        self.completed = section == COMPLETED
+        self.visible_rows = visible_rows
+        self.caption = caption or self.default_caption
+        self.captions = {}
+        self.on_toggle = on_toggle
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.on_view_change = on_view_change
+        self.offset = 0
+        self.rows = []
+        self.enabled = True
+
+        self.columnconfigure(0, weight=1)
+        self.scrollbar = tk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.scrollbar.grid(row=0, column=1, rowspan=2 * visible_rows, sticky='ns')
+        self.bind_scroll(self)
+
+    def default_caption(self, text):
+        if text not in self.captions:
+            self.captions[text] = tk.StringVar(self, value=text)
+        return self.captions[text]
+
+    @property
+    def items(self):
+        return self.source()
+
+    def bind_scroll(self, widget):
+        widget.bind('<MouseWheel>', self.on_mousewheel)
+        widget.bind('<Button-4>', lambda event: self.scroll(-1))
+        widget.bind('<Button-5>', lambda event: self.scroll(1))
+
+    def set_source(self, source):
+        self.source = source
+        self.offset = 0
+        self.render(0)
+
+    def refresh(self):
+        self.render(0)
+
+    @perf.timed("render")
+    def render(self, first_row):
+        items = self.items
+        offset = max(0, min(self.offset, len(items) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            first_row = 0
+        needed = min(len(items), self.visible_rows)
+        while len(self.rows) < needed:
+            self.rows.append(TaskRow(self, len(self.rows)))
+
+        for i in range(max(first_row, 0), len(self.rows)):
+            index = self.offset + i
+            if index < len(items):
+                self.rows[i].show(items[index], self.completed)
+            else:
+                self.rows[i].hide()
+        self.update_scrollbar()
+
+    def apply_changes(self, changes):
+        first_row = None
+        for change in changes:
+            if change.section == self.section:
+                if change.kind == INSERT:
+                    row = self.shift(change.index, 1)
+                elif change.kind == RELABEL:
+                    row = self.visible_row(change.index)
+                else:
+                    row = self.shift(change.index, -1)
+            elif change.kind == MOVE and change.target == self.section:
+                row = self.shift(change.target_index, 1)
+            else:
+                continue
+            if row is not None and (first_row is None or row < first_row):
+                first_row = row
+
+        if first_row is not None:
+            self.render(first_row)
+        else:
+            self.update_scrollbar()
+
+    def visible_row(self, index):
+        row = index - self.offset
+        return row if 0 <= row < self.visible_rows else None
+
+    def shift(self, index, delta):
+        # Rows above the window only move the window; return the first
+        # visible row that needs redrawing, if any.
+        if index < self.offset:
+            self.offset = max(0, self.offset + delta)
+            return None
+        return self.visible_row(index)
+
+    def update_scrollbar(self):
+        total = len(self.items)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible_rows) / total)
+        if self.on_view_change:
+            self.on_view_change()
+
+    def scroll(self, amount):
+        offset = max(0, min(self.offset + amount, len(self.items) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render(0)
+
+    def see(self, index):
+        if index < self.offset:
+            self.scroll(index - self.offset)
+        elif index >= self.offset + self.visible_rows:
+            self.scroll(index - self.offset - self.visible_rows + 1)
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.scroll(int(float(args[1]) * len(self.items)) - self.offset)
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def row_toggled(self, row):
+        if row.task is not None and self.enabled and self.on_toggle:
+            self.on_toggle(row.task.id)
+
+    def row_edited(self, row):
+        if row.task is not None and self.enabled and self.on_edit:
+            self.on_edit(row.task.id)
+
+    def row_deleted(self, row):
+        if row.task is not None and self.enabled and self.on_delete:
+            self.on_delete(row.task.id)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        for row in self.rows:
+            row.set_state(tk.NORMAL if enabled else tk.DISABLED)
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from archive import Archive
+from task_store import Task
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
+        self.archive = Archive(self.file_name)
+
+    def tearDown(self):
+        self.archive.close()
+        self.directory.cleanup()
+
+    def add(self, archive, *texts):
+        return archive.add(Task(i, text, True) for i, text in enumerate(texts))
+
+    def test_segments_read_as_one_list(self):
+        # Test that rows of several segments index in order, oldest segment first
+        self.assertEqual(len(self.archive), 0)
+        self.add(self.archive, "Old 1", "Old 2")
+        rows = self.add(self.archive, "Newer 1", "Newer 2", "Newer 3")
+        self.assertEqual(sorted(os.listdir(self.archive.directory)), ["000001.tsnap", "000002.tsnap"])
+        self.assertEqual(len(rows), 5)
+        self.assertEqual([rows[i].text for i in (0, 1, 2, -1)], ["Old 1", "Old 2", "Newer 1", "Newer 3"])
+        self.assertEqual([task.id for task in rows], [-1, -2, -3, -4, -5])
+        self.assertTrue(all(task.completed for task in rows))
+        with self.assertRaises(IndexError):
+            rows[5]
+
+    def test_other_instances_pick_up_new_segments(self):
+        # Test that refresh sees a segment another process wrote
+        other = Archive(self.file_name)
+        self.addCleanup(other.close)
+        self.add(other, "Archived elsewhere")
+        self.assertEqual(len(self.archive), 0)
+        self.assertEqual([task.text for task in self.archive.refresh()], ["Archived elsewhere"])
+
+    def test_search_matches_word_prefixes(self):
+        # Test that searching the archive follows the search box's rule
+        self.add(self.archive, "Buy milk", "Call mom", "Buy bread")
+        self.add(self.archive, "Milkshake")
+        self.assertEqual([task.text for task in self.archive.search("mil")], ["Buy milk", "Milkshake"])
+        self.assertEqual([task.text for task in self.archive.search("buy br")], ["Buy bread"])
+
+
+if __name__ == "__main__":
+    unittest.main()
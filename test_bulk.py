@@ -0,0 +1,103 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import bulk
+from storage import JournalStorage
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.directory.name, "tasks.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name, content=None):
+        path = os.path.join(self.directory.name, name)
+        if content is not None:
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write(content)
+        return path
+
+    def saved_tasks(self):
+        storage = JournalStorage(self.tasks_file)
+        try:
+            store = storage.load()
+        finally:
+            storage.close()
+        return [task.text for task in store.pending], [task.text for task in store.completed]
+
+    def rows(self, path):
+        errors = []
+        return list(bulk.validate(bulk.read_records(path), errors)), errors
+
+    def test_reads_every_format(self):
+        # Test that CSV, JSON and NDJSON files yield the same rows
+        expected = [("Buy milk, eggs", False), ("Line one\nline two", True)]
+        csv_path = self.path("tasks.csv", 'text,status\n"Buy milk, eggs",pending\n"Line one\nline two",completed\n')
+        json_path = self.path("tasks.json", '[{"text": "Buy milk, eggs"},\n {"text": "Line one\\nline two", "completed": true}]')
+        ndjson_path = self.path("tasks.ndjson", '{"text": "Buy milk, eggs", "status": "pending"}\n\n'
+                                                '{"text": "Line one\\nline two", "status": "completed"}\n')
+        for path in (csv_path, json_path, ndjson_path):
+            self.assertEqual(self.rows(path), (expected, []), path)
+
+    def test_json_array_is_decoded_in_chunks(self):
+        # Test that a JSON array is decoded element by element across read boundaries
+        records = [{"text": f"Task {i} " + "x" * i} for i in range(50)]
+        content = io.StringIO(bulk.json.dumps(records))
+        self.assertEqual(list(bulk.json_array_records(content, chunk_size=7)), records)
+
+    def test_invalid_records_are_skipped(self):
+        # Test that bad records are reported with their number and do not stop the import
+        path = self.path("tasks.ndjson", '{"text": "Good"}\n{"text": ""}\n["text"]\n{"text": "Bad", "status": "done"}\n')
+        rows, errors = self.rows(path)
+        self.assertEqual(rows, [("Good", False)])
+        self.assertEqual([error.split(":")[0] for error in errors], ["record 2", "record 3", "record 4"])
+
+    def test_malformed_file_raises(self):
+        # Test that files that cannot be parsed raise RecordError
+        for name, content in (("a.json", '{"text": "Task"}'), ("b.json", '[{"text": "Task"}'), ("c.csv", "name\nTask\n")):
+            with self.assertRaises(bulk.RecordError):
+                self.rows(self.path(name, content))
+        with self.assertRaises(ValueError):
+            self.rows(self.path("tasks.xml", ""))
+
+    def test_insert_batches_append_in_order(self):
+        # Test that each batch becomes one change set appending to the end of each list
+        storage = JournalStorage(self.tasks_file)
+        storage.initialize()
+        store = storage.load()
+        storage.close()
+        store.append("Existing")
+        rows = [(f"Task {i}", i % 3 == 0) for i in range(10)]
+        change_sets = []
+        for change_set in bulk.insert_batches(store, rows, batch_size=4):
+            change_sets.append(change_set)
+            for change in change_set:
+                store.apply(change)
+        self.assertEqual([len(change_set) for change_set in change_sets], [4, 4, 2])
+        self.assertEqual([task.text for task in store.pending], ["Existing"] + [f"Task {i}" for i in range(10) if i % 3])
+        self.assertEqual([task.text for task in store.completed], [f"Task {i}" for i in range(10) if i % 3 == 0])
+
+    def test_cli_import_then_export(self):
+        # Test that the command line imports into tasks.txt and exports it back out
+        source = self.path("in.csv", 'text,status\n"Buy milk, eggs",pending\nCall mom,completed\n,pending\n')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(bulk.main(["import", source, "--tasks", self.tasks_file, "--batch-size", "1"]), 0)
+        self.assertIn("Imported 2 tasks", stdout.getvalue())
+        self.assertIn("record 3", stderr.getvalue())
+        self.assertEqual(self.saved_tasks(), (["Buy milk, eggs"], ["Call mom"]))
+
+        for name in ("out.csv", "out.json", "out.ndjson"):
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(bulk.main(["export", self.path(name), "--tasks", self.tasks_file]), 0)
+            self.assertEqual(self.rows(self.path(name)), ([("Buy milk, eggs", False), ("Call mom", True)], []), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
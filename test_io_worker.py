@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+import changes
+from changes import PENDING
+from io_worker import StorageWriter
+
+
+class RecordingStorage:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+        self.saved = None
+        self.closed = False
+        self.threads = set()
+
+    def append(self, change_set):
+        self.threads.add(threading.current_thread().name)
+        if self.fail:
+            raise OSError("disk full")
+        self.calls.append(list(change_set))
+
+    def save(self, store):
+        self.saved = store
+
+    def close(self):
+        self.closed = True
+
+
+class TestStorageWriter(unittest.TestCase):
+    def test_burst_is_coalesced_into_one_write(self):
+        # Test that change sets queued together reach the storage in one call
+        storage = RecordingStorage()
+        writer = StorageWriter(storage, delay=0.5)
+        for i in range(5):
+            writer.append([changes.insert(PENDING, 0, f"Task {i}")])
+        writer.flush()
+        self.assertEqual(len(storage.calls), 1)
+        self.assertEqual([change.text for change in storage.calls[0]], [f"Task {i}" for i in range(5)])
+        self.assertEqual(storage.threads, {"storage-writer"})
+        writer.close()
+
+    def test_flush_waits_for_queued_writes(self):
+        # Test that flush returns only once earlier change sets are written
+        storage = RecordingStorage()
+        writer = StorageWriter(storage, delay=10)
+        writer.append([changes.insert(PENDING, 0, "Task")])
+        writer.flush()
+        self.assertEqual(len(storage.calls), 1)
+        writer.close()
+
+    def test_close_drains_queue(self):
+        # Test that closing writes everything still queued, then closes storage
+        storage = RecordingStorage()
+        writer = StorageWriter(storage, delay=10)
+        writer.append([changes.insert(PENDING, 0, "Task")])
+        writer.close()
+        self.assertEqual(len(storage.calls), 1)
+        self.assertTrue(storage.closed)
+        self.assertFalse(writer.thread.is_alive())
+
+    def test_errors_are_queued_for_the_ui(self):
+        # Test that a failing write is reported instead of killing the thread
+        storage = RecordingStorage(fail=True)
+        writer = StorageWriter(storage, delay=0)
+        writer.append([changes.insert(PENDING, 0, "Task")])
+        writer.flush()
+        self.assertIsInstance(writer.errors.get_nowait(), OSError)
+        self.assertTrue(writer.thread.is_alive())
+        writer.close()
+
+    def test_save_runs_after_queued_writes(self):
+        # Test that a full save waits for queued change sets first
+        storage = RecordingStorage()
+        writer = StorageWriter(storage, delay=10)
+        writer.append([changes.insert(PENDING, 0, "Task")])
+        writer.save("store")
+        self.assertEqual(len(storage.calls), 1)
+        self.assertEqual(storage.saved, "store")
+        writer.close()
+
+    def test_call_runs_after_queued_writes(self):
+        # Test that a handed-off job runs on the writer thread after earlier change sets
+        storage = RecordingStorage()
+        writer = StorageWriter(storage, delay=10)
+        writer.append([changes.insert(PENDING, 0, "Task")])
+        job = writer.call(lambda: (len(storage.calls), threading.current_thread().name))
+        self.assertEqual(job.result(timeout=5), (1, "storage-writer"))
+        storage.fail = True
+        failed = writer.call(storage.append, None)
+        self.assertIsInstance(failed.exception(timeout=5), OSError)
+        self.assertIsInstance(writer.errors.get_nowait(), OSError)
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
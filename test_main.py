@@ -1,153 +1,179 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 import tkinter as tk
 from main import TodoApp
+from storage import JournalStorage, format_marker
+from sync_server import SyncServer
+from todo_core import TodoService
 from xmlrunner import XMLTestRunner
 
 
 class TestTodoApp(unittest.TestCase):
     def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
         self.root = tk.Tk()
-        self.app = TodoApp(self.root)
-        self.app.task_list = []  # Ensure task list is empty
-        self.app.completed_tasks = []  # Ensure completed tasks list is empty
+        self.app = TodoApp(self.root, file_name=self.file_name)
+        self.app.store.clear()  # Ensure both task lists are empty
 
     def tearDown(self):
         self.root.destroy()
+        self.app.close()
+        self.directory.cleanup()
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_add_task(self, mock_open):
+    def write_tasks(self, content):
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def saved_tasks(self):
+        self.app.writer.flush()
+        storage = JournalStorage(self.file_name)
+        store = storage.load()
+        storage.close()
+        return self.texts(store.pending), self.texts(store.completed)
+
+    def texts(self, tasks):
+        return [task.text for task in tasks]
+
+    def task_id(self, text):
+        task = self.app.store.find(text)
+        return task.id if task is not None else None
+
+    def test_add_task(self):
         # Test adding a new task
         self.app.task_entry.insert(0, "Test Task")
         self.app.add_task()
-        self.assertIn("Test Task", self.app.task_list)
+        self.assertIn("Test Task", self.texts(self.app.task_list))
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_delete_task(self, mock_open):
+    def test_delete_task(self):
         # Test deleting an existing task
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
-        self.app.delete_task("Test Task")
-        self.assertNotIn("Test Task", self.app.task_list)
+        self.app.delete_task(self.task_id("Test Task"))
+        self.assertNotIn("Test Task", self.texts(self.app.task_list))
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_edit_task(self, mock_open):
+    def test_edit_task(self):
         # Test editing an existing task
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
 
         with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
-            self.app.edit_task("Test Task")
+            self.app.edit_task(self.task_id("Test Task"))
 
-        self.assertIn("Edited Task", self.app.task_list)
-        self.assertNotIn("Test Task", self.app.task_list)
+        self.assertIn("Edited Task", self.texts(self.app.task_list))
+        self.assertNotIn("Test Task", self.texts(self.app.task_list))
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_toggle_task_completion(self, mock_open):
+    def test_toggle_task_completion(self):
         # Test toggling the completion status of a task
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
-        self.app.toggle_task_completion("Test Task")
-        self.assertIn("Test Task", self.app.completed_tasks)
-        self.assertNotIn("Test Task", self.app.task_list)
-        self.app.toggle_task_completion("Test Task")
-        self.assertIn("Test Task", self.app.task_list)
-        self.assertNotIn("Test Task", self.app.completed_tasks)
-
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_mark_task_completed(self, mock_open):
+        self.app.toggle_task_completion(self.task_id("Test Task"))
+        self.assertIn("Test Task", self.texts(self.app.completed_tasks))
+        self.assertNotIn("Test Task", self.texts(self.app.task_list))
+        self.app.toggle_task_completion(self.task_id("Test Task"))
+        self.assertIn("Test Task", self.texts(self.app.task_list))
+        self.assertNotIn("Test Task", self.texts(self.app.completed_tasks))
+
+    def test_mark_task_completed(self):
         # Test marking a task as completed
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
-        self.app.toggle_task_completion("Test Task")
-        self.assertIn("Test Task", self.app.completed_tasks)
-        self.assertNotIn("Test Task", self.app.task_list)
+        self.app.toggle_task_completion(self.task_id("Test Task"))
+        self.assertIn("Test Task", self.texts(self.app.completed_tasks))
+        self.assertNotIn("Test Task", self.texts(self.app.task_list))
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,completed\n")
-    def test_unmark_task_completed(self, mock_open):
+    def test_unmark_task_completed(self):
         # Test unmarking a task as completed
+        self.write_tasks("Test Task,completed\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
-        self.app.toggle_task_completion("Test Task")
-        self.assertIn("Test Task", self.app.task_list)
-        self.assertNotIn("Test Task", self.app.completed_tasks)
+        self.app.toggle_task_completion(self.task_id("Test Task"))
+        self.assertIn("Test Task", self.texts(self.app.task_list))
+        self.assertNotIn("Test Task", self.texts(self.app.completed_tasks))
 
     @patch('main.messagebox.showwarning')
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_add_empty_task(self, mock_open, mock_messagebox):
+    def test_add_empty_task(self, mock_messagebox):
         # Test adding an empty task
         self.app.task_entry.insert(0, "")
         self.app.add_task()
         mock_messagebox.assert_called_with("Warning", "You must enter a task.")
         self.assertEqual(len(self.app.task_list), 0)
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_delete_nonexistent_task(self, mock_open):
+    def test_delete_nonexistent_task(self):
         # Test deleting a nonexistent task
-        self.app.delete_task("Nonexistent Task")
+        self.app.delete_task(self.task_id("Nonexistent Task"))
         self.assertEqual(len(self.app.task_list), 0)
         self.assertEqual(len(self.app.completed_tasks), 0)
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_initial_state(self, mock_open):
+    def test_initial_state(self):
         # Test initial state of task lists
         self.assertEqual(len(self.app.task_list), 0)
         self.assertEqual(len(self.app.completed_tasks), 0)
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_persistence_of_tasks(self, mock_open):
+    def test_persistence_of_tasks(self):
         # Test loading tasks from file
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
-        self.assertIn("Test Task", self.app.task_list)
+        self.assertIn("Test Task", self.texts(self.app.task_list))
         self.assertEqual(len(self.app.task_list), 1)
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_task_counters(self, mock_open):
+    def test_task_counters(self):
         # Test updating task counters
         self.app.task_entry.insert(0, "Task 1")
         self.app.add_task()
         self.app.task_entry.insert(0, "Task 2")
         self.app.add_task()
-        self.app.toggle_task_completion("Task 1")
+        self.app.toggle_task_completion(self.task_id("Task 1"))
         pending_text = self.app.pending_title.cget("text")
         resolved_text = self.app.completed_title.cget("text")
         self.assertIn("Pending Tasks (1)", pending_text)
         self.assertIn("Resolved Tasks (1)", resolved_text)
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_edit_nonexistent_task(self, mock_open):
+    def test_edit_nonexistent_task(self):
         # Test editing a nonexistent task
         with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
-            self.app.edit_task("Nonexistent Task")
+            self.app.edit_task(self.task_id("Nonexistent Task"))
         self.assertEqual(len(self.app.task_list), 0)
         self.assertEqual(len(self.app.completed_tasks), 0)
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_edit_task_text(self, mock_open):
+    def test_edit_task_text(self):
         # Test editing the text of a task
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
 
         with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
-            self.app.edit_task("Test Task")
+            self.app.edit_task(self.task_id("Test Task"))
 
-        self.assertIn("Edited Task", self.app.task_list)
-        self.assertNotIn("Test Task", self.app.task_list)
+        self.assertIn("Edited Task", self.texts(self.app.task_list))
+        self.assertNotIn("Test Task", self.texts(self.app.task_list))
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_edit_task_status_unchanged(self, mock_open):
+    def test_edit_task_status_unchanged(self):
         # Test that editing a task does not change its completion status
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
 
         with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
-            self.app.edit_task("Test Task")
+            self.app.edit_task(self.task_id("Test Task"))
 
-        self.assertIn("Edited Task", self.app.task_list)
+        self.assertIn("Edited Task", self.texts(self.app.task_list))
         self.assertEqual(len(self.app.completed_tasks), 0)
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_interface_update_on_add(self, mock_open):
+    def test_interface_update_on_add(self):
         # Test that the interface updates correctly when a task is added
         self.app.task_entry.insert(0, "Test Task")
         self.app.add_task()
@@ -155,41 +181,47 @@ class TestTodoApp(unittest.TestCase):
         task_labels = [frame.winfo_children()[1].cget("text") for frame in task_frames if isinstance(frame, tk.Frame)]
         self.assertIn("Test Task", task_labels)
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_interface_update_on_delete(self, mock_open):
+    def test_interface_update_on_delete(self):
         # Test that the interface updates correctly when a task is deleted
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
-        self.app.delete_task("Test Task")
+        self.app.delete_task(self.task_id("Test Task"))
         task_frames = self.app.tasks_frame.winfo_children()
         task_labels = [frame.winfo_children()[1].cget("text") for frame in task_frames if isinstance(frame, tk.Frame)]
         self.assertNotIn("Test Task", task_labels)
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_save_tasks_on_add(self, mock_open):
+    def test_save_tasks_on_add(self):
         # Test that tasks are correctly saved when a task is added
         self.app.task_entry.insert(0, "Test Task")
         self.app.add_task()
-        mock_open.assert_called_with(self.app.file_name, 'w')
-        handle = mock_open()
-        handle.write.assert_any_call("Test Task,pending\n")
+        pending, completed = self.saved_tasks()
+        self.assertEqual(pending, ["Test Task"])
+        self.assertEqual(completed, [])
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_save_tasks_on_delete(self, mock_open):
+    def test_save_tasks_on_delete(self):
         # Test that tasks are correctly saved when a task is deleted
-        self.app.task_list.append("Test Task")
+        self.app.store.append("Test Task")
         self.app.save_tasks()
-        mock_open.assert_called_with(self.app.file_name, 'w')
-        handle = mock_open()
-        handle.write.assert_any_call("Test Task,pending\n")
-        self.app.delete_task("Test Task")
+        with open(self.file_name, encoding="utf-8") as file:
+            self.assertEqual(file.read(), format_marker(2) + "1,Test Task,pending\n")
+        self.app.delete_task(self.task_id("Test Task"))
         self.app.save_tasks()
-        # Check if the specific write call with "Test Task,pending\n" is not in the mock calls
-        write_calls = handle().write.call_args_list
-        self.assertNotIn(("Test Task,pending\n",), [call[0] for call in write_calls])
+        with open(self.file_name, encoding="utf-8") as file:
+            self.assertNotIn("Test Task,pending\n", file.read())
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_switch_language_to_french(self, mock_open):
+    def test_mutations_append_to_journal(self):
+        # Test that each mutation appends a record instead of rewriting tasks.txt
+        self.write_tasks("Test Task,pending\n")
+        self.app.load_tasks()
+        self.app.toggle_task_completion(self.task_id("Test Task"))
+        with open(self.file_name, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "Test Task,pending\n")
+        pending, completed = self.saved_tasks()
+        self.assertEqual(pending, [])
+        self.assertEqual(completed, ["Test Task"])
+
+    def test_switch_language_to_french(self):
         # Test switching the application language to French
         self.app.set_language("fr")
         self.assertEqual(self.app.current_language, "fr")
@@ -197,8 +229,7 @@ class TestTodoApp(unittest.TestCase):
         self.assertIn("Tâches en attente", self.app.pending_title.cget("text"))
         self.assertIn("Tâches résolues", self.app.completed_title.cget("text"))
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_switch_language_to_spanish(self, mock_open):
+    def test_switch_language_to_spanish(self):
         # Test switching the application language to Spanish
         self.app.set_language("es")
         self.assertEqual(self.app.current_language, "es")
@@ -206,8 +237,7 @@ class TestTodoApp(unittest.TestCase):
         self.assertIn("Tareas pendientes", self.app.pending_title.cget("text"))
         self.assertIn("Tareas resueltas", self.app.completed_title.cget("text"))
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_switch_language_to_italian(self, mock_open):
+    def test_switch_language_to_italian(self):
         # Test switching the application language to Italian
         self.app.set_language("it")
         self.assertEqual(self.app.current_language, "it")
@@ -215,8 +245,7 @@ class TestTodoApp(unittest.TestCase):
         self.assertIn("Compiti in sospeso", self.app.pending_title.cget("text"))
         self.assertIn("Compiti risolti", self.app.completed_title.cget("text"))
 
-    @patch('main.open', new_callable=mock_open, read_data="")
-    def test_switch_language_to_german(self, mock_open):
+    def test_switch_language_to_german(self):
         # Test switching the application language to German
         self.app.set_language("de")
         self.assertEqual(self.app.current_language, "de")
@@ -224,32 +253,304 @@ class TestTodoApp(unittest.TestCase):
         self.assertIn("Ausstehende Aufgaben", self.app.pending_title.cget("text"))
         self.assertIn("Erledigte Aufgaben", self.app.completed_title.cget("text"))
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,pending\n")
-    def test_task_remains_in_pending_when_editing(self, mock_open):
+    def test_switch_language_relabels_rows_in_place(self):
+        # Test that switching language updates row buttons without rebuilding rows
+        self.write_tasks("Task 1,pending\nTask 2,completed\n")
+        self.app.load_tasks()
+        self.app.load_tasks_in_frame()
+        rows = list(self.app.tasks_frame.rows) + list(self.app.completed_frame.rows)
+
+        self.app.set_language("fr")
+
+        self.assertEqual(rows, list(self.app.tasks_frame.rows) + list(self.app.completed_frame.rows))
+        for row in rows:
+            self.assertEqual(row.edit_button.cget("text"), "Modifier")
+            self.assertEqual(row.delete_button.cget("text"), "Supprimer")
+        self.assertEqual(rows[0].label.cget("text"), "Task 1")
+
+    def test_task_remains_in_pending_when_editing(self):
         # Test that a task remains in the pending list when edited
+        self.write_tasks("Test Task,pending\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
 
         with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
-            self.app.edit_task("Test Task")
+            self.app.edit_task(self.task_id("Test Task"))
 
-        self.assertIn("Edited Task", self.app.task_list)
-        self.assertNotIn("Test Task", self.app.task_list)
+        self.assertIn("Edited Task", self.texts(self.app.task_list))
+        self.assertNotIn("Test Task", self.texts(self.app.task_list))
         self.assertEqual(len(self.app.completed_tasks), 0)
 
-    @patch('main.open', new_callable=mock_open, read_data="Test Task,completed\n")
-    def test_task_remains_in_completed_when_editing(self, mock_open):
+    def test_task_remains_in_completed_when_editing(self):
         # Test that a task remains in the completed list when edited
+        self.write_tasks("Test Task,completed\n")
         self.app.load_tasks()
         self.app.load_tasks_in_frame()
 
         with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
-            self.app.edit_task("Test Task")
+            self.app.edit_task(self.task_id("Test Task"))
 
-        self.assertIn("Edited Task", self.app.completed_tasks)
-        self.assertNotIn("Test Task", self.app.completed_tasks)
+        self.assertIn("Edited Task", self.texts(self.app.completed_tasks))
+        self.assertNotIn("Test Task", self.texts(self.app.completed_tasks))
         self.assertEqual(len(self.app.task_list), 0)
 
+    def test_undo_and_redo_keys(self):
+        # Test that Ctrl+Z brings a deleted task back to its row and Ctrl+Y deletes it again
+        self.write_tasks("Task 1,pending\nTask 2,pending\n")
+        self.app.load_tasks()
+        self.app.load_tasks_in_frame()
+        self.app.delete_task(self.task_id("Task 1"))
+        self.root.event_generate("<Control-z>")
+        self.assertEqual(self.texts(self.app.task_list), ["Task 1", "Task 2"])
+        self.assertEqual(self.app.tasks_frame.rows[0].label.cget("text"), "Task 1")
+        self.assertEqual(self.app.pending_title.cget("text"), "Pending Tasks (2)")
+        self.root.event_generate("<Control-y>")
+        self.assertEqual(self.saved_tasks(), (["Task 2"], []))
+
+    def test_edit_task_updates_row_in_place(self):
+        # Test that editing a task relabels the existing row instead of rebuilding the list
+        self.write_tasks("Task 1,pending\nTask 2,pending\n")
+        self.app.load_tasks()
+        self.app.load_tasks_in_frame()
+        rows = list(self.app.tasks_frame.rows)
+
+        with patch('tkinter.simpledialog.askstring', return_value="Edited Task"):
+            self.app.edit_task(self.task_id("Task 2"))
+
+        self.assertEqual(rows, self.app.tasks_frame.rows)
+        self.assertEqual(rows[1].label.cget("text"), "Edited Task")
+        self.assertEqual(rows[0].label.cget("text"), "Task 1")
+
+    def test_search_filters_both_lists(self):
+        # Test that typing in the search box filters the views and tracks later edits
+        self.write_tasks("Buy milk,pending\nCall mom,pending\nBuy bread,completed\n")
+        self.app.load_tasks()
+        self.app.search_var.set("bu")
+        self.assertEqual(self.app.tasks_frame.rows[0].label.cget("text"), "Buy milk")
+        self.assertEqual(len(self.app.tasks_frame.items), 1)
+        self.assertEqual(len(self.app.completed_frame.items), 1)
+
+        self.app.task_entry.insert(0, "Buy eggs")
+        self.app.add_task()
+        self.assertEqual([task.text for task in self.app.tasks_frame.items], ["Buy eggs", "Buy milk"])
+
+        self.app.delete_task(self.task_id("Buy milk"))
+        with patch('tkinter.simpledialog.askstring', return_value="Call dad"):
+            self.app.edit_task(self.task_id("Buy eggs"))
+        self.assertEqual(len(self.app.tasks_frame.items), 0)
+
+        self.app.search_var.set("")
+        self.assertEqual(self.texts(self.app.task_list), ["Call dad", "Call mom"])
+        self.assertEqual(len(self.app.tasks_frame.items), 2)
+
+    def test_import_commits_one_change_set_per_batch(self):
+        # Test that a bulk import writes and refreshes once per batch, not per task
+        path = os.path.join(self.directory.name, "import.ndjson")
+        with open(path, "w", encoding="utf-8") as file:
+            for i in range(12000):
+                file.write(f'{{"text": "Task {i}", "completed": {"true" if i % 4 == 0 else "false"}}}\n')
+        with patch.object(self.app.writer, 'append', wraps=self.app.writer.append) as append, \
+                patch.object(self.app.tasks_frame, 'render', wraps=self.app.tasks_frame.render) as render:
+            self.app.import_tasks(path)
+            while self.app.importing is not None:
+                self.root.update()
+        self.assertEqual(append.call_count, 3)
+        self.assertLessEqual(render.call_count, 3)
+        self.assertEqual(len(self.app.task_list), 9000)
+        self.assertEqual(len(self.app.completed_tasks), 3000)
+        pending, completed = self.saved_tasks()
+        self.assertEqual(pending[:2], ["Task 1", "Task 2"])
+        self.assertEqual(completed[:2], ["Task 0", "Task 4"])
+
+    def test_list_view_only_builds_visible_rows(self):
+        # Test that a long list only creates widgets for the rows in view
+        for i in range(100):
+            self.app.store.append(f"Task {i}")
+        self.app.load_tasks_in_frame()
+        self.assertEqual(len(self.app.tasks_frame.rows), self.app.tasks_frame.visible_rows)
+        self.app.tasks_frame.scroll(50)
+        self.assertEqual(self.app.tasks_frame.rows[0].label.cget("text"), "Task 50")
+        self.app.delete_task(self.task_id("Task 10"))
+        self.assertEqual(self.app.tasks_frame.offset, 49)
+        self.assertEqual(self.app.tasks_frame.rows[0].label.cget("text"), "Task 50")
+
+    def test_toggle_task_with_duplicate_text(self):
+        # Test that tasks sharing the same text are told apart by their id
+        self.write_tasks("Same Task,pending\nSame Task,pending\n")
+        self.app.load_tasks()
+        self.app.load_tasks_in_frame()
+        second = self.app.task_list[1]
+        self.app.toggle_task_completion(second.id)
+        self.assertEqual(list(self.app.completed_tasks), [second])
+        self.assertEqual(len(self.app.task_list), 1)
+        self.assertIsNot(self.app.task_list[0], second)
+
+    def test_lazy_startup_streams_tasks(self):
+        # Test that a lazy start shows the window first and fills the lists in batches
+        self.write_tasks("".join(f"Task {i},pending\n" for i in range(12000)))
+        app = TodoApp(self.root, file_name=self.file_name, lazy=True)
+        self.addCleanup(app.close)
+        self.assertEqual(len(app.task_list), 0)
+        self.assertEqual(app.add_task_button.cget("state"), tk.DISABLED)
+        while app.loading is not None:
+            self.root.update()
+        self.assertEqual(len(app.task_list), 12000)
+        self.assertEqual(app.tasks_frame.rows[0].label.cget("text"), "Task 0")
+        self.assertEqual(app.add_task_button.cget("state"), tk.NORMAL)
+
+    def test_exit_drains_pending_writes(self):
+        # Test that leaving through the Exit menu item writes queued changes first
+        self.app.task_entry.insert(0, "Test Task")
+        self.app.add_task()
+        self.app.exit_app()
+        self.assertFalse(self.app.writer.thread.is_alive())
+        self.assertEqual(self.saved_tasks(), (["Test Task"], []))
+
+    @patch('main.messagebox.showerror')
+    def test_write_errors_are_reported(self, mock_showerror):
+        # Test that a failed background write is shown from the Tk thread
+        self.app.writer.errors.put(OSError("disk full"))
+        self.app.check_storage_errors()
+        mock_showerror.assert_called_with("Error", "Could not save tasks: disk full")
+
+    def test_startup_does_not_import_test_tooling(self):
+        # Test that importing the app leaves unittest, xmlrunner and ElementTree for the Run Tests action
+        code = "import sys, main; print(' '.join(sorted(sys.modules)))"
+        root = os.path.dirname(os.path.abspath(__file__))
+        modules = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout.split()
+        for name in modules:
+            self.assertFalse(name.startswith(("xmlrunner", "xml.etree", "unittest")), name)
+
+    def test_archived_tasks_are_paged_and_searchable(self):
+        # Test that old resolved tasks are archived at startup and shown a page at a time
+        self.write_tasks("".join(f"Done {i},completed\n" for i in range(20)) + "Open,pending\n")
+        root = tk.Tk()
+        self.addCleanup(root.destroy)
+        app = TodoApp(root, file_name=self.file_name, archive_keep=5)
+        self.addCleanup(app.close)
+        self.assertEqual(len(app.completed_tasks), 20)
+        # The segment is written on the storage thread; the next check removes the tasks.
+        app.core.flush()
+        app.check_storage_errors()
+        self.assertEqual(self.texts(app.completed_tasks), [f"Done {i}" for i in range(15, 20)])
+        self.assertEqual(len(app.core.archive), 15)
+        self.assertEqual([row.label.cget("text") for row in app.archive_frame.rows[:2]], ["Done 0", "Done 1"])
+        self.assertEqual(app.archive_page.cget("text"), "1-8 / 15")
+        app.turn_archive_page(1)
+        self.assertEqual(app.archive_page.cget("text"), "8-15 / 15")
+        app.search_var.set("done 1")
+        app.search_archive()
+        self.assertEqual(self.texts(app.archive_rows), ["Done 1", "Done 10", "Done 11", "Done 12", "Done 13", "Done 14"])
+        self.assertEqual(app.archive_title.cget("text"), "Archived Tasks (6/15)")
+        app.core.flush()
+        storage = JournalStorage(self.file_name)
+        self.addCleanup(storage.close)
+        self.assertEqual(self.texts(storage.load().completed), [f"Done {i}" for i in range(15, 20)])
+
+    def test_performance_window_shows_hot_paths(self):
+        # Test that Options -> Performance shows timings, widget counts and bytes written, and exports them
+        self.app.task_entry.insert(0, "Test Task")
+        self.app.add_task()
+        self.app.writer.flush()
+        window = self.app.show_performance()
+        text = window.stats_text.get("1.0", tk.END)
+        for name in ("apply_changes", "get_translation", "render", "widgets", "task rows built", "bytes written"):
+            self.assertIn(name, text)
+        path = os.path.join(self.directory.name, "perf.json")
+        window.export(path)
+        with open(path, encoding="utf-8") as file:
+            self.assertGreater(json.load(file)["widgets"], 10)
+        window.toggle_capture()
+        self.app.load_tasks_in_frame()
+        window.toggle_capture()
+        self.assertIn("load_tasks_in_frame", window.report_text.get("1.0", tk.END))
+
+    def test_run_tests_streams_results(self):
+        # Test that Run Tests runs the suite in another process and fills the window as results arrive
+        window = self.app.run_tests("test_translations")
+        deadline = time.monotonic() + 60
+        while window.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+            window.poll()
+        self.assertEqual(window.running, 0)
+        text = window.results_text.get("1.0", tk.END)
+        self.assertIn("Test Case: test_translator_is_cached (test_translations.TestTranslations)", text)
+        self.assertIn("Total Tests: 5, Failures: 0, Errors: 0", text)
+        self.assertEqual(window.cancel_button.cget("state"), tk.DISABLED)
+
+    def test_shared_file_watcher_shows_other_processes_edits(self):
+        # Test that a shared window picks up tasks another writer added and keeps its own edits on top
+        # The unshared window from setUp would keep shared instances out.
+        self.app.close()
+        app = TodoApp(self.root, file_name=self.file_name, shared=True)
+        self.addCleanup(app.close)
+        other = TodoService(self.file_name, shared=True)
+        self.addCleanup(other.close)
+        other.load()
+        other.add("Remote Task")
+        app.watch_file()
+        self.assertEqual(app.tasks_frame.rows[0].label.cget("text"), "Remote Task")
+        app.task_entry.insert(0, "Local Task")
+        app.add_task()
+        other.toggle(other.store.find("Remote Task").id, completed=True)
+        app.watch_file()
+        self.assertEqual(self.texts(app.task_list), ["Local Task"])
+        self.assertEqual(app.completed_frame.rows[0].label.cget("text"), "Remote Task")
+        self.assertEqual(self.saved_tasks(), (["Local Task"], ["Remote Task"]))
+
+    def test_shared_file_watcher_reloads_replaced_file(self):
+        # Test that a tasks.txt rewritten outside the app is loaded again in full
+        # The unshared window from setUp would keep shared instances out.
+        self.app.close()
+        app = TodoApp(self.root, file_name=self.file_name, shared=True)
+        self.addCleanup(app.close)
+        self.write_tasks("Edited Task,completed\n")
+        JournalStorage(self.file_name).load()
+        app.watch_file()
+        self.assertEqual(app.completed_frame.rows[0].label.cget("text"), "Edited Task")
+        self.assertEqual(app.completed_title.cget("text"), "Resolved Tasks (1)")
+
+    def test_server_client_shows_changes_once_the_server_applies_them(self):
+        # Test that a window connected to a sync server adds through it and redraws from its deltas
+        loop = asyncio.new_event_loop()
+        server = SyncServer(self.file_name)
+        port = loop.run_until_complete(server.start(port=0))
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        app = TodoApp(self.root, server=f"127.0.0.1:{port}")
+        app.task_entry.insert(0, "Remote Task")
+        app.add_task()
+        deadline = time.monotonic() + 10
+        while not app.task_list and time.monotonic() < deadline:
+            time.sleep(0.005)
+            app.watch_file()
+        self.assertEqual(app.tasks_frame.rows[0].label.cget("text"), "Remote Task")
+        self.assertEqual(app.pending_title.cget("text"), "Pending Tasks (1)")
+        app.close()
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        self.assertEqual(self.saved_tasks(), (["Remote Task"], []))
+
+    @patch('main.messagebox.showerror')
+    def test_server_that_does_not_answer_is_reported(self, mock_showerror):
+        # Test that a window waits for the sync server without blocking and reports one that never answers
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        app = TodoApp(self.root, server=f"127.0.0.1:{port}", lazy=True)
+        self.addCleanup(app.close)
+        app.core.timeout = 0.2
+        deadline = time.monotonic() + 5
+        while app.loading is not None and time.monotonic() < deadline:
+            start = time.monotonic()
+            app.load_next_batch()
+            self.assertLess(time.monotonic() - start, 0.1)
+        self.assertIsNone(app.loading)
+        self.assertEqual(app.task_entry.cget("state"), tk.NORMAL)
+        mock_showerror.assert_called_with("Error", f"Could not load tasks: no reply from the sync server at 127.0.0.1:{port}")
+
 
 if __name__ == "__main__":
     with open('test-reports.xml', 'wb') as output:
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+
+from perf import Recorder
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.recorder = Recorder()
+
+    def test_timed_calls_fill_the_histogram(self):
+        # Test that a timed function counts its calls and lands in a bucket, even when it raises
+        @self.recorder.timed("work")
+        def work(fail=False):
+            if fail:
+                raise ValueError("boom")
+            return 42
+
+        self.assertEqual(work(), 42)
+        with self.assertRaises(ValueError):
+            work(fail=True)
+        summary = self.recorder.snapshot()["timers"]["work"]
+        self.assertEqual(summary["calls"], 2)
+        self.assertEqual(sum(summary["histogram"].values()), 2)
+        self.assertLessEqual(summary["p50"], summary["p95"])
+        self.assertEqual(work.__name__, "work")
+
+    def test_reset_keeps_decorated_functions_recording(self):
+        # Test that reset clears the numbers without detaching timers from their functions
+        work = self.recorder.timed("work")(lambda: None)
+        work()
+        self.recorder.count("bytes written", 10)
+        self.recorder.reset()
+        work()
+        snapshot = self.recorder.snapshot()
+        self.assertEqual(snapshot["timers"]["work"]["calls"], 1)
+        self.assertEqual(snapshot["counters"], {})
+
+    def test_export_writes_json(self):
+        # Test that the snapshot, with extra fields, is exported as JSON
+        self.recorder.count("bytes written", 5)
+        self.recorder.count("bytes written", 7)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "perf.json")
+            self.recorder.export(path, widgets=3)
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        self.assertEqual(data["counters"], {"bytes written": 12})
+        self.assertEqual(data["widgets"], 3)
+
+    def test_capture_reports_profile_and_allocations(self):
+        # Test that a profile capture can be started and stopped at runtime
+        self.recorder.start_capture()
+        self.assertTrue(self.recorder.capturing)
+        data = [str(i) * 10 for i in range(1000)]
+        report = self.recorder.stop_capture()
+        self.assertFalse(self.recorder.capturing)
+        self.assertIn("function calls", report)
+        self.assertIn("Allocations still held", report)
+        self.assertEqual(len(data), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
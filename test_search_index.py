@@ -0,0 +1,58 @@
+import unittest
+
+from changes import COMPLETED
+from search_index import SearchIndex
+from task_store import TaskStore
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.store = TaskStore()
+        for text in ["Buy milk", "Buy bread", "Call mom", "Milkshake recipe"]:
+            self.store.append(text)
+        self.index = SearchIndex(self.store.tasks.values())
+
+    def texts(self, ids):
+        return sorted(self.store.get(task_id).text for task_id in ids)
+
+    def test_word_and_prefix_match(self):
+        # Test that a query matches whole words and word prefixes, ignoring case
+        self.assertEqual(self.texts(self.index.search("buy")), ["Buy bread", "Buy milk"])
+        self.assertEqual(self.texts(self.index.search("MIL")), ["Buy milk", "Milkshake recipe"])
+
+    def test_all_query_words_must_match(self):
+        # Test that every word of the query narrows the result
+        self.assertEqual(self.texts(self.index.search("buy mi")), ["Buy milk"])
+        self.assertEqual(self.index.search("buy mom"), set())
+
+    def test_blank_query_matches_nothing_to_filter(self):
+        # Test that a query without words means "no filter"
+        self.assertIsNone(self.index.search("  "))
+
+    def test_updates_are_incremental(self):
+        # Test that added, relabelled and removed tasks are reflected without a rebuild
+        task = self.store.append("Walk dog")
+        self.index.add(task.id, task.text)
+        self.assertEqual(self.texts(self.index.search("do")), ["Walk dog"])
+
+        self.index.update(task.id, "Walk cat")
+        self.assertEqual(self.index.search("dog"), set())
+        self.assertNotIn("dog", self.index.words)
+
+        self.index.remove(task.id)
+        self.assertEqual(self.index.search("walk"), set())
+        self.assertEqual(self.index.words, sorted(self.index.postings))
+
+    def test_select_keeps_list_order(self):
+        # Test that matches come back in list order for small and large result sets
+        self.store.section(COMPLETED).append(self.store.pending.pop(1))
+        pending, completed = self.store.select(self.index.search("buy"))
+        self.assertEqual([task.text for task in pending], ["Buy milk"])
+        self.assertEqual([task.text for task in completed], ["Buy bread"])
+        pending, completed = self.store.select(set(reversed(list(self.store.tasks))))
+        self.assertEqual(pending, list(self.store.pending))
+        self.assertEqual(completed, list(self.store.completed))
+
+
+if __name__ == "__main__":
+    unittest.main()
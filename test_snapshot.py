@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from migrate import migrate
+from snapshot import HEADER, SnapshotError, SnapshotFile, read_store, write_snapshot
+from storage import format_marker
+from task_store import TaskStore
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks.tsnap")
+        self.store = TaskStore()
+        for text, completed in (("Buy milk", False), ("Café, crème ✓", True), ("", False), ("two\nlines", True),
+                                ("東京 😀", False)):
+            self.store.append(text, completed)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def texts(self, rows):
+        return [task.text for task in rows]
+
+    def test_round_trip(self):
+        # Test that texts, statuses and order survive a write and a read
+        write_snapshot(self.path, self.store)
+        store = read_store(self.path)
+        self.assertEqual(self.texts(store.pending), ["Buy milk", "", "東京 😀"])
+        self.assertEqual(self.texts(store.completed), ["Café, crème ✓", "two\nlines"])
+
+    def test_rows_are_decoded_on_access(self):
+        # Test that the sections index like lists and report their status per row
+        write_snapshot(self.path, self.store)
+        with SnapshotFile(self.path) as snapshot:
+            self.assertEqual((len(snapshot), len(snapshot.pending), len(snapshot.completed)), (5, 3, 2))
+            self.assertEqual(snapshot.pending[-1].text, "東京 😀")
+            self.assertEqual(self.texts(snapshot.completed[0:2]), ["Café, crème ✓", "two\nlines"])
+            self.assertTrue(snapshot.completed[1].completed)
+            self.assertFalse(snapshot.pending[0].completed)
+            self.assertEqual([task.id for task in snapshot.completed], [4, 5])
+            with self.assertRaises(IndexError):
+                snapshot.completed[2]
+
+    def test_empty_store(self):
+        # Test that a snapshot with no tasks opens
+        write_snapshot(self.path, TaskStore())
+        with SnapshotFile(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(list(snapshot.pending), [])
+
+    def test_rejects_other_and_truncated_files(self):
+        # Test that a file that is not a whole snapshot is refused
+        with open(self.path, "wb") as file:
+            file.write(b"Buy milk,pending\n" * 4)
+        with self.assertRaises(SnapshotError):
+            SnapshotFile(self.path)
+        write_snapshot(self.path, self.store)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(SnapshotError):
+            SnapshotFile(self.path)
+        self.assertLess(HEADER.size, os.path.getsize(self.path))
+
+    def test_migrate_to_and_from_text_file(self):
+        # Test that migrate.py converts between tasks.txt and a snapshot
+        text_file = os.path.join(self.directory.name, "tasks.txt")
+        with open(text_file, "w", encoding="utf-8") as file:
+            file.write("Task 1,pending\nTask 2,completed\n")
+        self.assertEqual(migrate(text_file, self.path), 2)
+        copy = os.path.join(self.directory.name, "copy.txt")
+        self.assertEqual(migrate(self.path, copy), 2)
+        with open(copy, encoding="utf-8") as file:
+            self.assertEqual(file.read(), format_marker(3) + "1,Task 1,pending\n2,Task 2,completed\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+import changes
+from changes import COMPLETED, PENDING
+from migrate import migrate
+from sqlite_storage import SqliteStorage
+from storage import JournalStorage, open_storage
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.db")
+        self.storage = SqliteStorage(self.file_name)
+        self.storage.initialize()
+        self.store = self.storage.load()
+
+    def tearDown(self):
+        self.storage.close()
+        self.directory.cleanup()
+
+    def commit(self, *change_set):
+        self.storage.append([change._replace(task_id=self.store.apply(change).id) for change in change_set])
+
+    def reload(self):
+        storage = SqliteStorage(self.file_name)
+        try:
+            store = storage.load()
+        finally:
+            storage.close()
+        return [(task.id, task.text) for task in store.pending], [(task.id, task.text) for task in store.completed]
+
+    def test_open_storage_picks_backend_by_extension(self):
+        # Test that .db files use SQLite and anything else the text journal
+        self.assertIsInstance(open_storage(self.file_name), SqliteStorage)
+        self.assertIsInstance(open_storage(os.path.join(self.directory.name, "tasks.txt")), JournalStorage)
+
+    def test_mutations_round_trip(self):
+        # Test that add, toggle, edit and delete survive a reload with their ids
+        self.commit(changes.insert(PENDING, 0, "Task 1"))
+        self.commit(changes.insert(PENDING, 0, "Task 2"))
+        self.commit(changes.insert(PENDING, 0, "Task 3"))
+        self.commit(changes.move(PENDING, 2, COMPLETED, 0))
+        self.commit(changes.relabel(PENDING, 0, "Edited"))
+        self.commit(changes.remove(PENDING, 1))
+        self.assertEqual(self.reload(), ([(3, "Edited")], [(1, "Task 1")]))
+
+    def test_insert_between_rows(self):
+        # Test that inserting in the middle keeps the order after a reload
+        for i in range(3):
+            self.commit(changes.insert(PENDING, i, f"Task {i}"))
+        for _ in range(60):
+            self.commit(changes.insert(PENDING, 1, "Middle"))
+        pending, _ = self.reload()
+        self.assertEqual([text for _, text in pending], ["Task 0"] + ["Middle"] * 60 + ["Task 1", "Task 2"])
+
+    def test_batch_is_one_transaction(self):
+        # Test that a failing change rolls back the whole batch
+        self.commit(changes.insert(PENDING, 0, "Task 1"))
+        with self.assertRaises(Exception):
+            self.storage.append([changes.insert(PENDING, 0, "Task 2", task_id=2),
+                                 changes.insert(PENDING, 0, "Duplicate", task_id=1)])
+        self.assertEqual(self.reload(), ([(1, "Task 1")], []))
+
+    def test_migrate_from_text_file(self):
+        # Test that the migration tool copies tasks.txt into a database
+        text_file = os.path.join(self.directory.name, "tasks.txt")
+        with open(text_file, "w", encoding="utf-8") as file:
+            file.write("Task 1,pending\nTask 2,completed\nTask 3,pending\n")
+        destination = os.path.join(self.directory.name, "migrated.db")
+        self.assertEqual(migrate(text_file, destination), 3)
+        storage = SqliteStorage(destination)
+        store = storage.load()
+        storage.close()
+        self.assertEqual([task.text for task in store.pending], ["Task 1", "Task 3"])
+        self.assertEqual([task.text for task in store.completed], ["Task 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
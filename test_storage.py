@@ -0,0 +1,190 @@
+import os
+import tempfile
+import unittest
+
+import changes
+from changes import COMPLETED, PENDING
+from storage import JournalStorage, StaleJournalError, format_marker
+from task_store import TaskStore
+
+
+class TestJournalStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
+        self.storage = JournalStorage(self.file_name, compact_after=10)
+        self.storage.initialize()
+
+    def tearDown(self):
+        self.storage.close()
+        self.directory.cleanup()
+
+    def reload(self):
+        storage = JournalStorage(self.file_name)
+        try:
+            store = storage.load()
+        finally:
+            storage.close()
+        return [task.text for task in store.pending], [task.text for task in store.completed]
+
+    def read_snapshot(self):
+        with open(self.file_name, encoding="utf-8") as file:
+            return file.read()
+
+    def test_append_replays_on_load(self):
+        # Test that appended change sets are replayed on top of the snapshot
+        self.storage.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1"), changes.insert(PENDING, 0, "Task 2")])
+        self.storage.append([changes.move(PENDING, 1, COMPLETED, 0)])
+        self.assertEqual(self.read_snapshot(), "")
+        self.assertEqual(self.reload(), (["Task 2"], ["Task 1"]))
+
+    def test_torn_record_is_ignored(self):
+        # Test that a half-written record left by a crash is dropped
+        self.storage.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        self.storage.close()
+        with open(self.file_name + ".journal", "ab") as file:
+            file.write(b'["insert", "pending", 0, "Tas')
+        self.assertEqual(self.reload(), (["Task 1"], []))
+        self.assertEqual(self.reload(), (["Task 1"], []))
+
+    def test_compaction_folds_journal_into_snapshot(self):
+        # Test that a long journal is folded into tasks.txt in the background
+        self.storage.load()
+        for i in range(11):
+            self.storage.append([changes.insert(PENDING, 0, f"Task {i}")])
+        self.assertIsNotNone(self.storage.compaction)
+        self.storage.append([changes.remove(PENDING, 0)])
+        self.storage.close()
+
+        self.assertEqual(self.read_snapshot(), format_marker(12) + "".join(f"{i + 1},Task {i},pending\n" for i in reversed(range(11))))
+        self.assertEqual(self.reload(), ([f"Task {i}" for i in reversed(range(10))], []))
+
+    def test_interrupted_compaction_before_snapshot_swap(self):
+        # Test that a compacted journal is discarded if its snapshot never landed
+        self.storage.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        self.storage.close()
+        self.storage.write_journal(self.file_name + ".journal.new", 12345, [])
+        self.assertEqual(self.reload(), (["Task 1"], []))
+        self.assertFalse(os.path.exists(self.file_name + ".journal.new"))
+
+    def test_external_edit_wins_over_journal(self):
+        # Test that editing tasks.txt by hand invalidates the old journal
+        self.storage.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        self.storage.close()
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write("Other Task,completed\n")
+        self.assertEqual(self.reload(), ([], ["Other Task"]))
+        self.assertTrue(os.path.exists(self.file_name + ".journal.stale"))
+
+    def test_save_writes_snapshot_and_resets_journal(self):
+        # Test that a full save rewrites tasks.txt and empties the journal
+        self.storage.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        store = TaskStore()
+        store.append("Task 2")
+        store.append("Task 3", completed=True)
+        self.storage.save(store)
+        self.assertEqual(self.read_snapshot(), format_marker(3) + "1,Task 2,pending\n2,Task 3,completed\n")
+        self.assertEqual(self.storage.records, 0)
+        self.assertEqual(self.reload(), (["Task 2"], ["Task 3"]))
+
+    def test_text_with_commas_and_newlines_round_trips(self):
+        # Test that commas, line breaks and backslashes in task text survive a save
+        self.storage.load()
+        store = TaskStore()
+        store.append("Buy eggs, milk,completed")
+        store.append("Line one\nline two\\n", completed=True)
+        self.storage.save(store)
+        self.assertEqual(self.read_snapshot(),
+                         format_marker(3) + "1,Buy eggs, milk,completed,pending\n2,Line one\\nline two\\\\n,completed\n")
+        self.assertEqual(self.reload(), (["Buy eggs, milk,completed"], ["Line one\nline two\\n"]))
+
+    def test_file_without_format_marker_keeps_backslashes(self):
+        # Test that a tasks.txt from before escaping loads as written and is rewritten in the new format
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write(r"Open C:\new\readme,pending" + "\n" + r"fix regex \\d+,completed" + "\n")
+        self.assertEqual(self.reload(), ([r"Open C:\new\readme"], [r"fix regex \\d+"]))
+        self.storage.save(self.storage.load())
+        self.assertEqual(self.read_snapshot(),
+                         format_marker(3) + r"1,Open C:\\new\\readme,pending" + "\n" + r"2,fix regex \\\\d+,completed" + "\n")
+        self.assertEqual(self.reload(), ([r"Open C:\new\readme"], [r"fix regex \\d+"]))
+
+    def test_ids_are_kept_by_compaction_and_save(self):
+        # Test that task ids, and the next free one, survive the journal being folded into tasks.txt
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write("# tasks.txt format 2\nTask 1,pending\nTask 2,pending\n")
+        store = self.storage.load()
+        self.assertEqual([task.id for task in store.pending], [1, 2])
+        for i in range(3, 14):
+            task = store.apply(changes.insert(PENDING, 0, f"Task {i}"))
+            self.storage.append([changes.insert(PENDING, 0, f"Task {i}")._replace(task_id=task.id)])
+        self.storage.append([changes.remove(PENDING, 0)])
+        store = self.storage.load()
+        self.assertEqual([(task.id, task.text) for task in store.pending][-3:], [(3, "Task 3"), (1, "Task 1"), (2, "Task 2")])
+        self.assertEqual(store.next_id, 14)
+        self.storage.save(store)
+        self.assertEqual(self.storage.load().next_id, 14)
+
+    def test_read_new_returns_records_from_other_writers(self):
+        # Test that a second instance on the same file pulls only the records it has not seen
+        self.storage.load()
+        other = JournalStorage(self.file_name)
+        self.addCleanup(other.close)
+        other.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        self.assertTrue(other.changed())
+        with other.locked():
+            self.assertEqual([change.text for change in other.read_new()], ["Task 1"])
+            self.assertEqual(other.read_new(), [])
+        self.assertFalse(other.changed())
+
+    def test_append_after_foreign_write_is_refused(self):
+        # Test that a writer that has not pulled the other's records cannot append
+        self.storage.load()
+        other = JournalStorage(self.file_name)
+        self.addCleanup(other.close)
+        other.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        with self.assertRaises(StaleJournalError):
+            other.append([changes.insert(PENDING, 0, "Task 2")])
+        self.assertEqual(self.reload(), (["Task 1"], []))
+
+    def test_read_new_follows_another_instances_compaction(self):
+        # Test that records the reader had not pulled yet survive the other writer's compaction
+        self.storage.load()
+        other = JournalStorage(self.file_name)
+        self.addCleanup(other.close)
+        store = other.load()
+        for i in range(11):
+            self.storage.append([changes.insert(PENDING, 0, f"Task {i}")])
+        self.storage.close()
+        self.assertIsNone(self.storage.compaction)
+        self.storage.load()
+        self.storage.append([changes.remove(PENDING, 0)])
+        with other.locked():
+            for change in other.read_new():
+                store.apply(change)
+        self.assertEqual([task.text for task in store.pending], [f"Task {i}" for i in range(9, -1, -1)])
+        other.append([changes.insert(PENDING, 0, "Task 11")])
+        self.assertEqual(self.reload()[0][:2], ["Task 11", "Task 9"])
+
+    def test_read_new_asks_for_reload_after_external_replace(self):
+        # Test that a snapshot written outside the app cannot be merged incrementally
+        self.storage.load()
+        self.storage.append([changes.insert(PENDING, 0, "Task 1")])
+        self.storage.close()
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write("Edited,pending\n")
+        other = JournalStorage(self.file_name)
+        self.addCleanup(other.close)
+        other.load()
+        with self.storage.locked():
+            self.assertIsNone(self.storage.read_new())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+from suite_runner import ERROR, FAILURE, PASSED, SKIPPED, SuiteRun, run_shard
+
+SAMPLE = textwrap.dedent('''
+    import time
+    import unittest
+
+
+    class Sample(unittest.TestCase):
+        def test_pass(self):
+            print("<not xml & noise")
+
+        def test_fail(self):
+            self.assertEqual(1, 2)
+
+        def test_error(self):
+            raise RuntimeError("boom")
+
+        @unittest.skip("not today")
+        def test_skip(self):
+            pass
+
+        def test_slow(self):
+            time.sleep(float(__import__("os").environ.get("SAMPLE_SLEEP", "0")))
+''')
+
+
+class TestSuiteRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.directory.name, "sample_tests.py"), "w", encoding="utf-8") as file:
+            file.write(SAMPLE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def collect(self, run, timeout=60):
+        results = []
+        running = run.workers
+        deadline = time.monotonic() + timeout
+        while running and time.monotonic() < deadline:
+            result = run.results.get(timeout=timeout)
+            if result is None:
+                running -= 1
+            else:
+                results.append(result)
+        return {result["name"]: result for result in results}
+
+    def test_results_are_streamed_per_test(self):
+        # Test that every outcome is reported with its message, despite tests printing to stdout
+        results = self.collect(SuiteRun("sample_tests", cwd=self.directory.name).start())
+        self.assertEqual({name: result["outcome"] for name, result in results.items()},
+                         {"test_pass": PASSED, "test_fail": FAILURE, "test_error": ERROR,
+                          "test_skip": SKIPPED, "test_slow": PASSED})
+        self.assertIn("1 != 2", results["test_fail"]["message"])
+        self.assertEqual(results["test_skip"]["message"], "not today")
+
+    def test_parallel_workers_split_the_suite(self):
+        # Test that shards across processes run each test exactly once
+        run = SuiteRun("sample_tests", workers=3, cwd=self.directory.name).start()
+        self.assertEqual(len(run.processes), 3)
+        self.assertEqual(sorted(self.collect(run)), ["test_error", "test_fail", "test_pass", "test_skip", "test_slow"])
+
+    def test_cancel_stops_workers(self):
+        # Test that cancelling terminates the worker processes
+        os.environ["SAMPLE_SLEEP"] = "30"
+        self.addCleanup(os.environ.pop, "SAMPLE_SLEEP")
+        run = SuiteRun("sample_tests", cwd=self.directory.name).start()
+        time.sleep(0.5)
+        run.cancel()
+        results = self.collect(run, timeout=10)
+        self.assertNotIn("test_slow", results)
+        self.assertTrue(all(process.poll() is not None for process in run.processes))
+
+    def test_missing_module_is_reported(self):
+        # Test that a worker that cannot load the suite shows up as an error
+        results = self.collect(SuiteRun("no_such_tests", cwd=self.directory.name).start())
+        self.assertEqual([result["outcome"] for result in results.values()], [ERROR])
+
+    def test_run_shard_writes_well_formed_xml(self):
+        # Test that the streamed output is one complete XML document
+        output = io.BytesIO()
+        sys.path.insert(0, self.directory.name)
+        self.addCleanup(sys.path.remove, self.directory.name)
+        run_shard("sample_tests", 1, 2, output)
+        root = ET.fromstring(output.getvalue())
+        self.assertEqual([case.get("name") for case in root], ["test_fail", "test_skip"])
+
+
+if __name__ == "__main__":
+    unittest.main()
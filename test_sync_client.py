@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import changes
+from changes import COMPLETED
+from sync_client import RemoteTodoService, parse_address
+from sync_server import PORT, SyncServer
+
+
+class TestRemoteTodoService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write("Buy milk,pending\n")
+        self.loop = asyncio.new_event_loop()
+        self.server = SyncServer(self.file_name)
+        self.address = f"127.0.0.1:{self.loop.run_until_complete(self.server.start(port=0))}"
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.directory.cleanup()
+
+    def service(self):
+        service = RemoteTodoService(self.address)
+        self.addCleanup(service.close)
+        service.load()
+        return service
+
+    def wait_for(self, service, condition):
+        deadline = time.monotonic() + 10
+        change_set = []
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.005)
+            change_set.extend(service.sync())
+        self.assertTrue(condition())
+        return change_set
+
+    def test_parse_address(self):
+        # Test that the port is optional
+        self.assertEqual(parse_address("example.lan:9000"), ("example.lan", 9000))
+        self.assertEqual(parse_address("example.lan"), ("example.lan", PORT))
+
+    def test_services_see_each_others_changes(self):
+        # Test that mutations go through the server and come back to every client as deltas
+        first, second = self.service(), self.service()
+        self.assertEqual([task.text for task in first.pending], ["Buy milk"])
+        self.assertEqual(first.add("Call mom"), [])
+        change_set = self.wait_for(second, lambda: len(second.pending) == 2)
+        self.assertEqual([change.text for change in change_set], ["Call mom"])
+        second.toggle(second.store.find("Buy milk").id)
+        self.wait_for(first, lambda: len(first.completed) == 1)
+        self.assertEqual([task.text for task in first.search("mil")[1]], ["Buy milk"])
+        self.wait_for(second, lambda: len(second.completed) == 1)
+        self.assertEqual([task.id for task in first.completed], [task.id for task in second.completed])
+
+    def test_import_inserts_land_at_the_end(self):
+        # Test that an imported batch is appended on the server in order
+        service = self.service()
+        service.commit([changes.insert(COMPLETED, 0, "Old 1"), changes.insert(COMPLETED, 0, "Old 2")])
+        self.wait_for(service, lambda: len(service.completed) == 2)
+        self.assertEqual([task.text for task in service.completed], ["Old 1", "Old 2"])
+        with self.assertRaises(ValueError):
+            service.commit([changes.remove(COMPLETED, 0)])
+
+    def test_close_twice(self):
+        # Test that closing again, as main.py does after Exit, is a no-op
+        service = self.service()
+        service.add("Call mom")
+        service.close()
+        service.close()
+        self.assertTrue(service.loop.is_closed())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from sync_client import SyncConnection
+from sync_server import SyncServer, encode
+from task_store import TaskStore
+
+
+class Client:
+    # A SyncConnection plus the task list it keeps in step with the server.
+    def __init__(self, port, client_id=None):
+        self.store = TaskStore()
+        self.deltas = 0
+        self.connection = SyncConnection("127.0.0.1", port, self.snapshot, self.delta, client_id, retry=0.01)
+        self.task = asyncio.create_task(self.connection.run())
+
+    def snapshot(self, store, seq):
+        self.store = store
+
+    def delta(self, change_set, seq, n):
+        self.deltas += 1
+        for change in change_set:
+            self.store.apply(change)
+
+    def lists(self):
+        return [(task.id, task.text) for task in self.store.pending], [(task.id, task.text) for task in self.store.completed]
+
+    async def close(self):
+        self.connection.close()
+        await self.task
+
+
+class TestSyncServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
+        with open(self.file_name, "w", encoding="utf-8") as file:
+            file.write("Existing task,pending\n")
+        self.server = SyncServer(self.file_name)
+        self.port = await self.server.start(port=0)
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+        await self.server.close()
+        self.directory.cleanup()
+
+    def connect(self, client_id=None):
+        client = Client(self.port, client_id)
+        self.clients.append(client)
+        return client
+
+    async def settle(self, *clients):
+        # Until every op is acked and every client has every delta.
+        for _ in range(500):
+            if all(client.connection.epoch == self.server.epoch and not client.connection.pending()
+                   and client.connection.seq == self.server.seq for client in clients):
+                return
+            await asyncio.sleep(0.01)
+        self.fail("clients did not catch up with the server")
+
+    def server_lists(self):
+        store = self.server.core.store
+        return [(task.id, task.text) for task in store.pending], [(task.id, task.text) for task in store.completed]
+
+    async def test_clients_converge_on_the_servers_list(self):
+        # Test that pipelined batches from two clients reach both of them as deltas
+        first, second = self.connect(), self.connect()
+        await self.settle(first, second)
+        self.assertEqual(first.lists(), ([(1, "Existing task")], []))
+        for i in range(20):
+            first.connection.send(["add", f"First {i}"])
+            second.connection.send(["add", f"Second {i}"])
+        await self.settle(first, second)
+        second.connection.send(["toggle", 1, True])
+        first.connection.send(["relabel", 2, "Renamed"])
+        await self.settle(first, second)
+        self.assertEqual(first.lists(), self.server_lists())
+        self.assertEqual(second.lists(), self.server_lists())
+        self.assertEqual(len(self.server_lists()[0]), 40)
+        self.assertEqual(self.server_lists()[1], [(1, "Existing task")])
+
+    async def test_reconnect_replays_only_missed_deltas(self):
+        # Test that a client that drops out gets the deltas it missed, not a new snapshot
+        first, second = self.connect(), self.connect()
+        await self.settle(first, second)
+        first.connection.drop()
+        for i in range(5):
+            second.connection.send(["add", f"Task {i}"])
+            await asyncio.sleep(0.005)
+        first.connection.send(["add", "Offline task"])
+        await self.settle(first, second)
+        self.assertEqual(first.connection.connects, 2)
+        self.assertEqual(first.connection.snapshots, 1)
+        self.assertEqual(first.lists(), self.server_lists())
+        self.assertEqual(len(self.server_lists()[0]), 7)
+
+    async def test_resent_batch_is_applied_once(self):
+        # Test that a batch sent again on a new connection is not applied twice
+        async def session(count, *messages):
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.writelines(encode(message) for message in messages)
+            replies = [json.loads(await reader.readline()) for _ in range(count)]
+            writer.close()
+            return replies
+
+        replies = await session(2, {"hello": "raw", "epoch": None, "seq": 0}, {"n": 1, "ops": [["add", "Once"]]})
+        self.assertEqual(replies[1]["n"], 1)
+        replies = await session(3, {"hello": "raw", "epoch": replies[0]["epoch"], "seq": 0},
+                                {"n": 1, "ops": [["add", "Once"]]}, {"n": 2, "ops": [["add", "Twice"]]})
+        self.assertEqual(replies[0]["applied"], 1)
+        self.assertEqual([(reply["seq"], reply["n"]) for reply in replies[1:]], [(1, 1), (2, 2)])
+        self.assertEqual([text for _, text in self.server_lists()[0]], ["Twice", "Once", "Existing task"])
+
+    async def test_unknown_epoch_gets_a_snapshot(self):
+        # Test that a client from before a server restart is sent the whole list again
+        client = self.connect()
+        await self.settle(client)
+        client.connection.epoch = "restarted"
+        client.connection.drop()
+        client.connection.send(["add", "After restart"])
+        await self.settle(client)
+        self.assertEqual(client.connection.snapshots, 2)
+        self.assertEqual(client.lists(), self.server_lists())
+
+
+if __name__ == "__main__":
+    unittest.main()
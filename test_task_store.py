@@ -0,0 +1,101 @@
+import random
+import unittest
+
+import changes
+from changes import COMPLETED, PENDING
+from task_store import Task, TaskList, TaskStore
+
+
+class TestTaskList(unittest.TestCase):
+    def setUp(self):
+        self.block_size = TaskList.block_size
+        TaskList.block_size = 4  # Force many blocks with small lists
+
+    def tearDown(self):
+        TaskList.block_size = self.block_size
+
+    def test_matches_python_list(self):
+        # Test random inserts and removals against a plain list
+        rng = random.Random(1)
+        tasks = TaskList()
+        expected = []
+        for i in range(500):
+            if expected and rng.random() < 0.4:
+                task = expected.pop(rng.randrange(len(expected)))
+                tasks.remove(task)
+            else:
+                index = rng.randint(0, len(expected))
+                task = Task(i, f"Task {i}")
+                expected.insert(index, task)
+                tasks.insert(index, task)
+            self.assertEqual(len(tasks), len(expected))
+        self.assertEqual(list(tasks), expected)
+        for index, task in enumerate(expected):
+            self.assertIs(tasks[index], task)
+            self.assertEqual(tasks.index(task), index)
+
+    def test_head_insertion(self):
+        # Test that inserting at the head keeps the newest task first
+        tasks = TaskList()
+        for i in range(20):
+            tasks.insert(0, Task(i, f"Task {i}"))
+        self.assertEqual([task.id for task in tasks], list(reversed(range(20))))
+        self.assertEqual(tasks[-1].id, 0)
+
+    def test_extend_then_insert(self):
+        # Test that bulk-appended blocks work with positional inserts afterwards
+        tasks = TaskList()
+        tasks.extend(Task(i, f"Task {i}") for i in range(10))
+        tasks.extend(Task(i, f"Task {i}") for i in range(10, 13))
+        tasks.insert(5, Task(99, "Middle"))
+        self.assertEqual([task.id for task in tasks], [0, 1, 2, 3, 4, 99, 5, 6, 7, 8, 9, 10, 11, 12])
+        self.assertEqual(tasks.index(tasks[11]), 11)
+
+    def test_membership_is_per_list(self):
+        # Test that a task only belongs to the list it was inserted into
+        first, second = TaskList(), TaskList()
+        task = Task(1, "Task")
+        first.append(task)
+        self.assertIn(task, first)
+        self.assertNotIn(task, second)
+        with self.assertRaises(ValueError):
+            second.remove(task)
+
+    def test_index_out_of_range(self):
+        # Test that positional access outside the list raises IndexError
+        tasks = TaskList([Task(1, "Task")])
+        with self.assertRaises(IndexError):
+            tasks[1]
+
+
+class TestTaskStore(unittest.TestCase):
+    def test_ids_are_stable_across_moves(self):
+        # Test that toggling and relabelling keep the same task id
+        store = TaskStore()
+        task = store.apply(changes.insert(PENDING, 0, "Task"))
+        store.apply(changes.move(PENDING, 0, COMPLETED, 0))
+        store.apply(changes.relabel(COMPLETED, 0, "Edited"))
+        self.assertIs(store.get(task.id), task)
+        self.assertEqual(store.position(task), (COMPLETED, 0))
+        self.assertTrue(task.completed)
+        self.assertEqual(task.text, "Edited")
+
+    def test_remove_drops_id(self):
+        # Test that removing a task also drops it from the id index
+        store = TaskStore()
+        task = store.append("Task")
+        store.apply(changes.remove(PENDING, 0))
+        self.assertIsNone(store.get(task.id))
+        self.assertEqual(len(store), 0)
+
+    def test_duplicate_text_gets_distinct_ids(self):
+        # Test that two tasks with the same text are separate records
+        store = TaskStore()
+        first = store.append("Same")
+        second = store.append("Same")
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(store.position(second), (PENDING, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
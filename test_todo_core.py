@@ -0,0 +1,314 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+import todo
+from storage import FileInUseError
+from todo_core import TodoService
+
+# Adds `count` tasks, resolving every other one and relabelling every third,
+# while other copies of this script work on the same file.
+HAMMER = """
+import sys
+from todo_core import TodoService
+service = TodoService(sys.argv[1], shared=True)
+service.load()
+name, count = sys.argv[2], int(sys.argv[3])
+for i in range(count):
+    task_id = service.add(f"{name}-{i}")[-1].task_id
+    if i % 2:
+        service.toggle(task_id, completed=True)
+    if i % 3 == 0:
+        service.relabel(task_id, f"{name}-{i}!")
+service.close()
+"""
+
+
+class TestTodoService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
+        self.service = TodoService(self.file_name)
+        self.service.load()
+
+    def tearDown(self):
+        self.service.close()
+        self.directory.cleanup()
+
+    def reload(self):
+        service = TodoService(self.file_name)
+        try:
+            service.load()
+        finally:
+            service.close()
+        return [task.text for task in service.pending], [task.text for task in service.completed]
+
+    def test_mutations_are_persisted(self):
+        # Test that add, toggle, relabel and remove reach storage without any UI
+        first = self.service.add("Task 1")[0].task_id
+        second = self.service.add("Task 2")[0].task_id
+        self.service.toggle(first)
+        self.service.relabel(second, "Task 2 edited")
+        self.assertEqual(self.reload(), (["Task 2 edited"], ["Task 1"]))
+        self.service.remove(first)
+        self.assertEqual(self.reload(), (["Task 2 edited"], []))
+
+    def test_change_sets_carry_task_ids(self):
+        # Test that commit returns the applied change set with ids filled in
+        change_set = self.service.add("Task")
+        self.assertEqual(self.service.store.get(change_set[0].task_id).text, "Task")
+        self.assertEqual(self.service.toggle(12345), [])
+
+    def test_search_follows_mutations(self):
+        # Test that the search index is updated by later commits
+        task_id = self.service.add("Buy milk")[0].task_id
+        self.assertEqual([task.text for task in self.service.search("mil")[0]], ["Buy milk"])
+        self.service.relabel(task_id, "Buy bread")
+        self.service.toggle(task_id)
+        self.assertEqual(self.service.search("mil"), ([], []))
+        self.assertEqual([task.text for task in self.service.search("bre")[1]], ["Buy bread"])
+        self.assertIsNone(self.service.search(" "))
+
+    def test_unshared_mutations_do_not_wait_for_the_storage_lock(self):
+        # Test that with writes on the writer thread a mutation returns while the storage lock is held
+        service = TodoService(self.file_name, background=True)
+        self.addCleanup(service.close)
+        service.load()
+        held, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with service.storage.locked():
+                held.set()
+                release.wait(10)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        mutation = threading.Thread(target=lambda: service.toggle(service.add("Task 1")[0].task_id))
+        mutation.start()
+        mutation.join(2)
+        blocked = mutation.is_alive()
+        release.set()
+        holder.join()
+        mutation.join()
+        self.assertFalse(blocked)
+        service.flush()
+        self.assertEqual(self.reload(), ([], ["Task 1"]))
+
+    def test_index_is_built_in_steps(self):
+        # Test that the index is built a batch per step and takes in changes committed meanwhile
+        for i in range(2500):
+            self.service.add(f"Task {i}")
+        self.service.load()
+        milk = self.service.store.pending[-1].id
+        self.assertTrue(self.service.index_step())
+        self.service.relabel(milk, "Buy milk")
+        self.service.add("Milk the cow")
+        removed = self.service.store.pending[-2].id
+        self.service.remove(removed)
+        steps = 1
+        while self.service.index_step():
+            steps += 1
+        self.assertEqual(steps, 3)
+        self.assertEqual(len(self.service.search_index), 2500)
+        self.assertEqual([task.text for task in self.service.search("mil")[0]], ["Milk the cow", "Buy milk"])
+        self.assertNotIn(removed, self.service.search_index.terms)
+
+    def test_undo_and_redo_replay_inverse_ops(self):
+        # Test that undo reverts remove, relabel and toggle in place and redo repeats them
+        service = TodoService(self.file_name, history=3)
+        self.addCleanup(service.close)
+        service.load()
+        for text in ("Task 1", "Task 2", "Task 3"):
+            service.add(text)
+        task_id = service.store.find("Task 2").id
+        service.toggle(task_id)
+        service.relabel(task_id, "Task 2 edited")
+        service.remove(task_id)
+        self.assertEqual(len(service.undo_steps), 3)
+        for _ in range(3):
+            service.undo()
+        self.assertEqual(service.undo(), [])
+        self.assertEqual([task.text for task in service.pending], ["Task 3", "Task 2", "Task 1"])
+        self.assertEqual(service.store.find("Task 2").id, task_id)
+        self.assertEqual(self.reload(), (["Task 3", "Task 2", "Task 1"], []))
+        change_set = service.redo()
+        self.assertEqual([(change.kind, change.task_id) for change in change_set], [("move", task_id)])
+        service.redo()
+        service.redo()
+        self.assertEqual(self.reload(), (["Task 3", "Task 1"], []))
+        service.undo()
+        service.add("Task 4")
+        self.assertEqual(service.redo(), [])
+        self.assertEqual(self.reload(), (["Task 4", "Task 3", "Task 1"], ["Task 2 edited"]))
+
+    def test_archive_moves_old_resolved_tasks_out(self):
+        # Test that once twice `archive_keep` tasks are resolved, all but the newest go to the archive
+        service = TodoService(self.file_name, archive_keep=2)
+        self.addCleanup(service.close)
+        service.load()
+        for i in range(4):
+            service.toggle(service.add(f"Task {i}")[0].task_id)
+            if i < 3:
+                self.assertEqual(service.archive_resolved(), [])
+        change_set = service.archive_resolved()
+        self.assertEqual([(change.kind, change.index) for change in change_set], [("remove", 0), ("remove", 0)])
+        self.assertEqual([task.text for task in service.completed], ["Task 2", "Task 3"])
+        self.assertEqual([task.text for task in service.archive.rows], ["Task 0", "Task 1"])
+        self.assertEqual(self.reload(), ([], ["Task 2", "Task 3"]))
+        self.assertEqual(service.archive_resolved(), [])
+
+    def test_archive_segment_is_written_in_the_background(self):
+        # Test that with a writer thread the tasks are removed once their segment is on disk, unless reopened or edited meanwhile
+        service = TodoService(self.file_name, background=True, archive_keep=3)
+        self.addCleanup(service.close)
+        service.load()
+        for i in range(6):
+            service.toggle(service.add(f"Task {i}")[0].task_id)
+        self.assertEqual(service.archive_resolved(), [])
+        service.toggle(service.completed[1].id)
+        service.relabel(service.completed[1].id, "Task 2 edited")
+        service.flush()
+        self.assertEqual([(change.kind, change.index) for change in service.archive_resolved()], [("remove", 0)])
+        self.assertEqual([task.text for task in service.completed], ["Task 2 edited", "Task 3", "Task 4", "Task 5"])
+        self.assertEqual([task.text for task in service.pending], ["Task 1"])
+        self.assertEqual([task.text for task in service.archive.rows], ["Task 0", "Task 1", "Task 2"])
+        service.flush()
+        self.assertEqual(self.reload(), (["Task 1"], ["Task 2 edited", "Task 3", "Task 4", "Task 5"]))
+
+    def test_shared_instances_merge_their_edits(self):
+        # Test that two shared services on one file see and build on each other's changes
+        # The unshared service from setUp would keep shared instances out.
+        self.service.close()
+        first = TodoService(self.file_name, shared=True)
+        second = TodoService(self.file_name, shared=True)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        first.load()
+        second.load()
+        task_id = first.add("Task 1")[0].task_id
+        incoming = second.add("Task 2")
+        self.assertEqual([change.text for change in incoming], ["Task 1", "Task 2"])
+        self.assertTrue(first.has_updates())
+        self.assertEqual([change.text for change in first.sync()], ["Task 2"])
+        second.toggle(incoming[0].task_id, completed=True)
+        first.toggle(task_id, completed=True)
+        first.close()
+        second.close()
+        self.assertEqual(self.reload(), (["Task 2"], ["Task 1"]))
+
+    def test_processes_hammering_one_file_lose_nothing(self):
+        # Test that concurrent writer processes keep every add, toggle and relabel
+        # The unshared service from setUp would keep shared instances out.
+        self.service.close()
+        root = os.path.dirname(os.path.abspath(__file__))
+        workers = [subprocess.Popen([sys.executable, "-c", HAMMER, self.file_name, f"w{n}", "60"], cwd=root)
+                   for n in range(4)]
+        for worker in workers:
+            self.assertEqual(worker.wait(timeout=120), 0)
+        pending, completed = self.reload()
+        expected = {f"w{n}-{i}" + ("!" if i % 3 == 0 else "") for n in range(4) for i in range(60)}
+        self.assertEqual(sorted(pending + completed), sorted(expected))
+        self.assertEqual(len(completed), 4 * 30)
+        self.assertTrue(all(int(text.split("-")[1].rstrip("!")) % 2 for text in completed))
+
+
+class TestTodoCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "tasks.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = todo.main(["--tasks", self.file_name] + list(args))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_add_list_done_rm(self):
+        # Test the add/list/done/rm commands against one task file
+        self.assertEqual(self.run_cli("add", "Buy", "milk")[1], "    1 [ ] Buy milk\n")
+        self.run_cli("add", "Call mom")
+        self.assertEqual(self.run_cli("done", "1")[0], 0)
+        self.assertEqual(self.run_cli("list")[1], "    2 [ ] Call mom\n")
+        self.assertEqual(self.run_cli("list", "--done")[1], "    1 [x] Buy milk\n")
+        self.assertEqual(self.run_cli("list", "--all", "--search", "bu")[1], "    1 [x] Buy milk\n")
+        self.assertEqual(self.run_cli("rm", "2", "7")[::2], (1, "todo: no task with id 7\n"))
+        self.assertEqual(self.run_cli("list", "--all")[1], "    1 [x] Buy milk\n")
+
+    def test_ids_survive_a_save_by_another_process(self):
+        # Test that rm and done act on the task `list` showed after the file is rewritten in between
+        for text in ("Task 1", "Task 2", "Task 3"):
+            self.run_cli("add", text)
+        self.run_cli("rm", "1")
+        self.assertEqual(self.run_cli("list")[1], "    3 [ ] Task 3\n    2 [ ] Task 2\n")
+        window = TodoService(self.file_name, shared=True)
+        window.load()
+        window.save()
+        window.close()
+        self.run_cli("rm", "2")
+        self.run_cli("done", "3")
+        self.run_cli("add", "Task 4")
+        self.assertEqual(self.run_cli("list", "--all")[1], "    4 [ ] Task 4\n    3 [x] Task 3\n")
+
+    def test_add_prints_its_own_task_after_another_writers_change(self):
+        # Test that add shows the new task when a window deleted one between the CLI's load and its write
+        self.run_cli("add", "Task 1")
+        load = TodoService.load
+
+        def load_then_delete(service):
+            store = load(service)
+            window = TodoService(self.file_name, shared=True)
+            load(window)
+            window.remove(window.pending[0].id)
+            window.close()
+            return store
+
+        with patch.object(TodoService, "load", load_then_delete):
+            self.assertEqual(self.run_cli("add", "Task 2"), (0, "    2 [ ] Task 2\n", ""))
+
+    def test_refuses_a_file_an_unshared_window_has_open(self):
+        # Test that todo does not write behind a window that would then fail to save its own edits
+        window = TodoService(self.file_name, background=True)
+        window.load()
+        status, _, stderr = self.run_cli("add", "Task 1")
+        self.assertEqual(status, 1)
+        self.assertIn("--shared", stderr)
+        with self.assertRaises(FileInUseError):
+            TodoService(self.file_name, shared=True)
+        window.add("Task 2")
+        window.close()
+        self.assertEqual(self.run_cli("add", "Task 3")[0], 0)
+        self.assertEqual(self.run_cli("list")[1], "    2 [ ] Task 3\n    1 [ ] Task 2\n")
+
+    def test_list_archived(self):
+        # Test that archived tasks are listed and searched read-only
+        service = TodoService(self.file_name, archive_keep=1)
+        service.load()
+        for text in ("Buy milk", "Call mom", "Pay rent"):
+            service.toggle(service.add(text)[0].task_id)
+        service.archive_resolved()
+        service.close()
+        self.assertEqual(self.run_cli("list", "--archived")[1], "   -1 [x] Buy milk\n   -2 [x] Call mom\n")
+        self.assertEqual(self.run_cli("list", "--archived", "--search", "ca")[1], "   -2 [x] Call mom\n")
+        self.assertEqual(self.run_cli("list", "--done")[1], "    3 [x] Pay rent\n")
+
+    def test_cli_does_not_import_gui_or_test_modules(self):
+        # Test that the command line starts without tkinter, xmlrunner, unittest or ElementTree
+        code = "import sys, todo; print(' '.join(sorted(sys.modules)))"
+        root = os.path.dirname(os.path.abspath(__file__))
+        modules = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout.split()
+        for name in modules:
+            self.assertFalse(name.startswith(("tkinter", "xmlrunner", "xml.etree", "unittest")), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
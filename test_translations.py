@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import unittest
+
+import translations
+
+
+class TestTranslations(unittest.TestCase):
+    def test_catalogs_share_keys(self):
+        # Test that every language translates the same set of messages
+        catalogs = translations.load_catalogs()
+        english = set(catalogs["en"]["messages"])
+        for code, catalog in catalogs.items():
+            self.assertEqual(set(catalog["messages"]), english, code)
+
+    def test_languages_lists_english_first(self):
+        # Test that the language menu entries start with the default language
+        codes = [code for code, _ in translations.languages()]
+        self.assertEqual(codes[0], "en")
+        self.assertEqual(sorted(codes), ["de", "en", "es", "fr", "it"])
+
+    def test_translator_is_cached(self):
+        # Test that a language resolves to the same lookup function every time
+        self.assertIs(translations.translator("fr"), translations.translator("fr"))
+        self.assertEqual(translations.translator("fr")("Delete"), "Supprimer")
+
+    def test_unknown_text_and_language_fall_back(self):
+        # Test that missing messages and languages return the text unchanged
+        self.assertEqual(translations.translator("de")("Not a message"), "Not a message")
+        self.assertEqual(translations.translator("xx")("Delete"), "Delete")
+
+    def test_new_language_file_is_picked_up(self):
+        # Test that dropping a catalog file in the directory adds a language
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "nl.json"), "w", encoding="utf-8") as file:
+                json.dump({"name": "Dutch", "messages": {"Delete": "Verwijderen"}}, file)
+            self.assertEqual(translations.languages(directory), [("nl", "Dutch")])
+            self.assertEqual(translations.translator("nl", directory)("Delete"), "Verwijderen")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import argparse
+import sys
+
+from archive import Archive
+from storage import FileInUseError
+from todo_core import TodoService
+
+
+def print_tasks(tasks):
+    for task in tasks:
+        mark = "x" if task.completed else " "
+        print(f"{task.id:>5} [{mark}] {task.text}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="todo", description="Manage the task list without opening the window.")
+    parser.add_argument("--tasks", default="tasks.txt", help="task storage to use (default: tasks.txt)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a pending task")
+    add.add_argument("text", nargs="+")
+
+    listing = commands.add_parser("list", help="show tasks with their ids")
+    shown = listing.add_mutually_exclusive_group()
+    shown.add_argument("--done", action="store_true", help="show resolved tasks only")
+    shown.add_argument("--all", action="store_true", help="show pending and resolved tasks")
+    shown.add_argument("--archived", action="store_true", help="show archived tasks (read-only)")
+    listing.add_argument("--search", help="only tasks whose words start with the given words")
+
+    done = commands.add_parser("done", help="mark tasks as resolved")
+    done.add_argument("ids", type=int, nargs="+")
+
+    rm = commands.add_parser("rm", help="delete tasks")
+    rm.add_argument("ids", type=int, nargs="+")
+
+    args = parser.parse_args(argv)
+
+    # Ids are stored with the tasks, so the ones `todo list` showed still
+    # name the same tasks after other processes saved or compacted the
+    # file. Open windows may be editing it, hence shared mode.
+    try:
+        service = TodoService(args.tasks, shared=True)
+    except FileInUseError as error:
+        print(f"todo: {error}", file=sys.stderr)
+        return 1
+    try:
+        service.load()
+        if args.command == "add":
+            change_set = service.add(" ".join(args.text))
+            print_tasks([service.store.get(change_set[-1].task_id)])
+        elif args.command == "list" and args.archived:
+            archive = Archive(args.tasks)
+            try:
+                print_tasks(archive.search(args.search) if args.search else archive.rows)
+            finally:
+                archive.close()
+        elif args.command == "list":
+            pending, completed = service.search(args.search or "") or (service.pending, service.completed)
+            if not args.done:
+                print_tasks(pending)
+            if args.done or args.all:
+                print_tasks(completed)
+        else:
+            status = 0
+            for task_id in args.ids:
+                task = service.store.get(task_id)
+                if task is None:
+                    print(f"todo: no task with id {task_id}", file=sys.stderr)
+                    status = 1
+                elif args.command == "rm":
+                    service.remove(task_id)
+                else:
+                    service.toggle(task_id, completed=True)
+            return status
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
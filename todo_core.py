@@ -0,0 +1,346 @@
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+
+import changes
+from archive import Archive
+from changes import COMPLETED, PENDING
+from io_worker import StorageWriter
+from search_index import SearchIndex
+from storage import FileInUseError, open_storage
+from task_store import TaskStore
+
+
+class TodoService:
+    """The task list and its storage, with no UI attached.
+
+    Every mutation goes through `commit`, which applies a change set to the
+    store, persists it and keeps the search index current, then returns the
+    change set with task ids filled in so a view can redraw just those rows.
+    With `background=True` writes go through a StorageWriter thread instead
+    of happening on the caller's thread.
+
+    With `shared=True` other processes may write the same file. Every
+    mutation then runs under the storage lock: records the others appended
+    are applied first, and the change is worked out against that up to date
+    list, so concurrent edits merge instead of overwriting each other.
+    Writes are synchronous in this mode. Shared and unshared instances
+    cannot have the same file open: the second one raises FileInUseError.
+
+    With `history` set, the last that many adds, toggles, removals and
+    relabels can be undone and redone. Each step keeps the ops that revert
+    and repeat it, not a copy of the list, and `undo`/`redo` run them as
+    ordinary mutations.
+
+    With `archive_keep` set, `archive_resolved` moves the tasks resolved
+    before the last `archive_keep` into `archive`, out of the working list.
+    """
+
+    def __init__(self, file_name="tasks.txt", background=False, shared=False, history=0, archive_keep=None):
+        self.file_name = file_name
+        self.shared = shared
+        self.storage = open_storage(file_name)
+        self.storage.initialize()
+        if not self.storage.claim(shared):
+            self.storage.close()
+            if shared:
+                raise FileInUseError(f"{file_name} is open in a window without --shared; close it or restart it with --shared")
+            raise FileInUseError(f"{file_name} is shared by other processes; open it with --shared")
+        self.store = TaskStore()
+        self.reset_index()
+        self.writer = StorageWriter(self.storage) if background and not shared else None
+        self.undo_steps = deque(maxlen=history)
+        self.redo_steps = deque(maxlen=history)
+        self.archive_keep = archive_keep
+        self.archive = Archive(file_name) if archive_keep is not None else None
+        self.archiving = None
+
+    @property
+    def pending(self):
+        return self.store.pending
+
+    @property
+    def completed(self):
+        return self.store.completed
+
+    def load(self):
+        self.flush()
+        self.store = self.storage.load()
+        self.reset_index()
+        self.clear_history()
+        return self.store
+
+    def load_iter(self):
+        for store in self.storage.load_iter():
+            self.store = store
+            self.reset_index()
+            self.clear_history()
+            yield store
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    def save(self):
+        if self.writer is not None:
+            self.writer.save(self.store)
+            return []
+        with self.synced() as incoming:
+            self.storage.save(self.store)
+        return incoming
+
+    def close(self):
+        if self.archiving is not None:
+            # Waits for the segment being written, then removes its tasks.
+            self.archiving[0].exception()
+            self.archive_resolved()
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            self.storage.close()
+        self.storage.release()
+        if self.archive is not None:
+            self.archive.close()
+
+    @contextmanager
+    def synced(self):
+        # Yields the change sets other processes made, already applied, and
+        # keeps the file locked until the block has written its own. When
+        # not shared nothing is locked here: the storage locks around its
+        # own writes, which may run on the writer thread.
+        with self.storage.locked() if self.shared else nullcontext():
+            yield self.pull() if self.shared else []
+
+    def sync(self):
+        with self.synced() as incoming:
+            return incoming
+
+    def has_updates(self):
+        return self.shared and self.storage.changed()
+
+    def pull(self):
+        records = self.storage.read_new()
+        if records is None:
+            # Replaced by something that is not a continuation of what we
+            # read: start over. Callers notice by the store being a new one.
+            self.load()
+            return []
+        change_set = [change._replace(task_id=self.store.apply(change).id) for change in records]
+        self.index_changes(change_set)
+        return change_set
+
+    def commit(self, change_set, undoable=False):
+        with self.synced() as incoming:
+            if undoable and self.undo_steps.maxlen:
+                change_set = self.record(change_set)
+            else:
+                change_set = [change._replace(task_id=self.store.apply(change).id) for change in change_set]
+            if self.writer is not None:
+                self.writer.append(change_set)
+            else:
+                self.storage.append(change_set)
+        self.index_changes(change_set)
+        return incoming + change_set
+
+    def record(self, change_set):
+        # Applies the changes and keeps the ops that revert and repeat them.
+        # Ops name tasks by id; a removed task comes back with its old id,
+        # so the steps around it stay valid.
+        undo, redo, applied = [], [], []
+        for change in change_set:
+            rows = self.store.section(change.section)
+            old_text = rows[change.index].text if change.kind == changes.RELABEL else None
+            task = self.store.apply(change)
+            applied.append(change._replace(task_id=task.id))
+            if change.kind == changes.INSERT:
+                undo.append(["remove", task.id])
+                redo.append(["restore", change.section, change.index, task.text, task.id])
+            elif change.kind == changes.REMOVE:
+                undo.append(["restore", change.section, change.index, task.text, task.id])
+                redo.append(["remove", task.id])
+            elif change.kind == changes.MOVE:
+                undo.append(["toggle", task.id, change.section == COMPLETED, change.index])
+                redo.append(["toggle", task.id, change.target == COMPLETED, change.target_index])
+            else:
+                undo.append(["relabel", task.id, old_text])
+                redo.append(["relabel", task.id, task.text])
+        self.undo_steps.append((undo[::-1], redo))
+        self.redo_steps.clear()
+        return applied
+
+    def undo(self):
+        return self.replay(self.undo_steps, self.redo_steps, 0)
+
+    def redo(self):
+        return self.replay(self.redo_steps, self.undo_steps, 1)
+
+    def replay(self, source, target, side):
+        if not source:
+            return []
+        step = source.pop()
+        target.append(step)
+        with self.synced() as incoming:
+            change_set = list(incoming)
+            for op in step[side]:
+                change_set.extend(self.run(op, undoable=False))
+        return change_set
+
+    def clear_history(self):
+        # Ops name tasks by id, and a reload may bring a list that was
+        # replaced outside the app, where the same ids name other tasks.
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+
+    def run(self, op, undoable=True):
+        # One mutation named by a list, as kept in the undo history and sent
+        # by sync clients.
+        kind, *args = op
+        if kind == "append":
+            section, text = args
+            return self.commit([changes.insert(section, len(self.store.section(section)), text)], undoable)
+        if kind in ("add", "toggle", "remove", "relabel", "restore"):
+            return getattr(self, kind)(*args, undoable=undoable)
+        raise ValueError(f"Unknown op: {kind!r}")
+
+    def reset_index(self):
+        self.search_index = None
+        self.indexing = None
+        self.index_backlog = []
+
+    def index_step(self):
+        # Builds one batch of the search index; True while there is more to
+        # build. Change sets committed in between are kept and applied once
+        # it is complete.
+        if self.search_index is not None:
+            return False
+        if self.indexing is None:
+            self.indexing = self.index_batches()
+        try:
+            next(self.indexing)
+            return True
+        except StopIteration as done:
+            self.search_index = done.value
+        self.indexing = None
+        backlog, self.index_backlog = self.index_backlog, []
+        for change_set in backlog:
+            self.index_changes(change_set)
+        return False
+
+    def index_batches(self):
+        index = SearchIndex()
+        yield from index.build(list(self.store.tasks.values()))
+        return index
+
+    def index_changes(self, change_set):
+        if self.search_index is None:
+            if self.indexing is not None:
+                self.index_backlog.append(change_set)
+            return
+        for change in change_set:
+            if change.kind == changes.INSERT or change.kind == changes.RELABEL:
+                self.search_index.update(change.task_id, change.text)
+            elif change.kind == changes.REMOVE:
+                self.search_index.remove(change.task_id)
+
+    def add(self, text, undoable=True):
+        return self.commit([changes.insert(PENDING, 0, text)], undoable)
+
+    def restore(self, section, index, text, task_id=None, undoable=True):
+        # Puts a task back where it was removed from, as near as the list
+        # now allows, with its old id unless something else has it.
+        with self.synced() as incoming:
+            index = min(index, len(self.store.section(section)))
+            if task_id in self.store.tasks:
+                task_id = None
+            return incoming + self.commit([changes.insert(section, index, text)._replace(task_id=task_id)], undoable)
+
+    @contextmanager
+    def synced_task(self, task_id):
+        # After a reload `task_id` names nothing: the file may have been
+        # replaced by one where it is another task.
+        store = self.store
+        with self.synced() as incoming:
+            yield incoming, self.store.get(task_id) if self.store is store else None
+
+    def toggle(self, task_id, completed=None, index=None, undoable=True):
+        # `completed` names the state wanted, so a task another process
+        # already moved there is left alone rather than flipped back.
+        # `index` is where it lands; by default the top of the pending list
+        # or the end of the completed one.
+        with self.synced_task(task_id) as (incoming, task):
+            if task is None or task.completed == completed:
+                return incoming
+            section, position = self.store.position(task)
+            target = PENDING if task.completed else COMPLETED
+            if index is None:
+                index = 0 if target == PENDING else len(self.completed)
+            index = min(index, len(self.store.section(target)))
+            return incoming + self.commit([changes.move(section, position, target, index)], undoable)
+
+    def remove(self, task_id, undoable=True):
+        with self.synced_task(task_id) as (incoming, task):
+            if task is None:
+                return incoming
+            return incoming + self.commit([changes.remove(*self.store.position(task))], undoable)
+
+    def relabel(self, task_id, text, undoable=True):
+        with self.synced_task(task_id) as (incoming, task):
+            if task is None:
+                return incoming
+            section, index = self.store.position(task)
+            return incoming + self.commit([changes.relabel(section, index, text)], undoable)
+
+    def archive_resolved(self):
+        # Runs once the resolved list is twice `archive_keep` long, so each
+        # segment holds at least that many tasks. The segment is written
+        # before the tasks are removed: a crash in between leaves them in
+        # both places rather than in neither. With a writer thread the
+        # segment is written there, and the first call after it is done
+        # removes the tasks.
+        if self.archive is None:
+            return []
+        if self.archiving is not None:
+            job, archived = self.archiving
+            if not job.done():
+                return []
+            self.archiving = None
+            if job.exception() is not None:
+                # Reported through writer.errors; the tasks stay listed.
+                return []
+            self.archive.refresh()
+            return self.remove_archived(archived)
+        with self.synced() as incoming:
+            count = len(self.completed) - self.archive_keep
+            if len(self.completed) < 2 * self.archive_keep or count <= 0:
+                return incoming
+            # Ids and texts as written; tasks are relabelled in place.
+            archived = {task.id: task.text for task in islice(self.completed, count)}
+            texts = list(archived.values())
+            if self.writer is not None:
+                self.archiving = (self.writer.call(self.write_segment, texts), archived)
+                return incoming
+            self.archive.write_segment(texts)
+            self.archive.refresh()
+            return incoming + self.remove_archived(archived)
+
+    def write_segment(self, texts):
+        with self.storage.locked():
+            self.archive.write_segment(texts)
+
+    def remove_archived(self, archived):
+        # The tasks may have been edited, reopened or removed while their
+        # segment was written; only those still resolved with the text the
+        # segment holds are removed, so an edit is never lost.
+        with self.synced() as incoming:
+            indexes = [index for index, task in enumerate(self.completed) if archived.get(task.id) == task.text]
+            # Each removal shifts the rows after it up by one.
+            return incoming + self.commit([changes.remove(COMPLETED, index - removed) for removed, index in enumerate(indexes)])
+
+    def search(self, query):
+        # (pending, completed) matches in list order, or None for a blank
+        # query. Whatever is left of building the index is done first.
+        if not query.strip():
+            return None
+        while self.index_step():
+            pass
+        return self.store.select(self.search_index.search(query) or set())
@@ -0,0 +1,33 @@
+import json
+import os
+from functools import lru_cache
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+DEFAULT_LANGUAGE = "en"
+
+
+@lru_cache(maxsize=None)
+def load_catalogs(directory=LOCALES_DIR):
+    # Every locales/<code>.json holds {"name": ..., "messages": {...}}; adding
+    # a file adds a language.
+    catalogs = {}
+    for file_name in sorted(os.listdir(directory)):
+        code, extension = os.path.splitext(file_name)
+        if extension != ".json":
+            continue
+        with open(os.path.join(directory, file_name), encoding="utf-8") as file:
+            catalogs[code] = json.load(file)
+    return catalogs
+
+
+def languages(directory=LOCALES_DIR):
+    catalogs = load_catalogs(directory)
+    codes = sorted(catalogs, key=lambda code: (code != DEFAULT_LANGUAGE, catalogs[code]["name"]))
+    return [(code, catalogs[code]["name"]) for code in codes]
+
+
+@lru_cache(maxsize=None)
+def translator(language, directory=LOCALES_DIR):
+    catalog = load_catalogs(directory).get(language)
+    messages = catalog["messages"] if catalog else {}
+    return lambda text: messages.get(text, text)